@@ -0,0 +1,29 @@
+import pytest
+
+from yfs.paths import TEST_DIRECTORY
+
+SUMMARY_SYMBOLS = ["aapl", "amzn", "fcel", "tsla"]
+STATISTICS_SYMBOLS = ["aapl", "fcel"]
+OPTION_SYMBOLS = ["aapl", "tsla"]
+
+
+def read_page(path):
+    with open(path, mode="r") as file:
+        return file.read()
+
+
+@pytest.fixture(scope="session", params=SUMMARY_SYMBOLS)
+def summary_page_text(request):
+    return read_page(
+        TEST_DIRECTORY / "data" / "summary" / f"{request.param}_summary_page_raw.html"
+    )
+
+
+@pytest.fixture(scope="session", params=STATISTICS_SYMBOLS)
+def statistics_page_text(request):
+    return read_page(TEST_DIRECTORY / "data" / f"{request.param}_statistics_page_raw.html")
+
+
+@pytest.fixture(scope="session", params=OPTION_SYMBOLS)
+def option_page_text(request):
+    return read_page(TEST_DIRECTORY / "data" / f"{request.param}_option_page_raw.html")
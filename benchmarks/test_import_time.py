@@ -0,0 +1,46 @@
+"""Import time benchmark guarding the cost of `import yfs` for short lived workers.
+
+The budget in seconds can be changed with the YFS_IMPORT_TIME_BUDGET environment variable.
+"""
+
+import os
+import re
+import subprocess
+import sys
+
+import pytest
+
+IMPORT_TIME_BUDGET = float(os.environ.get("YFS_IMPORT_TIME_BUDGET", "0.5"))
+
+IMPORT_STATEMENTS = [
+    "import yfs",
+    "from yfs import fuzzy_search",
+    "from yfs import get_summary_page, get_statistics_page, get_options_page",
+]
+
+
+def cumulative_import_time(statement):
+    """Return the cumulative import time in seconds of all top level imports."""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+
+    total = 0
+    for line in stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \| (\S.*)$", line)
+        if match and not match.group(2).startswith(" "):
+            total += int(match.group(1))
+
+    return total / 1_000_000
+
+
+@pytest.mark.parametrize("statement", IMPORT_STATEMENTS)
+def test_import_time_budget(statement):
+    seconds = min(cumulative_import_time(statement) for _ in range(3))
+
+    print(f"\n{statement}: {seconds:.3f}s (budget {IMPORT_TIME_BUDGET}s)")
+
+    assert seconds < IMPORT_TIME_BUDGET
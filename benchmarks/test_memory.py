@@ -0,0 +1,51 @@
+"""Memory benchmark comparing pydantic page models with yfs.records slotted records.
+
+Run with `pytest benchmarks/test_memory.py -s` to print the per-record sizes.
+"""
+
+import gc
+import tracemalloc
+
+import pytest
+
+from tests.common_fixtures import summary_page_data_fixture  # noqa: F401
+from yfs.quote import parse_quote_header_info
+from yfs.records import SummaryPageRecord
+from yfs.summary import parse_summary_table, SummaryPage
+
+RECORD_COUNT = 1_000
+
+
+def measure(factory):
+    """Return the bytes retained per object created by factory."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        objects = [factory() for _ in range(RECORD_COUNT)]
+        retained, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del objects
+    return retained / RECORD_COUNT
+
+
+@pytest.mark.parametrize("summary_page_data_fixture", ["aapl", "tsla"], indirect=True)
+def test_summary_page_record_memory(summary_page_data_fixture):
+    symbol, html = summary_page_data_fixture
+
+    quote = parse_quote_header_info(html)
+    data = {**parse_summary_table(html), **quote.dict(), "symbol": symbol}
+
+    def create_page():
+        return SummaryPage(**data, quote=quote)
+
+    model_size = measure(create_page)
+    record_size = measure(lambda: SummaryPageRecord.from_model(create_page()))
+
+    print(
+        f"\n{symbol}: SummaryPage {model_size:,.0f} bytes, "
+        f"SummaryPageRecord {record_size:,.0f} bytes, "
+        f"saved {1 - record_size / model_size:.0%} per record"
+    )
+
+    assert record_size < model_size * 0.75
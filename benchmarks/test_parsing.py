@@ -0,0 +1,142 @@
+"""Parsing, cleaning and model construction benchmarks.
+
+Every page benchmark builds a fresh HTML object per round so the lxml parse is part
+of the measurement, the same as for a downloaded page. Throughput is stored in the
+benchmark extra_info as pages_per_second or rows_per_second.
+
+Run and save the results, then compare against the previous run:
+
+    pytest benchmarks --benchmark-autosave --benchmark-compare
+"""
+
+import pytest
+from requests_html import HTML
+
+from tests import test_cleaner
+from yfs.cleaner import CommonCleaners, field_cleaner
+from yfs.options import ContractExpiration, get_table_elements, parse_option_table
+from yfs.quote import parse_quote_header_info
+from yfs.statistics import (
+    classify_statistics_rows,
+    parse_financial_highlights_table,
+    parse_statistics_page,
+    parse_trading_information_table,
+    parse_valuation_table,
+)
+from yfs.summary import parse_summary_page, parse_summary_table
+
+
+def record_throughput(benchmark, key, count=1):
+    """Store the throughput of the mean round time in the benchmark extra_info.
+
+    Nothing is stored under --benchmark-disable, where the rounds are not timed.
+    """
+    if benchmark.stats is None:
+        return
+
+    benchmark.extra_info[key] = count / benchmark.stats.stats.mean
+
+
+def bench_page(benchmark, parser, text):
+    """Benchmark a page parser with a freshly parsed HTML document every round."""
+    result = benchmark.pedantic(
+        parser, setup=lambda: ((HTML(html=text),), {}), rounds=20, warmup_rounds=1
+    )
+    record_throughput(benchmark, "pages_per_second")
+    return result
+
+
+@pytest.mark.benchmark(group="quote")
+def test_parse_quote_header_info(benchmark, summary_page_text):
+    assert bench_page(benchmark, parse_quote_header_info, summary_page_text)
+
+
+@pytest.mark.benchmark(group="summary")
+def test_parse_summary_table(benchmark, summary_page_text):
+    assert bench_page(benchmark, parse_summary_table, summary_page_text)
+
+
+@pytest.mark.benchmark(group="summary")
+def test_parse_summary_page(benchmark, summary_page_text):
+    assert bench_page(
+        benchmark, lambda html: parse_summary_page("TEST", html), summary_page_text
+    )
+
+
+@pytest.mark.benchmark(group="statistics")
+def test_parse_valuation_table(benchmark, statistics_page_text):
+    assert bench_page(benchmark, parse_valuation_table, statistics_page_text)
+
+
+@pytest.mark.benchmark(group="statistics")
+def test_parse_financial_highlights_table(benchmark, statistics_page_text):
+    assert bench_page(benchmark, parse_financial_highlights_table, statistics_page_text)
+
+
+@pytest.mark.benchmark(group="statistics")
+def test_parse_trading_information_table(benchmark, statistics_page_text):
+    assert bench_page(benchmark, parse_trading_information_table, statistics_page_text)
+
+
+@pytest.mark.benchmark(group="statistics")
+def test_classify_statistics_rows(benchmark, statistics_page_text):
+    assert bench_page(benchmark, classify_statistics_rows, statistics_page_text)
+
+
+@pytest.mark.benchmark(group="statistics")
+def test_parse_statistics_page(benchmark, statistics_page_text):
+    assert bench_page(
+        benchmark, lambda html: parse_statistics_page("TEST", html), statistics_page_text
+    )
+
+
+@pytest.mark.benchmark(group="options")
+def test_parse_option_table(benchmark, option_page_text):
+    expiration = ContractExpiration(symbol="TEST", timestamp="1602806400")
+    calls_table, _ = get_table_elements(HTML(html=option_page_text))
+
+    contracts = benchmark(parse_option_table, expiration, "call", calls_table)
+
+    record_throughput(benchmark, "rows_per_second", len(contracts))
+
+
+@pytest.mark.benchmark(group="cleaner")
+def test_field_cleaner(benchmark):
+    fields = list(test_cleaner.field_test_params)
+
+    benchmark(lambda: [field_cleaner(field) for field in fields])
+
+    record_throughput(benchmark, "rows_per_second", len(fields))
+
+
+COMMON_CLEANER_INPUTS = {
+    "remove_comma": test_cleaner.remove_comma_params,
+    "remove_brakets": test_cleaner.remove_brakets_params,
+    "remove_percent_sign": test_cleaner.remove_percent_sign_params,
+    "remove_brakets_and_percent_sign": test_cleaner.remove_brakets_params,
+    "value_is_missing": test_cleaner.value_is_missing_params,
+    "has_large_number_suffix": test_cleaner.has_number_suffix_params,
+    "clean_large_number": test_cleaner.clean_number_with_suffix_params,
+    "common_value_cleaner": test_cleaner.common_value_cleaner_params,
+    "clean_common_values": test_cleaner.clean_common_values_params,
+    "clean_basic_percentage": test_cleaner.clean_basic_percentage_params,
+    "clean_date": test_cleaner.clean_dates_params,
+    "clean_symbol": {"aapl": "AAPL", "tsla": "TSLA"},
+    "clean_first_value_split_by_dash": test_cleaner.clean_first_value_split_by_dash_params,
+    "clean_second_value_split_by_dash": test_cleaner.clean_second_value_split_by_dash_params,
+    "clean_first_value_split_by_space": {"0.82 (0.73%)": "0.82", "N/A (N/A)": None},
+    "clean_second_value_split_by_space": {"0.82 (0.73%)": "0.73", "N/A (N/A)": None},
+    "clean_first_value_split_by_x": test_cleaner.clean_first_value_split_by_x_params,
+    "clean_second_value_split_by_x": test_cleaner.clean_second_value_split_by_x_params,
+}
+
+
+@pytest.mark.benchmark(group="cleaner")
+@pytest.mark.parametrize("method", COMMON_CLEANER_INPUTS)
+def test_common_cleaners(benchmark, method):
+    cleaner = getattr(CommonCleaners, method)
+    values = list(COMMON_CLEANER_INPUTS[method])
+
+    benchmark(lambda: [cleaner(value) for value in values])
+
+    record_throughput(benchmark, "rows_per_second", len(values))
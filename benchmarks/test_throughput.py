@@ -0,0 +1,40 @@
+"""Serial and threaded download throughput against the local mock yahoo server.
+
+Run with `pytest benchmarks/test_throughput.py -s` to print the report, or use
+`python -m benchmarks.throughput` for larger runs.
+"""
+
+import pytest
+
+from benchmarks.throughput import mock_server_process, run_throughput
+
+SYMBOLS = [f"SYM{number:04d}" for number in range(20)]
+SYMBOL_COUNTS = {"summary": 20, "statistics": 20, "options": 5}  # option pages parse slowly
+
+
+@pytest.fixture(scope="module")
+def mock_server():
+    with mock_server_process(latency=0.02, jitter=0.01) as base_url:
+        yield base_url
+
+
+@pytest.mark.parametrize("with_threads", [False, True], ids=["serial", "threads"])
+@pytest.mark.parametrize("page", ["summary", "statistics", "options"])
+def test_throughput(mock_server, page, with_threads):
+    symbols = SYMBOLS[: SYMBOL_COUNTS[page]]
+    result = run_throughput(page, symbols, with_threads=with_threads, thread_count=10)
+
+    print(f"\n{result}")
+
+    assert result.pages == len(symbols)
+    assert result.status_counts == {200: len(result.latencies)}
+
+
+def test_throughput_with_throttling():
+    with mock_server_process(throttle_rate=0.2, error_rate=0.05, seed=1):
+        result = run_throughput("summary", SYMBOLS, with_threads=True, thread_count=10)
+
+    print(f"\n{result}")
+
+    assert result.pages < len(SYMBOLS)
+    assert result.status_counts[429] > 0
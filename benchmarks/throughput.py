@@ -0,0 +1,236 @@
+"""End-to-end download throughput harness against the local mock yahoo server.
+
+The mock server from tests.mock_server runs in its own process so the CPU time
+measured here belongs to yfs only. Every request goes through a TimingSession which
+records the request latency and response status.
+
+Run from the project root:
+
+```
+python -m benchmarks.throughput --symbols 200 --latency 0.05 --jitter 0.02 --threads 10
+```
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Callable, Dict, Iterator, List
+
+from requests import Session
+from requests.adapters import HTTPAdapter
+
+import yfs.urls
+from yfs.multidownloader import _download_pages_with_threads, _download_pages_without_threads
+from yfs.options import get_options_page
+from yfs.paths import PROJECT_ROOT
+from yfs.statistics import get_multiple_statistics_pages
+from yfs.summary import get_multiple_summary_pages
+
+
+class TimingSession(Session):
+    """A requests Session recording the latency and status code of every request."""
+
+    def __init__(self, pool_size: int = 10) -> None:
+        """Create a session with a connection pool of pool_size per host."""
+        super().__init__()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.mount("http://", adapter)
+        self.mount("https://", adapter)
+        self.latencies: List[float] = []
+        self.status_counts: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def request(self, *args, **kwargs):  # noqa: ANN002, ANN003, ANN201
+        """Send a request and record its latency."""
+        start = time.perf_counter()
+        response = super().request(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            self.latencies.append(elapsed)
+            self.status_counts[response.status_code] = (
+                self.status_counts.get(response.status_code, 0) + 1
+            )
+
+        return response
+
+
+@dataclass
+class ThroughputResult:
+    """Result of one harness run."""
+
+    name: str
+    symbols: int
+    pages: int
+    seconds: float
+    cpu_seconds: float
+    latencies: List[float] = field(repr=False)
+    status_counts: Dict[int, int]
+
+    @property
+    def symbols_per_second(self) -> float:
+        """Requested symbols per wall clock second."""
+        return self.symbols / self.seconds
+
+    @property
+    def p50(self) -> float:
+        """Median request latency in seconds."""
+        return percentile(self.latencies, 50)
+
+    @property
+    def p99(self) -> float:
+        """99th percentile request latency in seconds."""
+        return percentile(self.latencies, 99)
+
+    @property
+    def cpu_per_page(self) -> float:
+        """Client CPU seconds per downloaded page."""
+        return self.cpu_seconds / self.pages if self.pages else float("nan")
+
+    def __str__(self) -> str:
+        """Format the result as one report line."""
+        statuses = ", ".join(
+            f"{code}: {count}" for code, count in sorted(self.status_counts.items())
+        )
+        return (
+            f"{self.name:<24} {self.symbols_per_second:>8.1f} symbols/s "
+            f"p50 {self.p50 * 1000:>7.1f} ms  p99 {self.p99 * 1000:>7.1f} ms  "
+            f"cpu/page {self.cpu_per_page * 1000:>6.1f} ms  "
+            f"pages {self.pages}/{self.symbols}  ({statuses})"
+        )
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """Return the percentile of values using the inclusive method."""
+    if len(values) < 2:
+        return values[0] if values else float("nan")
+    return statistics.quantiles(values, n=100, method="inclusive")[int(percent) - 1]
+
+
+@contextmanager
+def mock_server_process(
+    latency: float = 0.0,
+    jitter: float = 0.0,
+    error_rate: float = 0.0,
+    throttle_rate: float = 0.0,
+    seed: int = 0,
+) -> Iterator[str]:
+    """Run the mock server in a subprocess and point yfs.urls.BASE_URL and QUERY_URL at it."""
+    process = subprocess.Popen(  # pylint: disable=consider-using-with
+        [
+            sys.executable,
+            "-m",
+            "tests.mock_server",
+            f"--latency={latency}",
+            f"--jitter={jitter}",
+            f"--error-rate={error_rate}",
+            f"--throttle-rate={throttle_rate}",
+            f"--seed={seed}",
+        ],
+        cwd=PROJECT_ROOT,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    base_url, query_url = yfs.urls.BASE_URL, yfs.urls.QUERY_URL
+
+    try:
+        yfs.urls.BASE_URL = yfs.urls.QUERY_URL = process.stdout.readline().strip()
+        yield yfs.urls.BASE_URL
+    finally:
+        yfs.urls.BASE_URL, yfs.urls.QUERY_URL = base_url, query_url
+        process.terminate()
+        process.wait()
+
+
+def _options_pages(
+    symbols: List[str], with_threads: bool, thread_count: int, **kwargs  # noqa: ANN003
+) -> List:
+    callable_ = partial(get_options_page, first_chain=True)
+
+    if with_threads:
+        pages = _download_pages_with_threads(
+            list, callable_, symbols, True, True, thread_count, False, **kwargs
+        )
+    else:
+        pages = _download_pages_without_threads(
+            list, callable_, symbols, True, True, False, **kwargs
+        )
+
+    return pages or []
+
+
+DOWNLOADERS: Dict[str, Callable] = {
+    "summary": get_multiple_summary_pages,
+    "statistics": get_multiple_statistics_pages,
+    "options": _options_pages,
+}
+"""* Page name to a function downloading many symbols of that page."""
+
+
+def run_throughput(
+    page: str, symbols: List[str], with_threads: bool = False, thread_count: int = 5
+) -> ThroughputResult:
+    """Download the page of every symbol from the mock server and time it.
+
+    The mock server must already be running, see mock_server_process. Options
+    downloads fetch the first chain of every symbol.
+    """
+    session = TimingSession(pool_size=thread_count)
+    download = DOWNLOADERS[page]
+
+    kwargs = {"with_threads": with_threads, "thread_count": thread_count, "session": session}
+    if page != "options":
+        kwargs["progress_bar"] = False
+
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    pages = download(symbols, **kwargs)
+    seconds = time.perf_counter() - start
+    cpu_seconds = time.process_time() - cpu_start
+
+    engine = f"threads x{thread_count}" if with_threads else "serial"
+
+    return ThroughputResult(
+        name=f"{page} ({engine})",
+        symbols=len(symbols),
+        pages=len(pages) if pages else 0,
+        seconds=seconds,
+        cpu_seconds=cpu_seconds,
+        latencies=session.latencies,
+        status_counts=session.status_counts,
+    )
+
+
+def main() -> None:
+    """Run every page with the serial and threaded downloaders and print a report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=50)
+    parser.add_argument("--threads", type=int, default=10)
+    parser.add_argument("--pages", nargs="+", default=list(DOWNLOADERS), choices=DOWNLOADERS)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--jitter", type=float, default=0.01)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    symbols = [f"SYM{number:04d}" for number in range(args.symbols)]
+
+    with mock_server_process(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+    ):
+        for page in args.pages:
+            print(run_throughput(page, symbols, with_threads=False))
+            print(run_throughput(page, symbols, with_threads=True, thread_count=args.threads))
+
+
+if __name__ == "__main__":
+    main()
@@ -8,7 +8,7 @@ nox.options.sessions = ["tests", "cover", "lint"]
 def tests(session):
     session.install("poetry")
     session.install("pytest-cov")
-    session.run("poetry", "install")
+    session.run("poetry", "install", "--extras", "parquet")
     session.run("poetry", "check")
     session.run("poetry", "run", "pytest", "-vv", "--cov=yfs")
     session.notify("cover")
@@ -22,17 +22,37 @@ def cover(session):
 
 
 lint_files = [
+    "archive",
     "asset_types",
+    "bundle",
     "cleaner",
+    "client",
+    "columns",
+    "document",
     "exchanges",
+    "export",
+    "fundamentals",
+    "history",
     "lookup",
+    "market_hours",
+    "metrics",
     "multidownloader",
+    "negative_cache",
+    "option_index",
+    "option_snapshots",
     "options",
+    "page_cache",
     "paths",
+    "poller",
+    "profiling",
     "quote",
+    "quotes",
+    "records",
     "requestor",
+    "snapshot_store",
     "statistics",
     "summary",
+    "urls",
 ]
 
 ignore_words = ",".join(["ist", "hel"])
@@ -57,6 +77,22 @@ def lint(session):
         session.run("codespell", "-L", ignore_words, f"yfs/{file_name}.py")
 
 
+@nox.session
+def benchmarks(session):
+    session.install("poetry")
+    session.run("poetry", "install", "--extras", "parquet")
+    session.run(
+        "poetry",
+        "run",
+        "pytest",
+        "benchmarks",
+        "-s",
+        "--benchmark-autosave",
+        "--benchmark-storage=.benchmarks",
+        *session.posargs,
+    )
+
+
 @nox.session
 def docs(session):
     session.install("pydoc-markdown", "mkdocs-material")
@@ -0,0 +1,16 @@
+import pytest
+
+from tests.mock_server import MockYahooServer
+
+
+@pytest.fixture
+def mock_server(request):
+    """A seeded MockYahooServer which the yfs urls point to.
+
+    Parametrize indirectly to pass other MockYahooServer arguments, for example
+    `@pytest.mark.parametrize("mock_server", [{"unknown_symbols": ("JUNK",)}], indirect=True)`.
+    """
+    kwargs = {"seed": 0, **getattr(request, "param", {})}
+
+    with MockYahooServer(**kwargs) as server, server.patch_base_url():
+        yield server
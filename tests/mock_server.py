@@ -0,0 +1,458 @@
+"""A local HTTP server imitating yahoo finance with the pages in tests/data.
+
+Any symbol is served. Symbols with a fixture page get their own page, every other
+symbol is mapped to one of the fixture pages so large symbol lists can be downloaded.
+Latency, jitter, server errors and 429 responses can be simulated.
+
+Use it in process:
+
+```python
+with MockYahooServer(latency=0.05) as server, server.patch_base_url():
+    get_summary_page("aapl")
+```
+
+Or in its own process so it does not share CPU time with the client:
+
+```
+python -m tests.mock_server --port 8000 --latency 0.05 --error-rate 0.01
+YFS_BASE_URL=http://127.0.0.1:8000 YFS_QUERY_URL=http://127.0.0.1:8000 python my_script.py
+```
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import pendulum
+
+from yfs.document import parse_html
+from yfs.fundamentals import (
+    FINANCIAL_HIGHLIGHTS_FIELDS,
+    FieldSpec,
+    QUOTE_FIELDS,
+    SUMMARY_FIELDS,
+    TRADING_INFORMATION_FIELDS,
+    VALUATION_FIELDS,
+)
+from yfs.paths import TEST_DIRECTORY
+from yfs.quote import parse_quote_header_text
+from yfs.statistics import parse_statistics_page
+from yfs.summary import parse_summary_page
+import yfs.urls
+
+DATA_DIRECTORY = TEST_DIRECTORY / "data"
+
+SEARCHASSIST_PATH = "/_finance_doubledown/api/resource/searchassist;searchTerm="
+
+QUOTE_API_PATH = "/v7/finance/quote"
+
+CHART_PATH = re.compile(r"^/v8/finance/chart/(?P<symbol>[^/]+)$")
+
+QUOTE_SUMMARY_PATH = re.compile(r"^/v10/finance/quoteSummary/(?P<symbol>[^/]+)$")
+
+INTERVAL_SECONDS = {"1m": 60, "5m": 300, "15m": 900, "1h": 3600, "1d": 86_400, "1wk": 604_800}
+
+QUOTE_PATH = re.compile(r"^/quote/(?P<symbol>[^/]+)(?:/(?P<page>key-statistics|options))?/?$")
+
+
+def _load_pages(pattern: str, suffix: str, directory: Path = DATA_DIRECTORY) -> Dict[str, bytes]:
+    return {
+        path.name[: -len(suffix)].upper(): path.read_bytes()
+        for path in sorted(directory.glob(pattern))
+    }
+
+
+SUMMARY_PAGES = _load_pages(
+    "*_summary_page_raw.html", "_summary_page_raw.html", DATA_DIRECTORY / "summary"
+)
+STATISTICS_PAGES = _load_pages("*_statistics_page_raw.html", "_statistics_page_raw.html")
+OPTION_PAGES = {
+    symbol: page
+    for symbol, page in _load_pages("*_option_page_raw.html", "_option_page_raw.html").items()
+    if symbol in ("AAPL", "TSLA")  # the other fixtures have no option tables
+}
+PAGES = {None: SUMMARY_PAGES, "key-statistics": STATISTICS_PAGES, "options": OPTION_PAGES}
+
+
+@dataclass
+class ServerConfig:
+    """Simulated network and server behaviour.
+
+    Attributes:
+        latency (float): Seconds to wait before every response.
+        jitter (float): Up to this many extra seconds are added to the latency at random.
+        error_rate (float): Fraction of requests answered with a 500 error.
+        throttle_rate (float): Fraction of requests answered with a 429 error.
+        seed (int): Random seed for reproducible runs.
+        unknown_symbols (Tuple[str]): Symbols without lookup results or pages.
+    """
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    seed: Optional[int] = None
+    unknown_symbols: Tuple[str, ...] = ()
+
+
+def fixture_page(pages: Dict[str, bytes], symbol: str) -> bytes:
+    """Return the fixture page of a symbol or a stable stand-in for unknown symbols."""
+    symbol = symbol.upper()
+
+    if symbol in pages:
+        return pages[symbol]
+
+    names = sorted(pages)
+    return pages[names[zlib.crc32(symbol.encode()) % len(names)]]
+
+
+def searchassist_response(search_term: str, unknown_symbols: Tuple[str, ...] = ()) -> bytes:
+    """Build a quote lookup response with the search term as the only symbol."""
+    if search_term.upper() in unknown_symbols:
+        return json.dumps({"items": []}).encode()
+
+    item = {
+        "symbol": search_term.upper(),
+        "name": search_term,
+        "exch": "NMS",
+        "type": "S",
+        "exchDisp": "NASDAQ",
+        "typeDisp": "Equity",
+    }
+    return json.dumps({"items": [item]}).encode()
+
+
+_fixture_quotes: Dict[bytes, Dict] = {}
+
+
+def quote_api_response(symbols: List[str], unknown_symbols: Tuple[str, ...] = ()) -> bytes:
+    """Build a quote api response from the quote headers of the summary fixture pages."""
+    results = []
+
+    for symbol in symbols:
+        if symbol.upper() in unknown_symbols:
+            continue
+
+        page = fixture_page(SUMMARY_PAGES, symbol)
+
+        if page not in _fixture_quotes:
+            _fixture_quotes[page] = parse_quote_header_text(page.decode()).dict()
+
+        quote = _fixture_quotes[page]
+        results.append(
+            {
+                "symbol": symbol.upper(),
+                "longName": quote["name"],
+                "currency": "USD",
+                "regularMarketPrice": quote["close"],
+                "regularMarketChange": quote["change"],
+                "regularMarketChangePercent": quote["percent_change"],
+                "regularMarketTime": 1602878400,
+            }
+        )
+
+    return json.dumps({"quoteResponse": {"result": results, "error": None}}).encode()
+
+
+def chart_response(symbol: str, period1: int, period2: int, interval: str) -> bytes:
+    """Build a chart api response with generated weekday bars.
+
+    Every bar depends only on the symbol and its timestamp, so overlapping downloads
+    return the same bars. Daily bars start at 13:30 UTC.
+    """
+    step = INTERVAL_SECONDS.get(interval, 86_400)
+    first = period1 - period1 % step + (48_600 if step == 86_400 else 0)
+    timestamps = [
+        timestamp
+        for timestamp in range(first if first >= period1 else first + step, period2, step)
+        if time.gmtime(timestamp).tm_wday < 5
+    ]
+    bars = []
+
+    for timestamp in timestamps:
+        rng = random.Random(f"{symbol.upper()}:{timestamp}")
+        close = round(100 + 20 * rng.random(), 2)
+        bars.append((round(close - rng.random(), 2), close, rng.randrange(1_000, 1_000_000)))
+
+    quote = {
+        "open": [bar[0] for bar in bars],
+        "high": [max(bar[0], bar[1]) + 0.5 for bar in bars],
+        "low": [min(bar[0], bar[1]) - 0.5 for bar in bars],
+        "close": [bar[1] for bar in bars],
+        "volume": [bar[2] for bar in bars],
+    }
+    result = {
+        "meta": {"symbol": symbol.upper(), "dataGranularity": interval},
+        "timestamp": timestamps,
+        "indicators": {"quote": [quote], "adjclose": [{"adjclose": quote["close"]}]},
+    }
+    return json.dumps({"chart": {"result": [result], "error": None}}).encode()
+
+
+def _api_value(value: object, kind: str) -> object:
+    """Format a page model value the way the quote summary api sends it."""
+    if value is None:
+        return {}
+
+    if kind == "text":
+        return value
+
+    if kind == "date":
+        timestamp = pendulum.datetime(value.year, value.month, value.day).int_timestamp
+        return {"raw": timestamp, "fmt": value.isoformat()}
+
+    if kind == "percent":
+        return {"raw": value / 100, "fmt": f"{value:.2f}%"}
+
+    return {"raw": value, "fmt": str(value)}
+
+
+def _put_fields(modules: Dict, values: Dict, fields: FieldSpec) -> None:
+    """Write model values into quote summary modules. Keys already written are kept."""
+    for field, (module, key, kind) in fields.items():
+        target = modules.setdefault(module, {})
+        *parents, last = key.split(".")
+
+        for parent in parents:
+            target = target.setdefault(parent, {})
+
+        if last not in target:
+            value = _api_value(values.get(field), kind)
+            target[last] = [value] if last == "earningsDate" else value
+
+
+_fixture_fundamentals: Dict[tuple, Dict] = {}
+
+
+def quote_summary_response(symbol: str) -> bytes:
+    """Build a quote summary api response from the summary and statistics fixture pages.
+
+    Values shared by both pages are taken from the statistics page.
+    """
+    pages = (fixture_page(SUMMARY_PAGES, symbol), fixture_page(STATISTICS_PAGES, symbol))
+
+    if pages not in _fixture_fundamentals:
+        summary = parse_summary_page(symbol, parse_html(pages[0].decode()))
+        statistics = parse_statistics_page(symbol, parse_html(pages[1].decode()))
+        modules: Dict = {}
+
+        if statistics is not None:
+            _put_fields(modules, statistics.quote.dict(), QUOTE_FIELDS)
+            _put_fields(
+                modules, statistics.valuation_measures.valuations[0].dict(), VALUATION_FIELDS
+            )
+            _put_fields(
+                modules, statistics.financial_highlights.dict(), FINANCIAL_HIGHLIGHTS_FIELDS
+            )
+            _put_fields(modules, statistics.trading_information.dict(), TRADING_INFORMATION_FIELDS)
+
+        if summary is not None:
+            _put_fields(modules, summary.dict(), QUOTE_FIELDS)
+            _put_fields(modules, summary.dict(), SUMMARY_FIELDS)
+
+        _fixture_fundamentals[pages] = modules
+
+    modules = json.loads(json.dumps(_fixture_fundamentals[pages]))
+    modules.setdefault("price", {})["symbol"] = symbol.upper()
+    return json.dumps({"quoteSummary": {"result": [modules], "error": None}}).encode()
+
+
+class MockYahooHandler(BaseHTTPRequestHandler):
+    """Serves the fixture pages for the yahoo finance paths used by yfs."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:  # noqa: N802
+        """Answer a GET request."""
+        server = self.server
+        config = server.config
+
+        with server.lock:
+            server.request_count += 1
+            delay = config.latency + server.random.uniform(0, config.jitter)
+            roll = server.random.random()
+
+        if delay:
+            time.sleep(delay)
+
+        if roll < config.throttle_rate:
+            self._send(429, b"Too Many Requests", "text/plain")
+        elif roll < config.throttle_rate + config.error_rate:
+            self._send(500, b"Internal Server Error", "text/plain")
+        else:
+            self._route(urlsplit(self.path))
+
+    def _route(self, url) -> None:  # noqa: ANN001
+        path = unquote(url.path)
+
+        if path.startswith(SEARCHASSIST_PATH):
+            search_term = path[len(SEARCHASSIST_PATH) :]
+            body = searchassist_response(search_term, self.server.config.unknown_symbols)
+            self._send(200, body, "application/json")
+            return
+
+        if path == QUOTE_API_PATH:
+            symbols = parse_qs(url.query).get("symbols", [""])[0]
+            body = quote_api_response(
+                [symbol for symbol in symbols.split(",") if symbol],
+                self.server.config.unknown_symbols,
+            )
+            self._send(200, body, "application/json")
+            return
+
+        match = QUOTE_SUMMARY_PATH.match(path)
+
+        if match is not None:
+            self._send(200, quote_summary_response(match.group("symbol")), "application/json")
+            return
+
+        match = CHART_PATH.match(path)
+
+        if match is not None:
+            query = {name: values[0] for name, values in parse_qs(url.query).items()}
+            body = chart_response(
+                match.group("symbol"),
+                int(query.get("period1", 0)),
+                int(query.get("period2", 0)),
+                query.get("interval", "1d"),
+            )
+            self._send(200, body, "application/json")
+            return
+
+        match = QUOTE_PATH.match(path)
+
+        if match is None or match.group("symbol").upper() in self.server.config.unknown_symbols:
+            self._send(404, b"Not Found", "text/plain")
+            return
+
+        pages = PAGES[match.group("page")]
+        self._send(200, fixture_page(pages, match.group("symbol")), "text/html")
+
+    def _send(self, status: int, body: bytes, content_type: str) -> None:
+        with self.server.lock:
+            self.server.status_counts[status] = self.server.status_counts.get(status, 0) + 1
+
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args) -> None:  # noqa: A002, ANN001, ANN002
+        """Silence the per request log lines."""
+
+
+class MockYahooServer:
+    """A threaded mock yahoo finance server running on a background thread.
+
+    Attributes:
+        config (ServerConfig): Simulated latency and error rates.
+        base_url (str): Url to use as yfs.urls.BASE_URL and yfs.urls.QUERY_URL.
+    """
+
+    def __init__(
+        self,
+        config: ServerConfig = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        **kwargs,  # noqa: ANN003
+    ) -> None:
+        """Create a server. kwargs are ServerConfig fields."""
+        self.config = config or ServerConfig(**kwargs)
+        self.httpd = ThreadingHTTPServer((host, port), MockYahooHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.config = self.config
+        self.httpd.lock = threading.Lock()
+        self.httpd.random = random.Random(self.config.seed)
+        self.httpd.request_count = 0
+        self.httpd.status_counts = {}
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """Scheme, host and port of the server."""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def request_count(self) -> int:
+        """Number of requests received."""
+        return self.httpd.request_count
+
+    @property
+    def status_counts(self) -> Dict[int, int]:
+        """Number of responses per HTTP status code."""
+        return dict(self.httpd.status_counts)
+
+    def start(self) -> "MockYahooServer":
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    @contextmanager
+    def patch_base_url(self) -> Iterator[str]:
+        """Point yfs at the server for the duration of the context."""
+        base_url, query_url = yfs.urls.BASE_URL, yfs.urls.QUERY_URL
+        yfs.urls.BASE_URL = yfs.urls.QUERY_URL = self.base_url
+        try:
+            yield self.base_url
+        finally:
+            yfs.urls.BASE_URL, yfs.urls.QUERY_URL = base_url, query_url
+
+    def __enter__(self) -> "MockYahooServer":
+        """Start the server."""
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Stop the server."""
+        self.stop()
+
+
+def main() -> None:
+    """Run the server until interrupted. The base url is printed on the first line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    config = ServerConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        seed=args.seed,
+    )
+    server = MockYahooServer(config, host=args.host, port=args.port)
+    print(server.base_url, flush=True)
+
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import pytest
+
+from yfs.archive import classify_url, reparse_archive, ResponseArchive
+from yfs.bundle import PageType
+from yfs.client import YFSClient
+from yfs.paths import TEST_DIRECTORY
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("https://finance.yahoo.com/quote/aapl?p=aapl", ("aapl", PageType.SUMMARY)),
+        (
+            "https://finance.yahoo.com/quote/AAPL/key-statistics?p=AAPL",
+            ("AAPL", PageType.STATISTICS),
+        ),
+        ("https://finance.yahoo.com/quote/AAPL/options?date=1&p=AAPL", ("AAPL", PageType.OPTIONS)),
+        ("https://finance.yahoo.com/quote/AAPL/history?p=AAPL", None),
+        ("https://query1.finance.yahoo.com/v7/finance/quote?symbols=AAPL", None),
+    ],
+)
+def test_classify_url(url, expected):
+    assert classify_url(url) == expected
+
+
+def test_bodies_are_read_back_from_segments(tmp_path):
+    with ResponseArchive(tmp_path, codec="gzip", segment_size=10) as archive:
+        first = archive.write("aapl", PageType.SUMMARY, "url", b"first body", fetched_at=100)
+        second = archive.write("tsla", PageType.OPTIONS, "url", b"second body", fetched_at=200)
+
+    assert first.segment != second.segment
+    assert (tmp_path / first.segment).name.endswith(".gz")
+
+    with open(tmp_path / "index.jsonl", "ab") as index:
+        index.write(b'{"symbol": "torn')
+
+    archive = ResponseArchive(tmp_path)
+    assert len(archive) == 2
+    assert archive.read(archive.entries(symbols=["TSLA"])[0]) == b"second body"
+    assert archive.entries(page_type=PageType.SUMMARY) == [first]
+    assert archive.entries(start=150) == [second]
+    assert archive.entries(end=150) == [first]
+
+
+def test_zstd_segments(tmp_path):
+    pytest.importorskip("zstandard")
+
+    with ResponseArchive(tmp_path, codec="zstd") as archive:
+        entry = archive.write("aapl", PageType.SUMMARY, "url", b"body")
+
+    assert entry.codec == "zstd"
+    assert ResponseArchive(tmp_path, codec="gzip").read(entry) == b"body"
+
+
+def test_unknown_codec_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        ResponseArchive(tmp_path, codec="lz4")
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_client_pages_are_archived_and_reparsed(mock_server, tmp_path, max_workers):
+    with YFSClient(archive=ResponseArchive(tmp_path, codec="gzip")) as client:
+        summary = client.get_summary_page("aapl", use_fuzzy_search=False)
+        statistics = client.get_statistics_page("aapl", use_fuzzy_search=False)
+        chain = client.get_options_page("aapl", use_fuzzy_search=False, first_chain=True)
+
+    archive = ResponseArchive(tmp_path)
+    page_types = {entry.page_type for entry in archive.entries(symbols=["aapl"])}
+    assert page_types == set(PageType)
+
+    results = reparse_archive(tmp_path, max_workers=max_workers, chunk_size=1)
+    pages = {entry.page_type: page for entry, page, _ in results if page is not None}
+
+    assert len(results) == len(archive)
+    assert all(error is None for _, _, error in results)
+    assert pages[PageType.SUMMARY].dict() == summary.dict()
+    assert pages[PageType.STATISTICS].dict() == statistics.dict()
+
+    assert pages[PageType.OPTIONS].dict() == chain.dict()
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_corrupt_bodies_do_not_stop_a_reparse(tmp_path, max_workers):
+    body = (TEST_DIRECTORY / "data" / "summary" / "aapl_summary_page_raw.html").read_bytes()
+    url = "https://finance.yahoo.com/quote/aapl?p=aapl"
+
+    with ResponseArchive(tmp_path, codec="gzip") as archive:
+        archive.write("aapl", PageType.SUMMARY, url, body, fetched_at=100)
+        archive.write("aapl", PageType.SUMMARY, url, b"", fetched_at=200)
+        archive.write("aapl", PageType.SUMMARY, url, body, fetched_at=300)
+
+    results = reparse_archive(tmp_path, max_workers=max_workers, chunk_size=2)
+
+    assert [entry.fetched_at for entry, _, _ in results] == [100, 200, 300]
+    assert [page is None for _, page, _ in results] == [False, True, False]
+    assert [error is None for _, _, error in results] == [True, False, True]
+    assert results[1][2].startswith("TypeError")
+    assert results[0][1].symbol == "AAPL"
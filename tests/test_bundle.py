@@ -0,0 +1,71 @@
+import pytest
+
+import yfs.bundle
+from yfs.bundle import get_symbol_bundle, PageType
+from yfs.paths import TEST_DIRECTORY
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+        self.ok = text is not None
+
+
+def read_page(path):
+    with open(path, mode="r") as file:
+        return file.read()
+
+
+@pytest.fixture
+def aapl_pages(monkeypatch):
+    pages = {
+        "/quote/AAPL?": read_page(
+            TEST_DIRECTORY / "data" / "summary" / "aapl_summary_page_raw.html"
+        ),
+        "/quote/AAPL/key-statistics?": read_page(
+            TEST_DIRECTORY / "data" / "aapl_statistics_page_raw.html"
+        ),
+    }
+    requested = []
+
+    def fake_requestor(url, **kwargs):
+        requested.append(url)
+        for path, text in pages.items():
+            if path in url:
+                return FakeResponse(text)
+        return FakeResponse(None)
+
+    monkeypatch.setattr(yfs.bundle, "requestor", fake_requestor)
+    return requested
+
+
+def test_symbol_bundle_parses_quote_once(monkeypatch, aapl_pages):
+    calls = []
+    parse_quote_header_info = yfs.bundle.parse_quote_header_info
+
+    def counting_parser(html):
+        calls.append(html)
+        return parse_quote_header_info(html)
+
+    monkeypatch.setattr(yfs.bundle, "parse_quote_header_info", counting_parser)
+
+    result = get_symbol_bundle(
+        "AAPL", pages=[PageType.SUMMARY, PageType.STATISTICS], use_fuzzy_search=False
+    )
+
+    assert len(calls) == 1
+    assert len(aapl_pages) == 2
+    assert result.summary.symbol == "AAPL"
+    assert result.statistics.symbol == "AAPL"
+    assert result.summary.quote == result.statistics.quote == result.quote
+    assert result.options is None
+
+
+def test_symbol_bundle_page_not_found(aapl_pages):
+    with pytest.raises(AttributeError):
+        get_symbol_bundle("MSFT", pages=[PageType.SUMMARY], use_fuzzy_search=False)
+
+    result = get_symbol_bundle(
+        "MSFT", pages=[PageType.SUMMARY], use_fuzzy_search=False, page_not_found_ok=True
+    )
+    assert result is None
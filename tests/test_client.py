@@ -0,0 +1,88 @@
+from time import monotonic
+
+import pytest
+
+from yfs.client import YFSClient
+from yfs import metrics
+from yfs.metrics import TimingRecorder
+from yfs.requestor import PooledSession, RateLimiter
+
+
+def test_client_getters(mock_server):
+    with YFSClient(thread_count=2, metrics=TimingRecorder()) as client:
+        assert client.fuzzy_search("aapl").symbol == "AAPL"
+        assert client.get_summary_page("aapl", use_fuzzy_search=False).symbol == "AAPL"
+        assert client.get_statistics_page("aapl").symbol == "AAPL"
+        assert client.get_quote("AAPL").name
+
+        stages = {stage for stage, _, _ in client.metrics.events}
+
+    assert stages == {"fetch", "html_parse", "clean", "model"}
+
+
+def test_timings_are_not_collected_by_default(mock_server):
+    with YFSClient() as client:
+        assert client.get_summary_page("aapl", use_fuzzy_search=False).symbol == "AAPL"
+        assert client.metrics is None
+        assert client._call(lambda **kwargs: metrics.enabled()) is False
+        assert client.executor.submit(metrics.enabled).result() is False
+
+
+def test_multiple_pages_reuse_the_thread_pool(mock_server):
+    symbols = ["aapl", "amd", "amzn", "msft"]
+
+    with YFSClient(thread_count=3, metrics=TimingRecorder()) as client:
+        first = client.get_multiple_summary_pages(symbols, use_fuzzy_search=False)
+        executor = client.executor
+        second = client.get_multiple_summary_pages(symbols, use_fuzzy_search=False)
+
+        assert client.executor is executor
+        assert sorted(first.symbols) == sorted(second.symbols) == [s.upper() for s in symbols]
+
+        fetches = [event for event in client.metrics.events if event[0] == "fetch"]
+        assert len(fetches) == 2 * len(symbols)  # timings from the worker threads
+
+    with pytest.raises(RuntimeError):
+        client.executor  # pylint: disable=pointless-statement
+
+
+def test_options_use_the_client_cache(mock_server):
+    with YFSClient() as client, YFSClient() as other:
+        client.get_option_expirations("TSLA")
+        client.get_options_page("TSLA", first_chain=True, use_fuzzy_search=False)
+        other.get_option_expirations("TSLA")
+
+        assert client.expiration_cache.get("TSLA") is not None
+
+    # the cached expirations of client are not shared with other
+    assert mock_server.request_count == 3
+
+
+def test_bundle_uses_the_client_pool(mock_server):
+    with YFSClient() as client:
+        bundle = client.get_symbol_bundle("aapl", pages=["summary", "statistics"])
+
+        assert bundle.summary.symbol == bundle.statistics.symbol == "AAPL"
+        assert client._executor is not None  # pylint: disable=protected-access
+
+
+def test_rate_limiter():
+    limiter = RateLimiter(rate=50, burst=2)
+    start = monotonic()
+
+    waits = [limiter.acquire() for _ in range(6)]
+
+    assert waits[:2] == [0.0, 0.0]
+    assert monotonic() - start >= 4 / 50 * 0.9
+
+    with pytest.raises(ValueError):
+        RateLimiter(rate=0)
+
+
+def test_session_rate_limiter(mock_server):
+    session = PooledSession(pool_size=2)
+
+    with YFSClient(session=session, requests_per_second=100) as client:
+        assert client.session is session
+        assert session.rate_limiter is client.rate_limiter
+        client.get_summary_page("aapl", use_fuzzy_search=False)
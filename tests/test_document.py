@@ -0,0 +1,55 @@
+import pytest
+
+from yfs.document import compile_selector, element_text, parse_html, select, select_first
+from yfs.paths import TEST_DIRECTORY
+from yfs.quote import parse_quote_header_info, QUOTE_SELECTORS
+
+
+@pytest.fixture
+def html():
+    return parse_html(
+        (TEST_DIRECTORY / "data" / "summary" / "aapl_summary_page_raw.html").read_text()
+    )
+
+
+def test_compile_selector_is_shared():
+    assert compile_selector("div#quote-summary") is compile_selector("div#quote-summary")
+
+
+@pytest.mark.parametrize(
+    "selector", ["div#quote-summary", "tr", QUOTE_SELECTORS["close"], "div.does-not-exist"]
+)
+def test_select_matches_find(html, selector):
+    expected = html.find(selector)
+
+    assert [element.element for element in expected] == select(html, selector)
+    assert [element.text for element in expected] == [
+        element_text(element) for element in select(html, selector)
+    ]
+
+
+def test_select_runs_each_query_once_per_document(html):
+    header = select_first(html, "div#quote-header-info")
+    change = QUOTE_SELECTORS["change"]
+
+    assert select(html, change, header) is select(html, change, header)
+    assert select(html, change) is not select(html, change, header)
+    assert select_first(html, "div.does-not-exist") is None
+
+
+def test_quote_header_shares_the_change_query(html):
+    parse_quote_header_info(html)
+
+    selectors = [selector for selector, _ in vars(html)["_selections"]]
+
+    assert selectors.count(QUOTE_SELECTORS["change"]) == 1
+    assert selectors.count("div#quote-header-info") == 1
+
+
+def test_select_within_an_element_is_not_memoized(html):
+    summary = html.find("div#quote-summary", first=True)
+
+    rows = select(summary, "tr")
+
+    assert "_selections" not in vars(html)
+    assert rows == select(html, "tr", summary)
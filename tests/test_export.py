@@ -0,0 +1,140 @@
+import pytest
+
+from yfs.options import (
+    ContractExpiration,
+    get_table_elements,
+    MultipleOptionChains,
+    OptionsChain,
+    ContractExpirationList,
+    parse_option_table,
+)
+from yfs.quote import Quote
+from yfs.statistics import parse_valuation_table
+from yfs.paths import TEST_DIRECTORY
+from yfs.summary import SummaryPageGroup
+
+from .common_fixtures import (
+    get_data,
+    statistics_page_data_fixture,
+)
+from .test_summary import create_summary_page_object
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from yfs.export import (  # noqa: E402
+    ParquetPageWriter,
+    option_chains_table,
+    summary_table,
+    valuation_table,
+    write_parquet,
+)
+
+
+@pytest.fixture(scope="module")
+def summary_page_group():
+    group = SummaryPageGroup()
+    for symbol in ["tsla", "aapl"]:
+        data = get_data(TEST_DIRECTORY / "data" / "summary" / f"{symbol}_summary_page_raw.html")
+        group.append(create_summary_page_object(symbol, data))
+    return group
+
+
+@pytest.fixture(params=["aapl", "tsla"])
+def option_chains(request):
+    option_page_data_fixture = get_data(
+        TEST_DIRECTORY / "data" / f"{request.param}_option_page_raw.html"
+    )
+    expiration = ContractExpiration(symbol="TEST", timestamp="1602806400")
+    calls_table, puts_table = get_table_elements(option_page_data_fixture)
+    chain = parse_option_table(expiration, "call", calls_table)
+    chain += parse_option_table(expiration, "put", puts_table)
+    options_chain = OptionsChain(
+        symbol="TEST", expiration_date=expiration.expiration_date, chain=chain
+    )
+    return MultipleOptionChains(
+        option_chain_list=[options_chain],
+        contract_expiration_list=ContractExpirationList(expiration_list=[expiration]),
+    )
+
+
+def test_summary_table(summary_page_group):
+    table = summary_table(summary_page_group)
+
+    assert table.num_rows == 2
+    assert table.column("symbol").to_pylist() == sorted(summary_page_group.symbols)
+    assert table.schema.field("close").type == pa.float64()
+    assert table.schema.field("volume").type == pa.int64()
+    assert table.schema.field("earnings_date").type == pa.date32()
+    assert "quote" not in table.column_names
+
+
+def test_valuation_table(statistics_page_data_fixture):
+    valuations = parse_valuation_table(statistics_page_data_fixture)
+    table = valuation_table(valuations, symbol="TEST")
+
+    assert table.num_rows == len(valuations.valuations)
+    assert table.column_names[0] == "symbol"
+    assert table.schema.field("date").type == pa.date32()
+
+
+def test_option_chains_table(option_chains):
+    table = option_chains_table(option_chains)
+
+    assert table.num_rows == len(option_chains.option_chain_list[0])
+    assert table.schema.field("expiration_date").type == pa.timestamp("us", tz="UTC")
+    assert table.schema.field("in_the_money").type == pa.bool_()
+
+
+def test_write_parquet_partitioned(tmp_path, summary_page_group):
+    write_parquet(summary_page_group, tmp_path, partition_by="symbol", batch_size=1)
+
+    partitions = sorted(path.name for path in tmp_path.iterdir())
+    assert partitions == [f"symbol={symbol}" for symbol in sorted(summary_page_group.symbols)]
+
+    table = pq.read_table(tmp_path)
+    assert table.num_rows == 2
+
+
+def test_write_parquet_partitioned_replaces_earlier_runs(tmp_path, summary_page_group):
+    with ParquetPageWriter(tmp_path, partition_by="symbol", batch_size=1) as writer:
+        writer.append(summary_page_group)
+        writer.append(summary_page_group)
+
+    assert pq.read_table(tmp_path).num_rows == 4
+
+    write_parquet(summary_page_group, tmp_path, partition_by="symbol")
+
+    assert pq.read_table(tmp_path).num_rows == 2
+
+
+def test_write_parquet_file(tmp_path, option_chains):
+    path = tmp_path / "options.parquet"
+    write_parquet(option_chains, path, batch_size=10)
+
+    table = pq.read_table(path)
+    assert table.equals(option_chains_table(option_chains))
+
+
+def test_write_parquet_valuation_table(tmp_path, statistics_page_data_fixture):
+    valuations = parse_valuation_table(statistics_page_data_fixture)
+    path = tmp_path / "valuations.parquet"
+    write_parquet(valuations, path)
+
+    table = pq.read_table(path)
+    assert table.num_rows == len(valuations.valuations)
+    assert table.schema.field("date").type == pa.date32()
+
+
+@pytest.mark.parametrize(
+    "items",
+    [
+        [Quote.construct(name="Apple Inc.", close=1.0, change=0.1, percent_change=1.0)],
+        ["AAPL"],
+        {"symbol": "AAPL"},
+        1,
+    ],
+)
+def test_write_parquet_rejects_unsupported_items(tmp_path, items):
+    with pytest.raises(TypeError):
+        write_parquet(items, tmp_path / "rows.parquet")
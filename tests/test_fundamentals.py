@@ -0,0 +1,121 @@
+import pendulum
+import pytest
+
+from yfs.document import parse_html
+from yfs.fundamentals import (
+    get_fundamentals,
+    get_multiple_fundamentals,
+    parse_quote_summary_response,
+)
+from yfs.paths import TEST_DIRECTORY
+from yfs.statistics import parse_statistics_page
+
+RESPONSE = {
+    "quoteSummary": {
+        "result": [
+            {
+                "price": {
+                    "symbol": "AAPL",
+                    "longName": "Apple Inc.",
+                    "regularMarketPrice": {"raw": 116.97, "fmt": "116.97"},
+                    "regularMarketChange": {"raw": -1.06, "fmt": "-1.06"},
+                    "regularMarketChangePercent": {"raw": -0.0089, "fmt": "-0.89%"},
+                    "regularMarketTime": 1602878400,
+                    "marketCap": {"raw": 2034000000000, "fmt": "2.03T", "longFmt": "2,034,000"},
+                },
+                "summaryDetail": {
+                    "bid": {"raw": 116.9, "fmt": "116.90"},
+                    "bidSize": {"raw": 1100, "fmt": "1.1k", "longFmt": "1,100"},
+                    "dividendYield": {"raw": 0.007, "fmt": "0.70%"},
+                    "exDividendDate": {"raw": 1596672000, "fmt": "2020-08-06"},
+                    "trailingPE": {},
+                },
+                "defaultKeyStatistics": {
+                    "52WeekChange": {"raw": 1.0053, "fmt": "100.53%"},
+                    "lastSplitFactor": "4:1",
+                },
+                "calendarEvents": {
+                    "earnings": {
+                        "earningsDate": [
+                            {"raw": 1603929600, "fmt": "2020-10-29"},
+                            {"raw": 1604361600, "fmt": "2020-11-03"},
+                        ]
+                    }
+                },
+            }
+        ],
+        "error": None,
+    }
+}
+
+
+def test_parse_quote_summary_response():
+    fundamentals = parse_quote_summary_response("aapl", RESPONSE)
+    summary, statistics = fundamentals.summary_page, fundamentals.statistics_page
+
+    assert fundamentals.symbol == summary.symbol == statistics.symbol == "AAPL"
+    assert summary.quote == statistics.quote
+    assert summary.quote.name == "Apple Inc." and summary.close == 116.97
+    assert summary.percent_change == pytest.approx(-0.89)
+    assert summary.bid_price == 116.9 and summary.bid_size == 1100
+    assert summary.forward_dividend_yield_percentage == pytest.approx(0.7)
+    assert summary.earnings_date == pendulum.date(2020, 10, 29)
+    assert summary.exdividend_date == pendulum.date(2020, 8, 6)
+    assert summary.pe_ratio_ttm is None and summary.open is None
+
+    valuation = statistics.valuation_measures.valuations[0]
+    assert valuation.date == pendulum.date(2020, 10, 16)
+    assert valuation.market_cap_intraday == 2034000000000
+    assert statistics.trading_information.fifty_two_week_change == pytest.approx(100.53)
+    assert statistics.trading_information.last_split_factor == "4:1"
+    assert statistics.financial_highlights.profit_margin is None
+
+
+def test_parse_quote_summary_response_not_found():
+    data = {"quoteSummary": {"result": None, "error": {"code": "Not Found"}}}
+
+    assert parse_quote_summary_response("missing", data) is None
+
+
+def test_fundamentals_match_the_statistics_page(mock_server):
+    html = parse_html((TEST_DIRECTORY / "data" / "aapl_statistics_page_raw.html").read_text())
+    page = parse_statistics_page("AAPL", html)
+
+    fundamentals = get_fundamentals("aapl", use_fuzzy_search=False)
+    statistics = fundamentals.statistics_page
+
+    assert mock_server.request_count == 1
+    assert statistics.quote == page.quote
+    assert statistics.valuation_measures.valuations[0].dict() == pytest.approx(
+        page.valuation_measures.valuations[0].dict()
+    )
+    assert statistics.financial_highlights.dict() == pytest.approx(
+        page.financial_highlights.dict()
+    )
+    assert statistics.trading_information.dict() == pytest.approx(
+        page.trading_information.dict()
+    )
+
+
+def test_get_fundamentals_not_found(mock_server, monkeypatch):
+    monkeypatch.setattr(
+        "tests.mock_server.quote_summary_response",
+        lambda symbol: b'{"quoteSummary": {"result": null, "error": {"code": "Not Found"}}}',
+    )
+
+    assert get_fundamentals("nope", use_fuzzy_search=False, page_not_found_ok=True) is None
+    with pytest.raises(AttributeError):
+        get_fundamentals("nope", use_fuzzy_search=False)
+
+
+def test_get_multiple_fundamentals(mock_server):
+    group = get_multiple_fundamentals(
+        ["aapl", "tsla", "msft"], use_fuzzy_search=False, with_threads=True, progress_bar=False
+    )
+    group.sort()
+
+    assert mock_server.request_count == 3
+    assert group.symbols == ["AAPL", "MSFT", "TSLA"]
+    assert group["tsla"].summary_page.symbol == "TSLA"
+    assert list(group.summary_pages.dataframe.index) == ["AAPL", "MSFT", "TSLA"]
+    assert len(group.statistics_pages.dataframe) == 3
@@ -0,0 +1,126 @@
+import numpy as np
+
+from yfs.client import YFSClient
+from yfs.history import (
+    get_multiple_price_histories,
+    get_price_history,
+    HistoryStore,
+    Interval,
+    parse_chart_response,
+    PriceHistory,
+)
+
+START, END = "2026-09-01", "2026-10-01"
+
+
+def test_parse_chart_response_drops_bars_without_close():
+    data = {
+        "chart": {
+            "result": [
+                {
+                    "timestamp": [1, 2, 3],
+                    "indicators": {
+                        "quote": [
+                            {
+                                "open": [1.0, None, 3.0],
+                                "high": [1.5, None, 3.5],
+                                "low": [0.5, None, 2.5],
+                                "close": [1.2, None, 3.2],
+                                "volume": [10, None, None],
+                            }
+                        ]
+                    },
+                }
+            ]
+        }
+    }
+
+    history = parse_chart_response("aapl", "1d", data)
+
+    assert history.symbol == "AAPL" and history.interval is Interval.ONE_DAY
+    assert history.timestamps.tolist() == [1, 3]
+    assert history.adj_close.tolist() == history.close.tolist() == [1.2, 3.2]
+    assert history.volume.dtype == np.int64 and history.volume.tolist() == [10, 0]
+    assert parse_chart_response("aapl", "1d", {"chart": {"result": None}}) is None
+
+
+def test_get_price_history(mock_server):
+    history = get_price_history("aapl", start=START, end=END, use_fuzzy_search=False)
+
+    assert len(history) == 22  # weekdays in september 2026
+    assert np.all(np.diff(history.timestamps) > 0)
+    assert list(history.dataframe.columns) == [
+        "open",
+        "high",
+        "low",
+        "close",
+        "adj_close",
+        "volume",
+    ]
+    assert history.to_arrow().num_rows == 22
+    assert len(history.between("2026-09-07", "2026-09-14")) == 5
+
+
+def test_get_multiple_price_histories(mock_server):
+    histories = get_multiple_price_histories(
+        ["aapl", "tsla", "msft"],
+        start=START,
+        end=END,
+        use_fuzzy_search=False,
+        with_threads=True,
+        progress_bar=False,
+    )
+
+    assert sorted(histories.symbols) == ["AAPL", "MSFT", "TSLA"]
+    assert histories.dataframe.index.names == ["symbol", "date"]
+    assert histories.to_arrow().num_rows == 3 * 22
+    assert not np.array_equal(histories["aapl"].close, histories["tsla"].close)
+
+
+def test_store_downloads_only_newer_bars(mock_server, tmp_path):
+    store = HistoryStore(tmp_path)
+
+    first = store.update("aapl", start=START, end="2026-09-15")
+    updated = store.update("aapl", end=END)
+    full = get_price_history("aapl", start=START, end=END, use_fuzzy_search=False)
+
+    assert len(first) == 10
+    assert store.symbols() == ["AAPL"]
+    for name, column in full.columns.items():
+        np.testing.assert_array_equal(updated.columns[name], column)
+        np.testing.assert_array_equal(store.load("AAPL").columns[name], column)
+
+
+def test_store_update_many(mock_server, tmp_path):
+    store = HistoryStore(tmp_path)
+    store.update_many(["aapl", "tsla"], start=START, end="2026-09-15", progress_bar=False)
+
+    histories, report = store.update_many(
+        ["aapl", "tsla"], end=END, progress_bar=False, with_threads=True, with_report=True
+    )
+
+    assert sorted(histories.symbols) == ["AAPL", "TSLA"]
+    assert all(len(history) == 22 for history in histories)
+    assert report.counts() == {"ok": 2}
+
+
+def test_merge_replaces_the_overlapping_bar():
+    old = PriceHistory("AAPL", "1d", [1, 2, 3], *[[1.0, 1.0, 1.0]] * 5, [1, 1, 1])
+    new = PriceHistory("AAPL", "1d", [3, 4], *[[2.0, 2.0]] * 5, [2, 2])
+
+    merged = old.merge(new)
+
+    assert merged.timestamps.tolist() == [1, 2, 3, 4]
+    assert merged.close.tolist() == [1.0, 1.0, 2.0, 2.0]
+    assert old.merge(PriceHistory.empty("AAPL", "1d")) is old
+
+
+def test_client_price_histories(mock_server):
+    with YFSClient(thread_count=2) as client:
+        history = client.get_price_history("aapl", start=START, end=END, use_fuzzy_search=False)
+        histories = client.get_multiple_price_histories(
+            ["aapl", "tsla"], start=START, end=END, use_fuzzy_search=False
+        )
+
+    assert len(history) == 22
+    np.testing.assert_array_equal(histories["aapl"].close, history.close)
@@ -0,0 +1,39 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+HEAVY_MODULES = ["enlighten", "numpy", "pandas", "pyppeteer", "requests_html"]
+
+IMPORT_STATEMENTS = [
+    "import yfs",
+    "from yfs import fuzzy_search",
+    "from yfs import get_summary_page, get_statistics_page, get_options_page",
+    "from yfs import get_symbol_bundle, get_multiple_summary_pages",
+]
+
+
+@pytest.mark.parametrize("statement", IMPORT_STATEMENTS)
+def test_import_does_not_load_heavy_modules(statement):
+    code = (
+        "import json, sys\n"
+        f"{statement}\n"
+        f"print(json.dumps([name for name in {HEAVY_MODULES!r} if name in sys.modules]))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+
+    assert json.loads(output) == []
+
+
+def test_lazy_attributes():
+    import yfs
+    from yfs.summary import get_summary_page
+
+    assert yfs.get_summary_page is get_summary_page
+    assert set(yfs.__all__) <= set(dir(yfs))
+
+    with pytest.raises(AttributeError):
+        yfs.not_an_attribute
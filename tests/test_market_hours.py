@@ -0,0 +1,140 @@
+import json
+
+import pendulum
+import pytest
+
+from yfs.exchanges import (
+    AsianExchanges,
+    EuropeanExchanges,
+    UnitedStatesExchanges,
+    UnknownExchanges,
+    VALID_EXCHANGE_ENUMS,
+)
+from yfs.market_hours import (
+    EXCHANGE_SESSIONS,
+    is_open,
+    load_calendars,
+    MarketState,
+    next_open,
+    RefreshScheduler,
+    session_for,
+)
+
+
+def utc(text):
+    return pendulum.parse(text)
+
+
+def test_every_known_exchange_has_a_session():
+    for exchange in VALID_EXCHANGE_ENUMS:
+        if isinstance(exchange, UnknownExchanges):
+            assert session_for(exchange) is None
+        else:
+            assert exchange in EXCHANGE_SESSIONS
+
+
+@pytest.mark.parametrize("exchange", [UnitedStatesExchanges.NASDAQ, "NASDAQ", "NYSE", "NYSE_ARCA"])
+def test_session_for_enum_name_and_value(exchange):
+    assert session_for(exchange).timezone == "America/New_York"
+
+
+@pytest.mark.parametrize(
+    "at, state",
+    [
+        ("2026-10-19T13:00:00Z", MarketState.CLOSED),  # monday before the open
+        ("2026-10-19T14:00:00Z", MarketState.OPEN),
+        ("2026-10-19T20:00:00Z", MarketState.CLOSED),  # the close is exclusive
+        ("2026-10-17T15:00:00Z", MarketState.WEEKEND),
+        ("2026-11-26T15:00:00Z", MarketState.HOLIDAY),  # thanksgiving
+        ("2026-11-27T18:30:00Z", MarketState.CLOSED),  # early close at 13:00
+    ],
+)
+def test_new_york_state(at, state):
+    assert session_for(UnitedStatesExchanges.NYSE).state(utc(at)) is state
+
+
+def test_lunch_break():
+    session = session_for(AsianExchanges.HONG_KONG)
+
+    assert session.state(utc("2026-10-19T04:30:00Z")) is MarketState.BREAK
+    assert session.next_open(utc("2026-10-19T04:30:00Z")) == utc("2026-10-19T05:00:00Z")
+
+
+def test_next_open_skips_weekends_and_holidays():
+    # friday after the close, monday open
+    assert next_open("NASDAQ", utc("2026-10-16T21:00:00Z")) == utc("2026-10-19T13:30:00Z")
+    # wednesday after the close, thursday is thanksgiving
+    assert next_open("NASDAQ", utc("2026-11-25T22:00:00Z")) == utc("2026-11-27T14:30:00Z")
+    # london is open on thanksgiving
+    assert next_open(EuropeanExchanges.LONDON, utc("2026-11-26T12:00:00Z")) == utc(
+        "2026-11-26T12:00:00Z"
+    )
+
+
+def test_unknown_exchange_is_always_open():
+    assert is_open(UnknownExchanges.UNKNOWN, utc("2026-10-17T15:00:00Z"))
+
+
+def test_load_calendars(tmp_path):
+    path = tmp_path / "holidays.json"
+    path.write_text(json.dumps({"US": {"holidays": ["2026-10-19"]}}))
+
+    calendars = load_calendars(path)
+
+    assert pendulum.date(2026, 10, 19) in calendars["US"].holidays
+    assert calendars["US"].close_on(pendulum.date(2026, 10, 19)) is None
+
+
+def test_scheduler_refreshes_often_while_open():
+    scheduler = RefreshScheduler(open_interval=60)
+    scheduler.add("aapl", "NASDAQ")
+    at = utc("2026-10-19T14:00:00Z")
+
+    assert scheduler.due(at) == ["AAPL"]
+
+    scheduler.mark_refreshed(["AAPL"], at)
+
+    assert scheduler.due(at.add(seconds=59)) == []
+    assert scheduler.due(at.add(seconds=60)) == ["AAPL"]
+    assert scheduler.seconds_until_next(at) == 60
+
+
+def test_scheduler_refreshes_at_the_close_then_waits_for_the_open():
+    scheduler = RefreshScheduler(open_interval=300)
+    scheduler.add("AAPL", "NASDAQ")
+
+    scheduler.mark_refreshed(["AAPL"], utc("2026-10-16T19:58:00Z"))
+    assert scheduler.next_refresh("AAPL") == utc("2026-10-16T20:00:00Z")
+
+    scheduler.mark_refreshed(["AAPL"], utc("2026-10-16T20:00:00Z"))
+    assert scheduler.next_refresh("AAPL") == utc("2026-10-19T13:30:00Z")
+
+
+def test_scheduler_closed_interval_only_on_trading_days():
+    scheduler = RefreshScheduler(open_interval=60, closed_interval=3600)
+    scheduler.add("AAPL", "NASDAQ")
+
+    scheduler.mark_refreshed(["AAPL"], utc("2026-10-19T12:00:00Z"))
+    assert scheduler.next_refresh("AAPL") == utc("2026-10-19T13:00:00Z")
+
+    scheduler.mark_refreshed(["AAPL"], utc("2026-10-19T13:00:00Z"))
+    assert scheduler.next_refresh("AAPL") == utc("2026-10-19T13:30:00Z")
+
+    scheduler.mark_refreshed(["AAPL"], utc("2026-10-17T12:00:00Z"))  # saturday
+    assert scheduler.next_refresh("AAPL") == utc("2026-10-19T13:30:00Z")
+
+
+def test_scheduler_run():
+    scheduler = RefreshScheduler(unknown_interval=0)
+    scheduler.add("AAPL", "NASDAQ")
+    scheduler.add("BTC-USD", "CCC")
+    calls = []
+
+    scheduler.run(calls.append, max_runs=2)
+
+    assert sorted(calls[0]) == ["AAPL", "BTC-USD"]
+    assert calls[1] == ["BTC-USD"]
+    assert scheduler.run_count == 2
+
+    scheduler.remove("btc-usd")
+    assert scheduler.symbols == ["AAPL"]
@@ -0,0 +1,84 @@
+import socket
+
+import pytest
+
+from tests.mock_server import MockYahooServer
+from yfs import metrics
+from yfs.document import parse_html
+from yfs.paths import TEST_DIRECTORY
+from yfs.statistics import parse_statistics_page
+from yfs.summary import get_summary_page
+
+
+@pytest.fixture
+def recorder():
+    recorder = metrics.add_callback(metrics.TimingRecorder())
+    yield recorder
+    metrics.remove_callback(recorder)
+
+
+def test_timer_is_shared_no_op_when_disabled():
+    assert metrics.enabled() is False
+    assert metrics.timer(metrics.Stage.FETCH) is metrics.timer(metrics.Stage.CLEAN)
+
+
+def test_summary_page_stages(recorder):
+    with MockYahooServer() as server, server.patch_base_url():
+        get_summary_page("aapl", use_fuzzy_search=False)
+
+    stages = [(stage, labels) for stage, _, labels in recorder.events]
+
+    assert stages == [
+        ("fetch", {"status": 200}),
+        ("html_parse", {"page": "summary"}),
+        ("clean", {"page": "quote"}),
+        ("model", {"page": "quote"}),
+        ("clean", {"page": "summary"}),
+        ("model", {"page": "summary"}),
+    ]
+    assert all(seconds >= 0 for _, seconds, _ in recorder.events)
+
+
+def test_statistics_page_stages(recorder):
+    with open(TEST_DIRECTORY / "data" / "aapl_statistics_page_raw.html") as file:
+        html = parse_html(file.read(), page="statistics")
+
+    parse_statistics_page("AAPL", html)
+
+    assert set(recorder.totals()) == {"html_parse", "clean", "model"}
+
+
+def test_prometheus_collector():
+    collector = metrics.PrometheusCollector(buckets=[0.1, 1.0])
+
+    collector("fetch", 0.05, {"status": 200})
+    collector("fetch", 0.5, {"status": 429})
+    collector("model", 2.0, {"page": "summary"})
+
+    output = collector.render()
+
+    assert 'yfs_stage_seconds_bucket{stage="fetch",le="0.1"} 1' in output
+    assert 'yfs_stage_seconds_bucket{stage="fetch",le="1.0"} 2' in output
+    assert 'yfs_stage_seconds_bucket{stage="fetch",le="+Inf"} 2' in output
+    assert 'yfs_stage_seconds_count{stage="model",page="summary"} 1' in output
+    assert 'yfs_http_responses_total{status="429"} 1' in output
+
+
+@pytest.mark.parametrize(
+    "tags, expected",
+    [
+        (False, [b"yfs.clean.summary:250.000|ms"]),
+        (True, [b"yfs.clean:250.000|ms|#page:summary"]),
+    ],
+)
+def test_statsd_collector(tags, expected):
+    server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    server.bind(("127.0.0.1", 0))
+    server.settimeout(1)
+
+    collector = metrics.StatsdCollector(port=server.getsockname()[1], tags=tags)
+    collector("clean", 0.25, {"page": "summary"})
+    collector.close()
+
+    assert [server.recv(1024)] == expected
+    server.close()
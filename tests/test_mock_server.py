@@ -0,0 +1,24 @@
+from tests.mock_server import MockYahooServer
+from yfs.lookup import fuzzy_search
+from yfs.statistics import get_statistics_page
+from yfs.summary import get_summary_page
+from yfs import urls
+
+
+def test_urls_use_base_url(mock_server):
+    assert urls.summary_page_url("AAPL") == f"{mock_server.base_url}/quote/AAPL?p=AAPL"
+    assert urls.options_page_url("AAPL", "1602806400").startswith(mock_server.base_url)
+
+
+def test_pages_from_mock_server(mock_server):
+    assert fuzzy_search("aapl").symbol == "AAPL"
+    assert get_summary_page("aapl").symbol == "AAPL"
+    assert get_statistics_page("aapl").symbol == "AAPL"
+    assert get_summary_page("unknown", use_fuzzy_search=False).symbol == "UNKNOWN"
+    assert mock_server.status_counts == {200: 6}
+
+
+def test_mock_server_throttling():
+    with MockYahooServer(throttle_rate=1.0) as server, server.patch_base_url():
+        assert get_summary_page("aapl", use_fuzzy_search=False, page_not_found_ok=True) is None
+        assert server.status_counts == {429: 1}
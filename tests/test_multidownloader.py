@@ -0,0 +1,83 @@
+import pytest
+
+from tests.mock_server import MockYahooServer
+import yfs.multidownloader
+from yfs.multidownloader import OutcomeStatus
+from yfs.statistics import get_multiple_statistics_pages
+from yfs.summary import get_multiple_summary_pages
+
+
+@pytest.fixture
+def mock_server(request, monkeypatch):
+    monkeypatch.setattr(yfs.multidownloader, "RETRY_BACKOFF", 0)
+    kwargs = getattr(request, "param", {})
+
+    with MockYahooServer(seed=0, **kwargs) as server, server.patch_base_url():
+        yield server
+
+
+@pytest.mark.parametrize("with_threads", [False, True])
+def test_report_of_downloaded_pages(mock_server, with_threads):
+    pages, report = get_multiple_summary_pages(
+        ["aapl", "tsla", "aapl"],
+        with_threads=with_threads,
+        progress_bar=False,
+        with_report=True,
+    )
+
+    assert sorted(pages.symbols) == ["AAPL", "TSLA"]
+    assert sorted(outcome.symbol for outcome in report.outcomes) == ["AAPL", "TSLA"]
+    assert report.counts() == {"ok": 2}
+    assert report.requeue() == []
+    assert report.symbols_per_second > 0
+
+    for outcome in report.outcomes:
+        assert outcome.http_status == 200
+        assert outcome.retries == 0
+        assert outcome.fetch_seconds > 0
+        assert outcome.parse_seconds > 0
+        assert outcome.error is None
+
+
+@pytest.mark.parametrize("mock_server", [{"throttle_rate": 1.0}], indirect=True)
+@pytest.mark.parametrize("with_threads", [False, True])
+def test_report_of_throttled_pages(mock_server, with_threads):
+    pages, report = get_multiple_statistics_pages(
+        ["aapl", "fcel"],
+        use_fuzzy_search=False,
+        page_not_found_ok=False,
+        with_threads=with_threads,
+        progress_bar=False,
+        retries=2,
+        with_report=True,
+    )
+
+    assert pages is None
+    assert report.counts() == {"throttled": 2}
+    assert sorted(report.requeue()) == ["aapl", "fcel"]
+    assert mock_server.status_counts == {429: 6}
+
+    for outcome in report.outcomes:
+        assert outcome.http_status == 429
+        assert outcome.retries == 2
+        assert outcome.error == f"AttributeError: {outcome.symbol} statistics page not found."
+
+
+@pytest.mark.parametrize("mock_server", [{"throttle_rate": 1.0}], indirect=True)
+def test_invalid_symbols_are_reported(mock_server):
+    outcomes = []
+
+    pages = get_multiple_summary_pages(
+        ["aapl"], with_threads=True, progress_bar=False, on_outcome=outcomes.append
+    )
+
+    assert pages is None
+    assert [outcome.status for outcome in outcomes] == [OutcomeStatus.INVALID_SYMBOL]
+
+
+@pytest.mark.parametrize("mock_server", [{"throttle_rate": 1.0}], indirect=True)
+def test_errors_are_raised_without_report(mock_server):
+    with pytest.raises(AttributeError):
+        get_multiple_summary_pages(
+            ["aapl"], use_fuzzy_search=False, page_not_found_ok=False, progress_bar=False
+        )
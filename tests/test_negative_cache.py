@@ -0,0 +1,148 @@
+import pytest
+
+from yfs.client import YFSClient
+from yfs.lookup import fuzzy_search
+from yfs.multidownloader import _remember_outcome, OutcomeStatus, SymbolOutcome
+from yfs.negative_cache import negative_key, NegativeCache
+from yfs.summary import get_multiple_summary_pages
+
+unknown_symbols = pytest.mark.parametrize(
+    "mock_server", [{"unknown_symbols": ("JUNK", "MOON")}], indirect=True
+)
+
+
+def test_negative_results_expire():
+    cache = NegativeCache()
+    cache.add("lookup:JUNK")
+    cache.add("lookup:OLD", ttl=-1)
+
+    assert "lookup:JUNK" in cache
+    assert "lookup:OLD" not in cache
+    assert "lookup:AAPL" not in cache
+    assert len(cache) == 1
+
+    cache.discard("lookup:JUNK")
+    assert "lookup:JUNK" not in cache
+
+
+def test_cache_is_saved_and_loaded(tmp_path):
+    path = tmp_path / "negative.json"
+    cache = NegativeCache(path)
+    cache.add(negative_key("lookup", " junk "))
+    cache.add("lookup:OLD", ttl=-1)
+    cache.flush()
+
+    loaded = NegativeCache(path)
+
+    assert negative_key("lookup", "JUNK") in loaded
+    assert len(loaded) == 1
+    assert "lookup:OLD" not in loaded._entries
+
+
+def test_damaged_cache_file_is_ignored(tmp_path):
+    path = tmp_path / "negative.json"
+    path.write_text("not json")
+
+    assert len(NegativeCache(path)) == 0
+
+
+@unknown_symbols
+def test_fuzzy_search_skips_cached_search_terms(mock_server):
+    cache = NegativeCache()
+
+    assert fuzzy_search("junk", use_negative_cache=True, negative_cache=cache) is None
+    assert fuzzy_search("junk", use_negative_cache=True, negative_cache=cache) is None
+    assert fuzzy_search("junk", negative_cache=cache) is None
+    assert fuzzy_search("aapl", use_negative_cache=True, negative_cache=cache).symbol == "AAPL"
+
+    assert mock_server.request_count == 3
+
+
+@unknown_symbols
+@pytest.mark.parametrize("with_threads", [False, True])
+def test_multiple_pages_skip_cached_symbols(mock_server, with_threads):
+    cache = NegativeCache()
+    kwargs = dict(
+        use_fuzzy_search=False,
+        with_threads=with_threads,
+        progress_bar=False,
+        with_report=True,
+        use_negative_cache=True,
+        negative_cache=cache,
+    )
+
+    _, first = get_multiple_summary_pages(["aapl", "junk"], **kwargs)
+    requests = mock_server.request_count
+    pages, second = get_multiple_summary_pages(["aapl", "junk"], **kwargs)
+
+    assert first.counts() == second.counts() == {"ok": 1, "not_found": 1}
+    assert mock_server.request_count == requests + 1
+    assert pages.symbols == ["AAPL"]
+    assert [outcome.symbol for outcome in second.outcomes if outcome.cached] == ["junk"]
+
+    with pytest.raises(AttributeError):
+        get_multiple_summary_pages(
+            ["junk"],
+            use_fuzzy_search=False,
+            page_not_found_ok=False,
+            progress_bar=False,
+            use_negative_cache=True,
+            negative_cache=cache,
+        )
+
+
+@unknown_symbols
+def test_invalid_symbols_are_not_looked_up_again(mock_server):
+    cache = NegativeCache()
+
+    for _ in range(2):
+        outcomes = []
+        get_multiple_summary_pages(
+            ["moon", "aapl"],
+            progress_bar=False,
+            on_outcome=outcomes.append,
+            use_negative_cache=True,
+            negative_cache=cache,
+        )
+        statuses = {outcome.symbol: outcome.status for outcome in outcomes}
+        assert statuses == {"moon": OutcomeStatus.INVALID_SYMBOL, "AAPL": OutcomeStatus.OK}
+
+    assert mock_server.request_count == 5  # two lookups and a page, then a lookup and a page
+
+
+@unknown_symbols
+def test_client_uses_and_saves_its_cache(mock_server, tmp_path):
+    cache = NegativeCache(tmp_path / "negative.json")
+
+    with YFSClient(negative_cache=cache) as client:
+        assert client.fuzzy_search("junk") is None
+        assert client.fuzzy_search("junk") is None
+
+    assert mock_server.request_count == 1
+    assert negative_key("lookup", "junk") in NegativeCache(tmp_path / "negative.json")
+
+
+@unknown_symbols
+def test_negative_cache_is_off_by_default(mock_server):
+    with YFSClient() as client:
+        assert client.fuzzy_search("junk") is None
+        assert client.fuzzy_search("junk") is None
+
+    assert fuzzy_search("junk") is None
+    assert mock_server.request_count == 3
+
+
+def test_pages_which_failed_to_parse_are_not_cached():
+    cache = NegativeCache()
+    status = OutcomeStatus.NOT_FOUND
+
+    _remember_outcome(cache, "kind", SymbolOutcome(symbol="A", query="a", status=status))
+    _remember_outcome(
+        cache, "kind", SymbolOutcome(symbol="B", query="b", status=status, http_status=200)
+    )
+    _remember_outcome(
+        cache, "kind", SymbolOutcome(symbol="C", query="c", status=status, http_status=404)
+    )
+
+    assert len(cache) == 1
+    assert negative_key("kind", "C") in cache
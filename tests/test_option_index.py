@@ -0,0 +1,135 @@
+import pendulum
+import pytest
+
+from yfs.document import parse_html
+from yfs.options import (
+    ContractExpiration,
+    ContractExpirationList,
+    get_table_elements,
+    MultipleOptionChains,
+    OptionContractType,
+    OptionsChain,
+    parse_option_table,
+)
+from yfs.paths import TEST_DIRECTORY
+
+NOW = pendulum.datetime(2020, 10, 1, tz="UTC")
+
+
+def parse_chain(symbol, days):
+    html = parse_html((TEST_DIRECTORY / "data" / f"{symbol}_option_page_raw.html").read_text())
+    timestamp = str(NOW.add(days=days).int_timestamp)
+    expiration = ContractExpiration(symbol=symbol.upper(), timestamp=timestamp)
+    calls_table, puts_table = get_table_elements(html)
+    chain = parse_option_table(expiration, OptionContractType.CALL, calls_table)
+    chain += parse_option_table(expiration, OptionContractType.PUT, puts_table)
+    chain = OptionsChain(
+        symbol=symbol.upper(), expiration_date=expiration.expiration_date, chain=chain
+    )
+    return chain, expiration
+
+
+@pytest.fixture(scope="module")
+def chains():
+    parsed = [parse_chain("aapl", 40), parse_chain("tsla", 10), parse_chain("aapl", 25)]
+    return MultipleOptionChains(
+        option_chain_list=[chain for chain, _ in parsed],
+        contract_expiration_list=ContractExpirationList(
+            expiration_list=[expiration for _, expiration in parsed]
+        ),
+    )
+
+
+def brute_force(chains, contract_type, low, high, in_the_money, min_days, max_days):
+    found = []
+
+    for chain in chains:
+        days = (chain.expiration_date - NOW).total_seconds() / 86400
+
+        if (min_days is not None and days < min_days) or (
+            max_days is not None and days > max_days
+        ):
+            continue
+
+        contracts = [
+            contract.contract_name
+            for contract in chain.chain
+            if (contract_type is None or contract.contract_type == contract_type)
+            and (low is None or (contract.strike is not None and contract.strike >= low))
+            and (high is None or (contract.strike is not None and contract.strike <= high))
+            and (in_the_money is None or contract.in_the_money == in_the_money)
+        ]
+
+        if contracts:
+            found.append(sorted(contracts))
+
+    return found
+
+
+@pytest.mark.parametrize(
+    "contract_type, low, high, in_the_money, min_days, max_days",
+    [
+        (None, None, None, None, None, None),
+        ("call", 100, 130, None, None, None),
+        ("put", None, 120, False, 20, 45),
+        (None, 400, 450, True, None, 30),
+        ("call", 1000, None, None, None, None),
+    ],
+)
+def test_query_matches_brute_force(
+    chains, contract_type, low, high, in_the_money, min_days, max_days
+):
+    result = chains.query(
+        contract_type=contract_type,
+        min_strike=low,
+        max_strike=high,
+        in_the_money=in_the_money,
+        min_days=min_days,
+        max_days=max_days,
+        at=NOW,
+    )
+    found = [sorted(contract.contract_name for contract in chain.chain) for chain in result]
+
+    assert found == brute_force(chains, contract_type, low, high, in_the_money, min_days, max_days)
+
+
+def test_query_moneyness(chains):
+    result = chains.query(contract_type="call", spot=115.0, moneyness=0.05, min_days=20, at=NOW)
+
+    assert [chain.expiration_date for chain in result] == [
+        NOW.add(days=40),
+        NOW.add(days=25),
+    ]
+    assert all(109.25 <= contract.strike <= 120.75 for chain in result for contract in chain.chain)
+
+    with pytest.raises(ValueError):
+        chains.query(moneyness=0.05)
+
+
+def test_calls_and_puts_keep_every_chain(chains):
+    calls, puts = chains.calls, chains.puts
+
+    assert len(calls) == len(puts) == len(chains)
+
+    for chain, call_chain, put_chain in zip(chains, calls, puts):
+        assert call_chain.expiration_date == chain.expiration_date
+        assert len(call_chain) + len(put_chain) == len(chain)
+        assert {contract.contract_type for contract in call_chain.chain} == {"call"}
+        assert [contract.strike for contract in call_chain.chain] == [
+            contract.strike for contract in chain.chain if contract.contract_type == "call"
+        ]
+
+
+def test_index_is_rebuilt_after_the_chains_change(chains):
+    chains = chains.copy(update={"option_chain_list": list(chains.option_chain_list)})
+    assert len(chains.query(min_days=0, at=NOW)) == 3
+
+    chains.option_chain_list = chains.option_chain_list[:1]
+    assert len(chains.query(min_days=0, at=NOW)) == 1
+
+    chain = chains.option_chain_list[0] = chains.option_chain_list[0].copy(deep=True)
+    removed = chain.chain.pop()
+    assert len(chains.index) == len(chain)
+
+    chain.chain.append(removed)
+    assert len(chains.index) == len(chain)
@@ -0,0 +1,109 @@
+import pytest
+
+from yfs.document import parse_html
+from yfs.option_snapshots import ChainDelta, OptionSnapshotStore
+from yfs.options import (
+    ContractExpiration,
+    get_table_elements,
+    OptionContractType,
+    OptionsChain,
+    parse_option_table,
+)
+from yfs.paths import TEST_DIRECTORY
+
+
+@pytest.fixture(scope="module")
+def tsla_chain():
+    html = parse_html((TEST_DIRECTORY / "data" / "tsla_option_page_raw.html").read_text())
+    expiration = ContractExpiration(symbol="TSLA", timestamp="1603411200")
+    calls_table, puts_table = get_table_elements(html)
+    chain = parse_option_table(expiration, OptionContractType.CALL, calls_table)
+    chain += parse_option_table(expiration, OptionContractType.PUT, puts_table)
+    return OptionsChain(symbol="TSLA", expiration_date=expiration.expiration_date, chain=chain)
+
+
+def modified(chain, contracts):
+    return OptionsChain(
+        symbol=chain.symbol, expiration_date=chain.expiration_date, chain=contracts
+    )
+
+
+def as_dicts(chain):
+    return sorted((contract.dict() for contract in chain.chain), key=lambda c: c["contract_name"])
+
+
+def test_first_update_adds_every_contract(tsla_chain):
+    store = OptionSnapshotStore()
+    delta = store.update(tsla_chain)
+
+    assert len(delta.added) == len(tsla_chain) == len(store)
+    assert not delta.removed and not delta.changed
+
+
+def test_unchanged_chain_has_an_empty_delta(tsla_chain):
+    store = OptionSnapshotStore()
+    store.update(tsla_chain)
+
+    assert len(store.update(tsla_chain)) == 0
+
+
+def test_delta_contains_only_changes(tsla_chain):
+    store = OptionSnapshotStore()
+    store.update(tsla_chain)
+
+    first, second, *rest = tsla_chain.chain
+    contracts = [
+        first.copy(update={"last_price": 999.5, "volume": None}),
+        second,
+        *rest[1:],  # rest[0] is removed
+        first.copy(update={"contract_name": "TSLA201023C09999000"}),
+    ]
+    delta = store.update(modified(tsla_chain, contracts))
+
+    assert delta.changed == {first.contract_name: {"last_price": 999.5, "volume": None}}
+    assert delta.removed == [rest[0].contract_name]
+    assert [contract.contract_name for contract in delta.added] == ["TSLA201023C09999000"]
+
+
+def test_apply_reconstructs_state(tsla_chain):
+    store, replica = OptionSnapshotStore(), OptionSnapshotStore()
+    changed = [
+        contract.copy(update={"open_interest": (contract.open_interest or 0) + 1})
+        for contract in tsla_chain.chain[:-1]
+    ]
+
+    for chain in [tsla_chain, modified(tsla_chain, changed)]:
+        delta = store.update(chain)
+        replica.apply(ChainDelta.parse_raw(delta.json()))
+
+    key = store.keys()[0]
+    assert (
+        as_dicts(replica.chain(*key))
+        == as_dicts(store.chain(*key))
+        == as_dicts(modified(tsla_chain, changed))
+    )
+
+
+def test_empty_chain_raises(tsla_chain):
+    with pytest.raises(ValueError):
+        OptionSnapshotStore().diff(modified(tsla_chain, []))
+
+
+def test_apply_rejects_changes_to_unknown_contracts(tsla_chain):
+    store = OptionSnapshotStore()
+    store.update(tsla_chain)
+    first = tsla_chain.chain[0]
+    delta = store.update(modified(tsla_chain, [first.copy(update={"last_price": 1.5})]))
+
+    with pytest.raises(ValueError):
+        OptionSnapshotStore().apply(delta)
+
+    replica = OptionSnapshotStore()
+    replica.update(tsla_chain)
+    unknown = delta.copy(update={"changed": {"TSLA201023C00000001": {"last_price": 2.0}}})
+    before = as_dicts(replica.chain(*replica.keys()[0]))
+
+    with pytest.raises(ValueError):
+        replica.apply(unknown)
+
+    assert as_dicts(replica.chain(*replica.keys()[0])) == before
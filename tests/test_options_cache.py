@@ -0,0 +1,69 @@
+import pytest
+
+from tests.mock_server import MockYahooServer
+from yfs.document import parse_html
+from yfs.options import (
+    expiration_cache,
+    ExpirationCache,
+    get_option_expirations,
+    get_options_page,
+    parse_option_expirations,
+    parse_selected_expiration,
+)
+from yfs.paths import TEST_DIRECTORY
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    expiration_cache.clear()
+    yield
+    expiration_cache.clear()
+
+
+@pytest.mark.parametrize("symbol, selected", [("aapl", "1602806400"), ("tsla", "1602201600")])
+def test_parse_selected_expiration(symbol, selected):
+    html = parse_html((TEST_DIRECTORY / "data" / f"{symbol}_option_page_raw.html").read_text())
+
+    assert parse_selected_expiration(html) == selected
+    assert selected in [
+        expiration.timestamp for expiration in parse_option_expirations(symbol, html)
+    ]
+
+
+def test_expiration_page_chain_is_reused():
+    with MockYahooServer() as server, server.patch_base_url():
+        chain = get_options_page("TSLA", first_chain=True, use_fuzzy_search=False)
+
+    assert chain.chain[0].timestamp == "1602201600"
+    assert server.request_count == 1
+
+
+def test_expirations_are_cached():
+    with MockYahooServer() as server, server.patch_base_url():
+        expirations = get_option_expirations("TSLA")
+        cached = get_option_expirations("TSLA")
+        chain = get_options_page("TSLA", first_chain=True, use_fuzzy_search=False)
+        get_option_expirations("TSLA", use_cache=False)
+
+    assert [expiration.timestamp for expiration in cached] == [
+        expiration.timestamp for expiration in expirations
+    ]
+    assert cached is not expirations
+    assert chain.chain[0].timestamp == "1602201600"
+    assert server.request_count == 3
+
+
+def test_expiration_cache_ttl():
+    html = parse_html((TEST_DIRECTORY / "data" / "tsla_option_page_raw.html").read_text())
+    expirations = parse_option_expirations("TSLA", html)
+    cache = ExpirationCache(ttl=60)
+    cache.set("tsla", expirations)
+
+    assert len(cache.get("TSLA")) == len(expirations)
+
+    cache.ttl = -1
+    assert cache.get("TSLA") is None
+
+    cache.ttl = 60
+    cache.clear("TSLA")
+    assert cache.get("TSLA") is None
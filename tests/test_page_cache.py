@@ -0,0 +1,64 @@
+from yfs.client import YFSClient
+from yfs.options import get_options_page
+from yfs.page_cache import content_hash, PageCache
+from yfs.statistics import get_multiple_statistics_pages, get_statistics_page
+
+
+PAGE = b'<script>%s</script><div id="quote-header-info">%s</div><div id="YDC-Col2">%s</div>'
+
+
+def test_content_hash_only_uses_the_page_data():
+    digest = content_hash(PAGE % (b"a", b"data", b"ad"))
+
+    assert content_hash(PAGE % (b"b", b"data", b"other ad")) == digest
+    assert content_hash(PAGE % (b"a", b"changed", b"ad")) != digest
+    assert content_hash(b"no markers") != content_hash(b"no markers either")
+
+
+def test_least_recently_used_url_is_dropped():
+    cache = PageCache(max_size=2)
+    cache.set("a", "1", "page a")
+    cache.set("b", "1", "page b")
+    assert cache.get("a", "1") == "page a"
+    cache.set("c", "1", "page c")
+
+    assert len(cache) == 2
+    assert cache.get("b", "1") is None
+    assert cache.get("a", "1") == "page a"
+    assert cache.get("a", "2") is None
+
+
+def test_unchanged_page_is_not_parsed_again(mock_server):
+    cache = PageCache()
+
+    first = get_statistics_page("aapl", use_fuzzy_search=False, page_cache=cache)
+    second = get_statistics_page("aapl", use_fuzzy_search=False, page_cache=cache)
+
+    assert second is first
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert get_statistics_page("aapl", use_fuzzy_search=False) is not first
+
+
+def test_dated_options_pages_are_cached(mock_server):
+    cache = PageCache()
+
+    first = get_options_page("aapl", use_fuzzy_search=False, page_cache=cache, use_cache=False)
+    second = get_options_page("aapl", use_fuzzy_search=False, page_cache=cache, use_cache=False)
+
+    assert cache.hits == cache.misses > 0
+    assert [chain.dict() for chain in second] == [chain.dict() for chain in first]
+
+
+def test_multiple_pages_and_client_use_the_cache(mock_server):
+    cache = PageCache()
+
+    pages = get_multiple_statistics_pages(
+        ["aapl", "msft"], use_fuzzy_search=False, progress_bar=False, page_cache=cache
+    )
+
+    with YFSClient(page_cache=cache) as client:
+        again = client.get_multiple_statistics_pages(["aapl", "msft"], use_fuzzy_search=False)
+
+    assert (cache.hits, cache.misses) == (2, 2)
+    first = {page.symbol: page for page in pages}
+    assert all(page is first[page.symbol] for page in again)
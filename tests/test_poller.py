@@ -0,0 +1,132 @@
+import asyncio
+import threading
+
+from loguru import logger
+import pytest
+
+from tests.mock_server import MockYahooServer
+import yfs.poller
+from yfs.document import parse_html
+from yfs.paths import TEST_DIRECTORY
+from yfs.poller import get_quote, QuotePoller
+from yfs.quote import parse_quote_header_info, parse_quote_header_text, Quote
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        TEST_DIRECTORY / "data" / "summary" / "aapl_summary_page_raw.html",
+        TEST_DIRECTORY / "data" / "aapl_statistics_page_raw.html",
+        TEST_DIRECTORY / "data" / "tsla_option_page_raw.html",
+    ],
+)
+def test_parse_quote_header_text(path):
+    text = path.read_text()
+
+    assert parse_quote_header_text(text) == parse_quote_header_info(parse_html(text))
+
+
+def test_get_quote_from_mock_server():
+    with MockYahooServer() as server, server.patch_base_url():
+        quote = get_quote("AAPL")
+
+    assert quote.name == "Apple Inc."
+    assert server.status_counts == {200: 1}
+
+
+@pytest.fixture
+def quotes(monkeypatch):
+    """Replace get_quote with a queue of quotes per symbol."""
+    quotes = {
+        "AAPL": [
+            Quote.construct(name="Apple", close=1.0, change=0.1, percent_change=1.0),
+            Quote.construct(name="Apple", close=1.0, change=0.1, percent_change=1.0),
+            Quote.construct(name="Apple", close=2.0, change=1.1, percent_change=10.0),
+        ],
+        "TSLA": [
+            Quote.construct(name="Tesla", close=5.0, change=0.5, percent_change=1.0),
+            None,
+            Quote.construct(name="Tesla", close=5.0, change=0.5, percent_change=1.0),
+        ],
+    }
+
+    def fake_get_quote(symbol, **kwargs):
+        return quotes[symbol].pop(0)
+
+    monkeypatch.setattr(yfs.poller, "get_quote", fake_get_quote)
+    return quotes
+
+
+def test_poller_emits_only_changes(quotes):
+    poller = QuotePoller(["aapl", "tsla"], interval=0, jitter=0)
+    changes = []
+    poller.on_change(changes.append)
+
+    poller.run(max_polls=3)
+
+    assert [(change.symbol, change.changed_fields) for change in changes] == [
+        ("AAPL", ["close", "change", "percent_change"]),
+        ("TSLA", ["close", "change", "percent_change"]),
+        ("AAPL", ["close", "change", "percent_change"]),
+    ]
+    assert changes[0].previous is None
+    assert changes[2].previous.close == 1.0
+    assert changes[2].current.close == 2.0
+    assert poller.poll_count == 3
+    assert poller.quotes["TSLA"].close == 5.0
+
+
+def test_failing_callback_is_logged_and_polling_continues(quotes):
+    poller = QuotePoller(["aapl", "tsla"], interval=0, jitter=0)
+    changes, messages = [], []
+
+    @poller.on_change
+    def failing_callback(change):
+        raise ValueError(change.symbol)
+
+    poller.on_change(changes.append)
+    sink = logger.add(messages.append, level="ERROR")
+
+    try:
+        thread = threading.Thread(target=poller.run, kwargs={"max_polls": 3})
+        thread.start()
+        thread.join(timeout=5)
+    finally:
+        logger.remove(sink)
+
+    assert poller.poll_count == 3
+    assert [change.symbol for change in changes] == ["AAPL", "TSLA", "AAPL"]
+    assert len(messages) == 3
+    assert "failing_callback" in messages[0] and "ValueError: AAPL" in messages[0]
+
+
+def test_poller_without_initial_quotes(quotes):
+    poller = QuotePoller(["aapl"], interval=0, jitter=0, emit_initial=False)
+
+    assert [poller.poll(), poller.poll()] == [[], []]
+    assert poller.poll()[0].changed_fields == ["close", "change", "percent_change"]
+
+
+def test_poller_asyncio_queue(quotes):
+    async def consume():
+        queue = asyncio.Queue()
+        poller = QuotePoller(["tsla"], interval=0.01, jitter=0)
+        poller.add_queue(queue)
+        poller.start()
+
+        change = await asyncio.wait_for(queue.get(), timeout=5)
+        poller.stop()
+        return change
+
+    change = asyncio.run(consume())
+
+    assert change.symbol == "TSLA"
+    assert change.current.close == 5.0
+
+
+def test_next_delay_jitter():
+    poller = QuotePoller(["aapl"], interval=1.0, jitter=0.25)
+
+    delays = [poller.next_delay() for _ in range(100)]
+
+    assert all(0.75 <= delay <= 1.25 for delay in delays)
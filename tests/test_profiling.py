@@ -0,0 +1,82 @@
+from concurrent.futures import ThreadPoolExecutor
+import os
+import subprocess
+import sys
+
+from yfs import profiling
+from yfs.cleaner import table_cleaner
+from yfs.document import parse_html
+from yfs.paths import PROJECT_ROOT, TEST_DIRECTORY
+from yfs.statistics import parse_statistics_page
+from yfs.summary import parse_summary_page
+
+STATISTICS_PAGE = TEST_DIRECTORY / "data" / "aapl_statistics_page_raw.html"
+SUMMARY_PAGE = TEST_DIRECTORY / "data" / "summary" / "aapl_summary_page_raw.html"
+
+
+def profiled_function_names(stats):
+    return {function_name for _, _, function_name in stats.stats}
+
+
+def test_profiled_keeps_function_metadata():
+    assert table_cleaner.__name__ == "table_cleaner"
+    assert profiling.active_session() is None
+
+
+def test_profile_writes_stats(tmp_path):
+    path = tmp_path / "yfs.prof"
+    text = STATISTICS_PAGE.read_text()
+
+    with profiling.profile(path) as session:
+        parse_statistics_page("AAPL", parse_html(text))
+
+    names = profiled_function_names(session.stats())
+
+    assert {"parse_html", "parse_valuation_table", "classify_statistics_rows"} <= names
+    assert profiling.active_session() is None
+    assert path.exists()
+    assert "parse_statistics_page" in (tmp_path / "yfs.prof.txt").read_text()
+
+
+def test_profile_merges_threads():
+    text = SUMMARY_PAGE.read_text()
+
+    def parse(_):
+        return parse_summary_page("AAPL", parse_html(text))
+
+    with profiling.profile() as session:
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(parse, range(8)))
+
+    stats = session.stats()
+    calls = [
+        call_count
+        for (_, _, function_name), (call_count, *_) in stats.stats.items()
+        if function_name == "parse_summary_page"
+    ]
+
+    assert calls == [8]
+
+
+def test_profile_without_calls():
+    with profiling.profile() as session:
+        pass
+
+    assert session.stats().stats == {}
+
+
+def test_profile_environment_variable(tmp_path):
+    path = tmp_path / "run.prof"
+    script = (
+        "from yfs.document import parse_html;"
+        f"parse_html(open({str(SUMMARY_PAGE)!r}).read())"
+    )
+
+    subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=PROJECT_ROOT,
+        env={**os.environ, "YFS_PROFILE": str(path)},
+        check=True,
+    )
+
+    assert "parse_html" in (tmp_path / "run.prof.txt").read_text()
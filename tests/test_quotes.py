@@ -0,0 +1,119 @@
+import pytest
+import requests
+
+from yfs import quotes as quotes_module
+from yfs.multidownloader import OutcomeStatus
+from yfs.quote import parse_quote_header_info, Quote
+from yfs.quotes import get_quotes, parse_quote_response, QuoteBatchError, QuoteGroup, SymbolQuote
+from yfs.requestor import requestor
+from yfs.urls import quote_api_url
+
+from .common_fixtures import summary_page_data_fixture  # noqa: F401
+
+
+def test_quote_api_url():
+    url = quote_api_url(["AAPL", "^GSPC", "BRK-B"], ["regularMarketPrice"])
+
+    assert url.endswith("/v7/finance/quote?symbols=AAPL,%5EGSPC,BRK-B&fields=regularMarketPrice")
+
+
+def test_parse_quote_response():
+    data = {
+        "quoteResponse": {
+            "result": [
+                {
+                    "symbol": "aapl",
+                    "shortName": "Apple Inc.",
+                    "regularMarketPrice": 110,
+                    "regularMarketChange": {"raw": 2.2, "fmt": "2.20"},
+                    "regularMarketTime": 1602878400,
+                },
+                {"shortName": "no symbol"},
+            ]
+        }
+    }
+
+    (quote,) = parse_quote_response(data)
+
+    assert quote.symbol == "AAPL"
+    assert quote.close == 110.0 and quote.change == 2.2 and quote.percent_change is None
+    assert quote.market_time.int_timestamp == 1602878400
+    assert parse_quote_response({}) == []
+
+
+def test_quotes_match_the_summary_page_header(mock_server, summary_page_data_fixture):
+    symbol, html = summary_page_data_fixture
+    header = parse_quote_header_info(html)
+
+    quote = get_quotes([symbol])[symbol]
+
+    assert isinstance(quote, SymbolQuote)
+    assert {field: getattr(quote, field) for field in header.__fields__} == header.dict()
+
+
+def test_get_quotes_in_batches(mock_server):
+    symbols = [f"S{number}" for number in range(25)] + ["s0"]
+
+    quotes = get_quotes(symbols, batch_size=10, thread_count=2)
+
+    assert quotes.symbols == [f"S{number}" for number in range(25)]
+    assert mock_server.request_count == 3
+
+    dataframe = quotes.dataframe
+    assert list(dataframe.index[:2]) == ["S0", "S1"]
+    assert dataframe["close"].dtype == "float64"
+
+
+@pytest.mark.parametrize("mock_server", [{"throttle_rate": 1.0}], indirect=True)
+def test_failed_batches_are_reported(mock_server):
+    with pytest.raises(QuoteBatchError) as error:
+        get_quotes(["AAPL"], retries=1)
+
+    assert mock_server.request_count == 2
+    assert error.value.symbols == ["AAPL"]
+    assert error.value.quotes is None
+
+    quotes, report = get_quotes(["AAPL"], with_report=True)
+
+    assert quotes is None
+    assert report.requeue() == ["AAPL"]
+    assert report.outcomes[0].status == OutcomeStatus.THROTTLED
+    assert report.outcomes[0].http_status == 429
+
+
+@pytest.mark.parametrize("mock_server", [{"unknown_symbols": ("UNKNOWN",)}], indirect=True)
+def test_connection_errors_are_retried_per_batch(mock_server, monkeypatch):
+    failures = {"S1"}
+
+    def flaky_requestor(url, **kwargs):
+        batch = url.split("symbols=")[1].split("&")[0].split(",")
+
+        if failures.intersection(batch):
+            failures.clear()
+            raise requests.ConnectionError("connection reset")
+        return requestor(url, **kwargs)
+
+    monkeypatch.setattr(quotes_module, "requestor", flaky_requestor)
+    symbols = [f"S{number}" for number in range(4)]
+
+    quotes = get_quotes(symbols, batch_size=2, retries=1)
+    assert quotes.symbols == symbols
+
+    failures.add("S1")
+    with pytest.raises(QuoteBatchError) as error:
+        get_quotes(symbols, batch_size=2)
+
+    assert error.value.symbols == ["S0", "S1"]
+    assert error.value.quotes.symbols == ["S2", "S3"]
+
+    failures.add("S1")
+    quotes, report = get_quotes(symbols + ["UNKNOWN"], batch_size=2, with_report=True)
+
+    assert quotes.symbols == ["S2", "S3"]
+    assert report.counts() == {"error": 2, "ok": 2, "not_found": 1}
+    assert report.outcomes[0].error == "ConnectionError: connection reset"
+
+
+def test_quote_group_rejects_other_models():
+    with pytest.raises(AttributeError):
+        QuoteGroup().append(Quote.construct(name="Apple Inc."))
@@ -0,0 +1,86 @@
+import pytest
+
+from yfs.options import get_options_page, OptionContract
+from yfs.records import (
+    OptionChainRecordGroup,
+    OptionContractRecord,
+    OptionsChainRecord,
+    QuoteRecord,
+    SummaryPageRecord,
+    SummaryRecordGroup,
+)
+from yfs.summary import SummaryPageGroup
+
+from .common_fixtures import summary_page_data_fixture
+from .test_summary import create_summary_page_object
+
+
+def test_summary_page_record_round_trip(summary_page_data_fixture):
+    symbol, data = summary_page_data_fixture
+    page = create_summary_page_object(symbol, data)
+
+    record = SummaryPageRecord.from_model(page)
+
+    assert not hasattr(record, "__dict__")
+    assert record.quote == QuoteRecord.from_model(page.quote)
+    assert record.to_model().json() == page.json()
+
+
+def test_summary_record_group(summary_page_data_fixture):
+    symbol, data = summary_page_data_fixture
+    page = create_summary_page_object(symbol, data)
+
+    group = SummaryPageGroup()
+    group.append(page)
+
+    record_group = SummaryRecordGroup.from_group(group)
+
+    assert len(record_group) == 1
+    assert record_group.symbols == group.symbols
+    assert record_group.to_group().json() == group.json()
+    assert record_group.dataframe.loc[symbol.upper(), "close"] == page.close
+
+
+def test_option_contract_record_round_trip():
+    contract = OptionContract(
+        symbol="AAPL",
+        contract_type="call",
+        timestamp="1602806400",
+        expiration_date="2020-10-16T00:00:00+00:00",
+        in_the_money=True,
+        contract_name="AAPL201016C00050000",
+        strike="50.00",
+        last_price="69.05",
+        bid="69.00",
+        ask="69.20",
+        change="0.00",
+        percent_change="-",
+        volume="3",
+        open_interest="1,171",
+        implied_volatility="367.19%",
+    )
+    record = OptionContractRecord.from_model(contract)
+    assert record.to_model() == contract
+
+
+
+def test_compact_options_page(mock_server):
+    chains = get_options_page("aapl", use_fuzzy_search=False, use_cache=False)
+    records = get_options_page("aapl", use_fuzzy_search=False, use_cache=False, compact=True)
+
+    assert isinstance(records, OptionChainRecordGroup)
+    assert all(isinstance(chain, OptionsChainRecord) for chain in records)
+    assert len(records) == len(chains)
+    assert records.to_model().json() == chains.json()
+    assert len(records.dataframe) == sum(len(chain) for chain in chains)
+
+    first = get_options_page("aapl", use_fuzzy_search=False, first_chain=True, compact=True)
+    assert first.to_model().json() == chains.option_chain_list[0].json()
+
+    with pytest.raises(AttributeError):
+        records.append(chains)
+
+    pytest.importorskip("pyarrow")
+    from yfs.export import option_chains_table
+
+    assert option_chains_table(records).equals(option_chains_table(chains))
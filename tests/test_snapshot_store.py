@@ -0,0 +1,84 @@
+import pendulum
+import pytest
+
+from yfs.bundle import PageType
+from yfs.paths import TEST_DIRECTORY
+from yfs.quote import parse_quote_header_info
+from yfs.snapshot_store import SnapshotStore
+from yfs.statistics import (
+    parse_financial_highlights_table,
+    parse_trading_information_table,
+    parse_valuation_table,
+    StatisticsPage,
+    StatisticsPageGroup,
+)
+from yfs.summary import SummaryPageGroup
+
+from .common_fixtures import get_data
+from .test_summary import create_summary_page_object
+
+
+@pytest.fixture(scope="module")
+def summary_page_group():
+    group = SummaryPageGroup()
+    for symbol in ["tsla", "aapl"]:
+        data = get_data(TEST_DIRECTORY / "data" / "summary" / f"{symbol}_summary_page_raw.html")
+        group.append(create_summary_page_object(symbol, data))
+    return group
+
+
+@pytest.fixture(scope="module")
+def statistics_page_group():
+    data = get_data(TEST_DIRECTORY / "data" / "aapl_statistics_page_raw.html")
+    group = StatisticsPageGroup()
+    group.append(
+        StatisticsPage(
+            symbol="aapl",
+            quote=parse_quote_header_info(data),
+            valuation_measures=parse_valuation_table(data),
+            financial_highlights=parse_financial_highlights_table(data),
+            trading_information=parse_trading_information_table(data),
+        )
+    )
+    return group
+
+
+def test_latest_snapshot_of_every_symbol(summary_page_group):
+    store = SnapshotStore()
+    store.ingest(summary_page_group, fetched_at=100)
+    store.ingest(summary_page_group, fetched_at=200)
+
+    latest = store.latest(PageType.SUMMARY)
+    expected = summary_page_group.dataframe
+
+    assert len(store) == 4
+    assert sorted(latest.index) == ["AAPL", "TSLA"]
+    assert (latest["fetched_at"] == pendulum.from_timestamp(200)).all()
+    assert latest.loc["AAPL", "close"] == expected.loc["AAPL", "close"]
+    assert latest["volume"].dtype == expected["volume"].dtype
+
+    as_of = store.latest(PageType.SUMMARY, symbols=["aapl"], as_of=150)
+    assert list(as_of.index) == ["AAPL"]
+    assert as_of["fetched_at"].iloc[0] == pendulum.from_timestamp(100)
+
+
+def test_history_of_a_symbol(statistics_page_group, tmp_path):
+    with SnapshotStore(tmp_path / "snapshots.db") as store:
+        for fetched_at in (100, 200, 300):
+            store.ingest(statistics_page_group, fetched_at=fetched_at)
+
+    store = SnapshotStore(tmp_path / "snapshots.db")
+    history = store.history(
+        PageType.STATISTICS, "AAPL", start=150, end=pendulum.from_timestamp(300)
+    )
+    expected = statistics_page_group.dataframe
+
+    assert list(history.index) == [pendulum.from_timestamp(200)]
+    assert history["revenue_ttm"].dtype == "Int64"
+    assert history["fiscal_year_ends"].iloc[0] == expected["fiscal_year_ends"].iloc[0]
+    assert store.history(PageType.STATISTICS, "TSLA").empty
+
+
+def test_only_page_groups_are_ingested():
+    with pytest.raises(AttributeError):
+        SnapshotStore().ingest([])
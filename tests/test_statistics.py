@@ -3,7 +3,10 @@ from yfs.statistics import (
     parse_valuation_table,
     parse_financial_highlights_table,
     parse_trading_information_table,
+    StatisticsPage,
+    StatisticsPageGroup,
 )
+from yfs.quote import parse_quote_header_info
 from pytest_regressions import data_regression  # noqa: F401
 from .common_fixtures import statistics_page_data_fixture
 
@@ -21,3 +24,30 @@ def test_financial_highlights_table(data_regression, statistics_page_data_fixtur
 def test_parse_trading_information_table(data_regression, statistics_page_data_fixture):
     result = parse_trading_information_table(statistics_page_data_fixture)
     data_regression.check(result.json())
+
+
+def test_statistics_page_group_dataframe(statistics_page_data_fixture):
+    page = StatisticsPage(
+        symbol="TEST",
+        quote=parse_quote_header_info(statistics_page_data_fixture),
+        valuation_measures=parse_valuation_table(statistics_page_data_fixture),
+        financial_highlights=parse_financial_highlights_table(statistics_page_data_fixture),
+        trading_information=parse_trading_information_table(statistics_page_data_fixture),
+    )
+    group = StatisticsPageGroup()
+    group.append(page)
+
+    dataframe = group.dataframe
+
+    assert list(dataframe.index) == ["TEST"]
+    assert dataframe.loc["TEST", "name"] == page.quote.name
+    assert dataframe["close"].dtype == "float64"
+    assert dataframe["revenue_ttm"].dtype == "Int64"
+    assert dataframe["fiscal_year_ends"].dtype == "datetime64[ns]"
+    assert dataframe.loc["TEST", "shares_short"] == page.trading_information.shares_short
+
+    page.quote.close = 1.5
+    assert group.dataframe.loc["TEST", "close"] == 1.5
+
+    group.pages[0] = page.copy(update={"symbol": "OTHER"})
+    assert list(group.dataframe.index) == ["OTHER"]
@@ -42,3 +42,24 @@ def test_sorting_summary_pages(multiple_summary_page_data_fixture):
     summary_page_group.append(page_two)
     summary_page_group.sort()
     assert summary_page_group.symbols == target
+
+
+def test_summary_page_group_dataframe(multiple_summary_page_data_fixture):
+    symbol_one, symbol_two, data_one, data_two, target = multiple_summary_page_data_fixture
+    page_one = create_summary_page_object(symbol_one, data_one)
+    page_two = create_summary_page_object(symbol_two, data_two)
+
+    summary_page_group = SummaryPageGroup()
+    summary_page_group.append(page_one)
+    summary_page_group.append(page_two)
+
+    dataframe = summary_page_group.dataframe
+
+    assert list(dataframe.index) == target
+    assert "quote" not in dataframe.columns
+    assert dataframe["close"].dtype == "float64"
+    assert dataframe["volume"].dtype == "Int64"
+    assert dataframe["earnings_date"].dtype == "datetime64[ns]"
+
+    rebuilt = SummaryPageGroup(pages=[page_two, page_one]).dataframe
+    assert rebuilt.equals(dataframe)
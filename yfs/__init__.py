@@ -1,18 +1,73 @@
-from yfs.asset_types import AssetTypes
-from yfs.exchanges import ExchangeTypes
-from yfs.lookup import fuzzy_search
-from yfs.options import get_options_page
-from yfs.statistics import get_statistics_page, get_multiple_statistics_pages
-from yfs.summary import get_summary_page, get_multiple_summary_pages
+"""Scrape Yahoo Finance.
+
+The public functions are imported lazily on first attribute access (PEP 562) so
+`import yfs` stays cheap. pandas, requests_html and enlighten are only imported when
+a page is parsed, a dataframe is built or a progress bar is shown.
+"""
+
+from importlib import import_module
+from typing import List
+
+_LAZY_ATTRIBUTES = {
+    "reparse_archive": "yfs.archive",
+    "ResponseArchive": "yfs.archive",
+    "AssetTypes": "yfs.asset_types",
+    "get_symbol_bundle": "yfs.bundle",
+    "PageType": "yfs.bundle",
+    "YFSClient": "yfs.client",
+    "ExchangeTypes": "yfs.exchanges",
+    "get_fundamentals": "yfs.fundamentals",
+    "get_multiple_fundamentals": "yfs.fundamentals",
+    "get_price_history": "yfs.history",
+    "get_multiple_price_histories": "yfs.history",
+    "HistoryStore": "yfs.history",
+    "fuzzy_search": "yfs.lookup",
+    "get_options_page": "yfs.options",
+    "get_quotes": "yfs.quotes",
+    "SnapshotStore": "yfs.snapshot_store",
+    "get_statistics_page": "yfs.statistics",
+    "get_multiple_statistics_pages": "yfs.statistics",
+    "get_summary_page": "yfs.summary",
+    "get_multiple_summary_pages": "yfs.summary",
+}
 
 __all__ = [
     "AssetTypes",
+    "PageType",
     "ExchangeTypes",
     "fuzzy_search",
+    "get_fundamentals",
+    "get_multiple_fundamentals",
+    "get_price_history",
+    "get_multiple_price_histories",
+    "HistoryStore",
     "get_options_page",
+    "get_quotes",
+    "get_symbol_bundle",
     "get_statistics_page",
     "get_multiple_statistics_pages",
     "get_summary_page",
     "get_multiple_summary_pages",
+    "reparse_archive",
+    "ResponseArchive",
+    "SnapshotStore",
+    "YFSClient",
 ]
 __version__ = "0.3.2"
+
+
+def __getattr__(name: str) -> object:
+    """Import public attributes on first access."""
+    module_name = _LAZY_ATTRIBUTES.get(name)
+
+    if module_name is None:
+        raise AttributeError(f"module 'yfs' has no attribute {name!r}")
+
+    value = getattr(import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    """Include the lazily imported attributes."""
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
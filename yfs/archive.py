@@ -0,0 +1,463 @@
+"""Archive raw page responses and parse them again later.
+
+Only the parsed pages are kept by the getters, so when a yahoo finance layout change
+breaks a parser the data of the affected days is lost. A ResponseArchive attached to
+a session stores the body of every summary, statistics and options page it downloads.
+Each body is compressed on its own, with zstd when the zstandard package is installed
+and gzip otherwise, and appended to a segment file. An index file maps (symbol, page
+type, fetched at) to the segment, offset and length of the body. The module level
+getters archive pages when passed an attached session, for example
+`session=archive.attach(PooledSession())`.
+
+Once the parser is fixed reparse_archive runs it over a range of the archive using a
+process per core.
+
+```python
+archive = ResponseArchive("~/.yfs/archive")
+
+with YFSClient(archive=archive) as client:
+    pages = client.get_multiple_statistics_pages(watchlist)
+
+results = reparse_archive(
+    "~/.yfs/archive", page_type=PageType.STATISTICS, start=pendulum.now().subtract(weeks=4)
+)
+```
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+import gzip
+from itertools import repeat
+import json
+import os
+from pathlib import Path
+import threading
+import time
+from typing import BinaryIO, Iterable, List, Optional, Tuple, TYPE_CHECKING, Union
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from decouple import config
+from more_itertools import chunked
+from pydantic import BaseModel as Base
+
+from .bundle import PageType
+from .document import parse_html
+from .options import ContractExpiration, OptionsChain, parse_options_chain
+from .options import parse_selected_expiration
+from .statistics import parse_statistics_page, StatisticsPage
+from .summary import parse_summary_page, SummaryPage
+
+if TYPE_CHECKING:
+    from requests import Response, Session
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+ARCHIVE_SEGMENT_SIZE = config("YFS_ARCHIVE_SEGMENT_SIZE", default=64 * 1024 * 1024, cast=int)
+"""* Bytes written to a segment file before the next one is started."""
+
+INDEX_FILE_NAME = "index.jsonl"
+"""* Name of the index file in an archive directory."""
+
+CODEC_SUFFIXES = {"zstd": ".zst", "gzip": ".gz"}
+"""* Segment file suffix of every codec."""
+
+_PAGE_PATHS = {
+    "": PageType.SUMMARY,
+    "key-statistics": PageType.STATISTICS,
+    "options": PageType.OPTIONS,
+}
+
+ParsedPage = Union[SummaryPage, StatisticsPage, OptionsChain]
+ReparseResult = Tuple["ArchiveEntry", Optional[ParsedPage], Optional[str]]
+
+
+class ArchiveEntry(Base):
+    """Location of one archived response body.
+
+    Attributes:
+        symbol (str): Ticker symbol as requested.
+        page_type (PageType): Page the body was downloaded from.
+        fetched_at (float): Unix timestamp of the download.
+        url (str): Url the body was downloaded from.
+        segment (str): Name of the segment file holding the body.
+        offset (int): Position of the compressed body in the segment file.
+        length (int): Size of the compressed body.
+
+    Notes:
+        This class inherits from the pydantic BaseModel which allows for the use
+        of .json() and .dict() for serialization to json strings and dictionaries.
+
+        .json(): Serialize to a JSON object.
+        .dict(): Serialize to a dictionary.
+    """
+
+    symbol: str
+    page_type: PageType
+    fetched_at: float
+    url: str
+    segment: str
+    offset: int
+    length: int
+
+    @property
+    def codec(self) -> str:
+        """Codec of the segment holding the body."""
+        return "zstd" if self.segment.endswith(CODEC_SUFFIXES["zstd"]) else "gzip"
+
+
+def default_codec() -> str:
+    """Return zstd when the zstandard package is installed, else gzip."""
+    return "gzip" if zstandard is None else "zstd"
+
+
+def compress(content: bytes, codec: str) -> bytes:
+    """Compress a response body as a single gzip member or zstd frame."""
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=9).compress(content)
+
+    return gzip.compress(content, compresslevel=6)
+
+
+def decompress(data: bytes, codec: str) -> bytes:
+    """Decompress a body compressed by compress."""
+    if codec == "zstd":
+        if zstandard is None:
+            raise ImportError("zstandard is required to read zstd segments: pip install zstandard")
+
+        return zstandard.ZstdDecompressor().decompress(data)
+
+    return gzip.decompress(data)
+
+
+def classify_url(url: str) -> Optional[Tuple[str, PageType]]:
+    """Return the symbol and page type of a page url. None when it is not a page url.
+
+    Example:
+        https://finance.yahoo.com/quote/AAPL/key-statistics?p=AAPL returns
+        ("AAPL", PageType.STATISTICS).
+    """
+    parts = urlsplit(url).path.strip("/").split("/")
+
+    if len(parts) not in (2, 3) or parts[0] != "quote" or not parts[1]:
+        return None
+
+    page_type = _PAGE_PATHS.get(parts[2] if len(parts) == 3 else "")
+
+    if page_type is None:
+        return None
+
+    return unquote(parts[1]), page_type
+
+
+def _as_timestamp(value: Optional[Union[datetime, float]]) -> Optional[float]:
+    if isinstance(value, datetime):
+        return value.timestamp()
+
+    return value
+
+
+class ResponseArchive:
+    """Append only store of compressed page bodies with a (symbol, page type, time) index.
+
+    Every archive instance starts a new segment file, so segments written by an
+    earlier process are never modified. Only one process should write to a
+    directory at a time. The instance is thread safe.
+
+    Attributes:
+        directory (Path): Directory holding the segment files and the index.
+        codec (str): zstd or gzip.
+        segment_size (int): Bytes written to a segment before the next one is started.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        codec: Optional[str] = None,
+        segment_size: int = ARCHIVE_SEGMENT_SIZE,
+    ) -> None:
+        """Open or create an archive directory. No files are written until a body is."""
+        codec = default_codec() if codec is None else codec
+
+        if codec not in CODEC_SUFFIXES:
+            raise ValueError(f"codec must be one of {', '.join(CODEC_SUFFIXES)}.")
+
+        if codec == "zstd" and zstandard is None:
+            raise ImportError("zstandard is required for zstd archives: pip install zstandard")
+
+        self.directory = Path(directory).expanduser()
+        self.codec = codec
+        self.segment_size = segment_size
+        self._entries: Optional[List[ArchiveEntry]] = None
+        self._segment: Optional[BinaryIO] = None
+        self._segment_name = ""
+        self._index: Optional[BinaryIO] = None
+        self._lock = threading.Lock()
+
+    @property
+    def index_path(self) -> Path:
+        """Path of the index file."""
+        return self.directory / INDEX_FILE_NAME
+
+    def _load_entries(self) -> List[ArchiveEntry]:
+        """Read the index the first time it is needed. Call with the lock held."""
+        if self._entries is not None:
+            return self._entries
+
+        self._entries = []
+
+        if not self.index_path.exists():
+            return self._entries
+
+        with open(self.index_path, "rb") as index:
+            for line in index:
+                try:
+                    data = json.loads(line)
+                except ValueError:
+                    # The last line is incomplete if a writer was killed mid write.
+                    continue
+
+                data["page_type"] = PageType(data["page_type"])
+                self._entries.append(ArchiveEntry.construct(**data))
+
+        return self._entries
+
+    def _next_segment(self) -> None:
+        """Close the current segment and open a new one. Call with the lock held."""
+        if self._segment is not None:
+            self._segment.close()
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        suffix = CODEC_SUFFIXES[self.codec]
+        numbers = [int(path.name[8:14]) for path in self.directory.glob("segment-??????.*")]
+        self._segment_name = f"segment-{max(numbers, default=0) + 1:06d}{suffix}"
+        self._segment = open(self.directory / self._segment_name, "ab")  # noqa: SIM115
+
+        if self._index is None:
+            self._index = open(self.index_path, "ab")  # noqa: SIM115
+
+    def write(
+        self,
+        symbol: str,
+        page_type: PageType,
+        url: str,
+        content: bytes,
+        fetched_at: Optional[float] = None,
+    ) -> ArchiveEntry:
+        """Compress and append a response body, then add it to the index.
+
+        Args:
+            symbol (str): Ticker symbol.
+            page_type (PageType): Page the body was downloaded from.
+            url (str): Url the body was downloaded from.
+            content (bytes): Response body.
+            fetched_at (float): Unix timestamp of the download. Defaults to now.
+
+        Returns:
+            ArchiveEntry: Location of the archived body.
+        """
+        data = compress(content, self.codec)
+        fetched_at = time.time() if fetched_at is None else fetched_at
+
+        with self._lock:
+            entries = self._load_entries()
+
+            if self._segment is None or self._segment.tell() >= self.segment_size:
+                self._next_segment()
+
+            entry = ArchiveEntry.construct(
+                symbol=symbol,
+                page_type=PageType(page_type),
+                fetched_at=fetched_at,
+                url=url,
+                segment=self._segment_name,
+                offset=self._segment.tell(),
+                length=len(data),
+            )
+            self._segment.write(data)
+            self._segment.flush()
+            # The index line is written after the body so it never points past a segment.
+            self._index.write(entry.json().encode() + b"\n")
+            self._index.flush()
+            entries.append(entry)
+
+        return entry
+
+    def record_response(self, response: "Response", **kwargs) -> None:  # noqa: ANN003
+        """Archive a successful page response. Used as a requests response hook."""
+        # pylint: disable=unused-argument
+        if not response.ok:
+            return
+
+        classified = classify_url(response.url)
+
+        if classified is not None:
+            symbol, page_type = classified
+            self.write(symbol, page_type, response.url, response.content)
+
+    def attach(self, session: "Session") -> "Session":
+        """Archive every page downloaded with session from now on.
+
+        Returns:
+            Session: The session, so it can be created and attached in one line.
+        """
+        hooks = session.hooks["response"]
+
+        if self.record_response not in hooks:
+            hooks.append(self.record_response)
+
+        return session
+
+    def entries(
+        self,
+        symbols: Optional[Iterable[str]] = None,
+        page_type: Optional[PageType] = None,
+        start: Optional[Union[datetime, float]] = None,
+        end: Optional[Union[datetime, float]] = None,
+    ) -> List[ArchiveEntry]:
+        """Return the index entries matching every given filter, oldest first.
+
+        Args:
+            symbols (Iterable[str]): Only these symbols. Case is ignored.
+            page_type (PageType): Only this page type.
+            start (datetime): Only bodies fetched at or after start. Also a unix timestamp.
+            end (datetime): Only bodies fetched before end. Also a unix timestamp.
+        """
+        wanted = None if symbols is None else {symbol.upper() for symbol in symbols}
+        start, end = _as_timestamp(start), _as_timestamp(end)
+
+        with self._lock:
+            entries = list(self._load_entries())
+
+        if wanted is not None:
+            entries = [entry for entry in entries if entry.symbol.upper() in wanted]
+
+        if page_type is not None:
+            entries = [entry for entry in entries if entry.page_type == page_type]
+
+        if start is not None:
+            entries = [entry for entry in entries if entry.fetched_at >= start]
+
+        if end is not None:
+            entries = [entry for entry in entries if entry.fetched_at < end]
+
+        entries.sort(key=lambda entry: entry.fetched_at)
+        return entries
+
+    def read(self, entry: ArchiveEntry) -> bytes:
+        """Return the decompressed body of an entry."""
+        with open(self.directory / entry.segment, "rb") as segment:
+            segment.seek(entry.offset)
+            return decompress(segment.read(entry.length), entry.codec)
+
+    def close(self) -> None:
+        """Close the open segment and index files."""
+        with self._lock:
+            for file in (self._segment, self._index):
+                if file is not None:
+                    file.close()
+
+            self._segment = self._index = None
+
+    def __len__(self) -> int:
+        """Return the number of archived bodies."""
+        with self._lock:
+            return len(self._load_entries())
+
+    def __enter__(self) -> "ResponseArchive":
+        """Use the archive as a context manager which closes it on exit."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close the archive."""
+        self.close()
+
+
+def parse_archived_page(entry: ArchiveEntry, content: bytes) -> Optional[ParsedPage]:
+    """Run the parser of an entry's page type over its archived body.
+
+    Returns:
+        SummaryPage, StatisticsPage or OptionsChain: When data is found.
+        None: The page has no data or the options expiration is not found.
+    """
+    html = parse_html(
+        content.decode("utf-8", errors="replace"), entry.url, page=entry.page_type.value
+    )
+
+    if entry.page_type == PageType.SUMMARY:
+        return parse_summary_page(entry.symbol, html)
+
+    if entry.page_type == PageType.STATISTICS:
+        return parse_statistics_page(entry.symbol, html)
+
+    timestamp = parse_qs(urlsplit(entry.url).query).get("date", [None])[0]
+    timestamp = timestamp or parse_selected_expiration(html)
+
+    if timestamp is None:
+        return None
+
+    return parse_options_chain(ContractExpiration(symbol=entry.symbol, timestamp=timestamp), html)
+
+
+def _reparse_chunk(directory: Path, entries: List[ArchiveEntry]) -> List[ReparseResult]:
+    """Parse a chunk of entries in a worker process.
+
+    An entry which fails to be read or parsed is returned with the error message, so
+    the other entries are still parsed.
+    """
+    archive = ResponseArchive(directory)
+    results = []
+
+    for entry in entries:
+        try:
+            results.append((entry, parse_archived_page(entry, archive.read(entry)), None))
+        except Exception as error:  # pylint: disable=broad-except
+            results.append((entry, None, f"{error.__class__.__name__}: {error}"))
+
+    return results
+
+
+def reparse_archive(  # pylint: disable=too-many-arguments
+    directory: Union[str, Path],
+    symbols: Optional[Iterable[str]] = None,
+    page_type: Optional[PageType] = None,
+    start: Optional[Union[datetime, float]] = None,
+    end: Optional[Union[datetime, float]] = None,
+    max_workers: Optional[int] = None,
+    chunk_size: int = 64,
+) -> List[ReparseResult]:
+    """Parse the archived bodies of a range of the archive using a process per core.
+
+    Bodies are parsed with the current summary, statistics and options parsers, so
+    data can be extracted again after a parser is fixed.
+
+    Args:
+        directory (Union[str, Path]): Archive directory.
+        symbols (Iterable[str]): Only these symbols. Case is ignored.
+        page_type (PageType): Only this page type.
+        start (datetime): Only bodies fetched at or after start. Also a unix timestamp.
+        end (datetime): Only bodies fetched before end. Also a unix timestamp.
+        max_workers (int): Number of processes. Defaults to the number of cores.
+            1 parses in the calling process.
+        chunk_size (int): Bodies parsed per task sent to a process.
+
+    Returns:
+        List[Tuple[ArchiveEntry, Optional[ParsedPage], Optional[str]]]: Every matching
+            entry with its parsed page and error, oldest first. The page is None when
+            no data is found or the body failed to be read or parsed. The error is the
+            message of the exception raised by the failed body, otherwise None.
+    """
+    directory = Path(directory).expanduser()
+    entries = ResponseArchive(directory).entries(symbols, page_type, start, end)
+    chunks = list(chunked(entries, chunk_size))
+    max_workers = max_workers or os.cpu_count() or 1
+
+    if max_workers == 1 or len(chunks) <= 1:
+        results = map(_reparse_chunk, repeat(directory), chunks)
+        return [result for chunk in results for result in chunk]
+
+    with ProcessPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+        results = executor.map(_reparse_chunk, repeat(directory), chunks)
+        return [result for chunk in results for result in chunk]
@@ -0,0 +1,159 @@
+"""Contains the classes and functions for fetching several yahoo finance pages for one symbol."""
+
+from concurrent.futures import Executor
+from enum import Enum
+from typing import Dict, Iterable, Optional, TYPE_CHECKING
+
+from pydantic import BaseModel as Base
+
+from .document import parse_html
+from .lookup import fuzzy_search
+from .multidownloader import _worker_pool
+from .options import get_options_page, MultipleOptionChains
+from .quote import parse_quote_header_info, Quote
+from .requestor import requestor
+from .statistics import parse_statistics_page, statistics_page_url, StatisticsPage
+from .summary import parse_summary_page, summary_page_url, SummaryPage
+
+if TYPE_CHECKING:
+    from requests_html import HTML
+
+
+class PageType(str, Enum):
+    """Enum for the yahoo finance pages which can be fetched in a bundle."""
+
+    SUMMARY = "summary"
+    STATISTICS = "statistics"
+    OPTIONS = "options"
+
+
+class SymbolBundle(Base):
+    """Combined page data for a single symbol.
+
+    Attributes:
+        symbol (str): Ticker symbol.
+        quote (Quote): Quote header data. Parsed once and shared by the summary and
+            statistics pages.
+        summary (SummaryPage): Summary page data if requested and found.
+        statistics (StatisticsPage): Statistics page data if requested and found.
+        options (MultipleOptionChains): Option chains if requested and found.
+
+    Notes:
+        This class inherits from the pydantic BaseModel which allows for the use
+        of .json() and .dict() for serialization to json strings and dictionaries.
+
+        .json(): Serialize to a JSON object.
+        .dict(): Serialize to a dictionary.
+    """
+
+    symbol: str
+    quote: Optional[Quote]
+    summary: Optional[SummaryPage]
+    statistics: Optional[StatisticsPage]
+    options: Optional[MultipleOptionChains]
+
+
+def _fetch_html(url: str, page: str, **kwargs) -> Optional["HTML"]:  # noqa: ANN003
+    """Request a page and wrap the response in an HTML object."""
+    response = requestor(url, **kwargs)
+
+    if response.ok:
+        return parse_html(response.text, url, page=page)
+
+    return None
+
+
+def get_symbol_bundle(
+    symbol: str,
+    pages: Iterable[PageType] = (PageType.SUMMARY, PageType.STATISTICS, PageType.OPTIONS),
+    use_fuzzy_search: bool = True,
+    page_not_found_ok: bool = False,
+    executor: Optional[Executor] = None,
+    **kwargs,  # noqa: ANN003
+) -> Optional[SymbolBundle]:
+    """Get summary, statistics and options page data for one symbol.
+
+    The symbol lookup runs once, the requested pages are downloaded concurrently
+    and the quote header is parsed from the first downloaded page only.
+
+    Args:
+        symbol (str): Ticker symbol or company name.
+        pages (Iterable[PageType]): Pages to fetch. Default is all pages.
+        use_fuzzy_search (bool): If True does a symbol lookup validation prior
+            to requesting page data.
+        page_not_found_ok (bool): If True, requested pages which are not found are
+            left as None. If no page is found None is returned.
+        executor (Executor): Thread pool reused to download the pages instead of
+            creating one for this call. It is not shut down.
+        **kwargs: Pass (session, proxies, and timeout) to the requestor function.
+
+    Returns:
+        SymbolBundle: When data is found.
+        None: No data is found and page_not_found_ok is True.
+
+    Raises:
+        AttributeError: When a requested page is not found and the page_not_found_ok
+            arg is false.
+    """
+    pages = [PageType(page) for page in pages]
+
+    if use_fuzzy_search:
+        fuzzy_response = fuzzy_search(symbol, first_ticker=True, **kwargs)
+
+        if fuzzy_response:
+            symbol = fuzzy_response.symbol
+
+    urls = {
+        PageType.SUMMARY: summary_page_url(symbol),
+        PageType.STATISTICS: statistics_page_url(symbol),
+    }
+
+    with _worker_pool(executor, max(len(pages), 1)) as pool:
+        futures = {}
+
+        for page in pages:
+            if page is PageType.OPTIONS:
+                futures[page] = pool.submit(
+                    get_options_page,
+                    symbol,
+                    use_fuzzy_search=False,
+                    page_not_found_ok=True,
+                    **kwargs,
+                )
+            else:
+                futures[page] = pool.submit(_fetch_html, urls[page], page.value, **kwargs)
+
+        results: Dict[PageType, object] = {
+            page: future.result() for page, future in futures.items()
+        }
+
+    quote = None
+
+    for page in (PageType.SUMMARY, PageType.STATISTICS):
+        if results.get(page) is not None:
+            quote = parse_quote_header_info(results[page])
+            break
+
+    bundle = SymbolBundle(symbol=symbol, quote=quote)
+
+    if results.get(PageType.SUMMARY) is not None:
+        bundle.summary = parse_summary_page(symbol, results[PageType.SUMMARY], quote=quote)
+
+    if results.get(PageType.STATISTICS) is not None:
+        bundle.statistics = parse_statistics_page(
+            symbol, results[PageType.STATISTICS], quote=quote
+        )
+
+    bundle.options = results.get(PageType.OPTIONS)
+
+    missing = [page.value for page in pages if getattr(bundle, page.value) is None]
+
+    if not missing:
+        return bundle
+
+    if page_not_found_ok:
+        if len(missing) < len(pages):
+            return bundle
+        return None
+
+    raise AttributeError(f"{symbol} {', '.join(missing)} page not found.")
@@ -1,12 +1,17 @@
 """A module for cleaning tables, fields and values."""
 
 from functools import partial
-from typing import Dict, Optional, Union
+from typing import Dict, Optional, TYPE_CHECKING, Union
 
 import pendulum
 from pendulum import DateTime
 from pydantic import validator
-from requests_html import HTML
+
+from .document import element_text, select
+from .profiling import profiled
+
+if TYPE_CHECKING:
+    from requests_html import HTML
 
 
 numbers_with_suffix = {
@@ -59,17 +64,18 @@ def field_cleaner(field: str) -> str:
     )
 
 
-def table_cleaner(html_table: HTML) -> Optional[Dict]:
+@profiled
+def table_cleaner(html_table: "HTML") -> Optional[Dict]:
     """Clean table with two fields.
 
     Args:
-        html_table (HTML): HTML object parsed from a table section.
+        html_table (HTML): "HTML" object, Element or lxml element of a table section.
 
     Returns:
         dict: cleaned fields (keys) and string (values).
         None: if html_table does not contain table elements.
     """
-    rows = [row.text.split("\n") for row in html_table.find("tr")]
+    rows = [element_text(row).split("\n") for row in select(html_table, "tr")]
     rows = list(filter(lambda row: len(row) == 2, rows))
 
     data = {}
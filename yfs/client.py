@@ -0,0 +1,327 @@
+"""A long lived client owning the sessions, thread pool, caches and metrics of yfs.
+
+The module level getters create a connection and, for multiple pages, a thread pool
+per call. A YFSClient creates them once and reuses them for every call, so a service
+making thousands of calls keeps its connections warm and its workers running. One
+client can be shared by many threads.
+
+```python
+metrics = PrometheusCollector()
+
+with YFSClient(thread_count=10, requests_per_second=5, metrics=metrics) as client:
+    summary = client.get_summary_page("aapl")
+    pages = client.get_multiple_summary_pages(["aapl", "tsla", "msft"])
+
+print(metrics.render())
+```
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+import threading
+from typing import Any, Callable, ContextManager, Dict, List, Optional, TYPE_CHECKING, Union
+
+from .metrics import Callback, collect
+from .negative_cache import NegativeCache
+from .options import EXPIRATION_CACHE_TTL, ExpirationCache
+from .page_cache import PageCache
+from .requestor import PooledSession, RateLimiter
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+    from .archive import ResponseArchive
+    from .bundle import SymbolBundle
+    from .fundamentals import Fundamentals, FundamentalsGroup
+    from .history import PriceHistory, PriceHistoryGroup
+    from .lookup import ValidSymbol, ValidSymbolList
+    from .options import ContractExpirationList, MultipleOptionChains, OptionsChain
+    from .quote import Quote
+    from .quotes import QuoteGroup
+    from .statistics import StatisticsPage, StatisticsPageGroup
+    from .summary import SummaryPage, SummaryPageGroup
+
+
+def _collecting(callback: Optional[Callback]) -> ContextManager:
+    """Collect the timings of the current thread into callback. Nothing when None."""
+    return nullcontext() if callback is None else collect(callback)
+
+
+class _CollectingExecutor(ThreadPoolExecutor):
+    """Thread pool sending the timings of every task to a metrics callback."""
+
+    def __init__(self, callback: Optional[Callback], max_workers: int) -> None:
+        super().__init__(max_workers=max_workers, thread_name_prefix="yfs")
+        self.callback = callback
+
+    def submit(self, fn: Callable, /, *args, **kwargs) -> "Future":  # noqa: ANN002, ANN003
+        """Schedule fn, collecting its timings while it runs."""
+        return super().submit(self._collect, fn, *args, **kwargs)
+
+    def _collect(self, fn: Callable, *args, **kwargs) -> Any:  # noqa: ANN002, ANN003, ANN401
+        with _collecting(self.callback):
+            return fn(*args, **kwargs)
+
+
+class YFSClient:  # pylint: disable=too-many-instance-attributes
+    """Shares one session, thread pool, expiration cache and metrics across calls.
+
+    Every getter accepts the same arguments as the module level function it wraps.
+    session, proxies and timeout default to the client's, and the multiple page
+    getters use threads and the client's thread pool unless told otherwise.
+
+    Attributes:
+        thread_count (int): Number of worker threads.
+        timeout (float): Seconds to wait for the server to send a response.
+        proxies (Dict[str, str]): Dictionary mapping protocol to the URL of the proxy.
+        session (Session): Session shared by every request.
+        rate_limiter (RateLimiter): Limits requests per second. None for no limit.
+        expiration_cache (ExpirationCache): Option expirations of this client.
+        negative_cache (NegativeCache): Search terms and symbols which were not found.
+            None to not use a negative cache.
+        page_cache (PageCache): Parsed pages reused while their content is unchanged.
+            None to always parse.
+        archive (ResponseArchive): Archive of every page body downloaded by the client.
+        metrics (Callback): Receives the timings of every call made by the client.
+            None when timings are not collected.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        thread_count: int = 5,
+        timeout: float = 5,
+        proxies: Optional[Dict[str, str]] = None,
+        requests_per_second: Optional[float] = None,
+        burst: int = 1,
+        expiration_cache_ttl: float = EXPIRATION_CACHE_TTL,
+        metrics: Optional[Callback] = None,
+        session: Optional[PooledSession] = None,
+        negative_cache: Optional[NegativeCache] = None,
+        page_cache: Optional[PageCache] = None,
+        archive: Optional["ResponseArchive"] = None,
+    ) -> None:
+        """Create a client. The thread pool is started on first use.
+
+        Args:
+            thread_count (int): Number of worker threads and pooled connections.
+            timeout (float): Seconds to wait for the server to send a response.
+            proxies (dict): Dictionary mapping protocol to the URL of the proxy.
+            requests_per_second (float): Limit shared by every thread. None for no limit.
+            burst (int): Requests which can be sent at once after being idle.
+            expiration_cache_ttl (float): Seconds option expirations are reused.
+            metrics (Callback): Receives (stage, seconds, labels) of every timed stage.
+                None to not collect timings. A PrometheusCollector aggregates the
+                timings of a long lived client in constant memory.
+            session (PooledSession): Session to use instead of creating one. Its rate
+                limiter is kept when requests_per_second is None.
+            negative_cache (NegativeCache): Skip search terms and symbols which were
+                not found recently. None to always send the request.
+            page_cache (PageCache): Reuse parsed summary, statistics and options pages
+                while their content is unchanged. None to always parse.
+            archive (ResponseArchive): Archive the body of every summary, statistics
+                and options page downloaded with the client's session.
+        """
+        self.thread_count = thread_count
+        self.timeout = timeout
+        self.proxies = proxies
+        self.rate_limiter = (
+            RateLimiter(requests_per_second, burst) if requests_per_second else None
+        )
+
+        if session is None:
+            session = PooledSession(pool_size=thread_count, rate_limiter=self.rate_limiter)
+        elif self.rate_limiter is not None:
+            session.rate_limiter = self.rate_limiter
+
+        self.session = session
+        self.expiration_cache = ExpirationCache(ttl=expiration_cache_ttl)
+        self.metrics = metrics
+        self.negative_cache = negative_cache
+        self.page_cache = page_cache
+        self.archive = archive
+
+        if archive is not None:
+            archive.attach(session)
+
+        self._executor: Optional[_CollectingExecutor] = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """The client's thread pool, started on first access."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("The client is closed.")
+
+            if self._executor is None:
+                self._executor = _CollectingExecutor(self.metrics, self.thread_count)
+
+            return self._executor
+
+    def _call(self, function: Callable, *args, **kwargs) -> Any:  # noqa: ANN002, ANN003, ANN401
+        """Call function with the client's requestor kwargs, collecting its timings."""
+        kwargs = {
+            "session": self.session,
+            "proxies": self.proxies,
+            "timeout": self.timeout,
+            **kwargs,
+        }
+
+        with _collecting(self.metrics):
+            return function(*args, **kwargs)
+
+    def _use_negative_cache(self, kwargs: Dict[str, Any]) -> None:
+        """Use the client's negative cache unless kwargs say otherwise."""
+        if self.negative_cache is not None:
+            kwargs.setdefault("use_negative_cache", True)
+            kwargs.setdefault("negative_cache", self.negative_cache)
+
+    def fuzzy_search(
+        self, quote_lookup: str, **kwargs  # noqa: ANN003
+    ) -> Optional[Union["ValidSymbol", "ValidSymbolList"]]:
+        """Lookup and validate symbols or company names. See yfs.lookup.fuzzy_search."""
+        from .lookup import fuzzy_search  # pylint: disable=import-outside-toplevel
+
+        self._use_negative_cache(kwargs)
+        return self._call(fuzzy_search, quote_lookup, **kwargs)
+
+    def get_quote(self, symbol: str, **kwargs) -> Optional["Quote"]:  # noqa: ANN003
+        """Get the quote header of a symbol. See yfs.poller.get_quote."""
+        from .poller import get_quote  # pylint: disable=import-outside-toplevel
+
+        return self._call(get_quote, symbol, **kwargs)
+
+    def get_quotes(self, symbols: List[str], **kwargs) -> Optional["QuoteGroup"]:  # noqa: ANN003
+        """Get the quotes of many symbols from the quote api. See yfs.quotes.get_quotes."""
+        from .quotes import get_quotes  # pylint: disable=import-outside-toplevel
+
+        kwargs.setdefault("thread_count", self.thread_count)
+        kwargs.setdefault("executor", self.executor)
+        return self._call(get_quotes, symbols, **kwargs)
+
+    def get_fundamentals(self, symbol: str, **kwargs) -> Optional["Fundamentals"]:  # noqa: ANN003
+        """Get summary and statistics data from one api request. See yfs.fundamentals."""
+        from .fundamentals import get_fundamentals  # pylint: disable=import-outside-toplevel
+
+        return self._call(get_fundamentals, symbol, **kwargs)
+
+    def get_price_history(self, symbol: str, **kwargs) -> Optional["PriceHistory"]:  # noqa: ANN003
+        """Get the price history of a symbol. See yfs.history.get_price_history."""
+        from .history import get_price_history  # pylint: disable=import-outside-toplevel
+
+        return self._call(get_price_history, symbol, **kwargs)
+
+    def get_summary_page(self, symbol: str, **kwargs) -> Optional["SummaryPage"]:  # noqa: ANN003
+        """Get summary page data. See yfs.summary.get_summary_page."""
+        from .summary import get_summary_page  # pylint: disable=import-outside-toplevel
+
+        kwargs.setdefault("page_cache", self.page_cache)
+        return self._call(get_summary_page, symbol, **kwargs)
+
+    def get_statistics_page(
+        self, symbol: str, **kwargs  # noqa: ANN003
+    ) -> Optional["StatisticsPage"]:
+        """Get statistics page data. See yfs.statistics.get_statistics_page."""
+        from .statistics import get_statistics_page  # pylint: disable=import-outside-toplevel
+
+        kwargs.setdefault("page_cache", self.page_cache)
+        return self._call(get_statistics_page, symbol, **kwargs)
+
+    def get_option_expirations(
+        self, symbol: str, **kwargs  # noqa: ANN003
+    ) -> Optional["ContractExpirationList"]:
+        """Get option expirations using the client's cache. See yfs.options."""
+        from .options import get_option_expirations  # pylint: disable=import-outside-toplevel
+
+        kwargs.setdefault("cache", self.expiration_cache)
+        return self._call(get_option_expirations, symbol, **kwargs)
+
+    def get_options_page(
+        self, symbol: str, **kwargs  # noqa: ANN003
+    ) -> Optional[Union["OptionsChain", "MultipleOptionChains"]]:
+        """Get options data using the client's cache. See yfs.options.get_options_page."""
+        from .options import get_options_page  # pylint: disable=import-outside-toplevel
+
+        kwargs.setdefault("cache", self.expiration_cache)
+        kwargs.setdefault("page_cache", self.page_cache)
+        return self._call(get_options_page, symbol, **kwargs)
+
+    def get_symbol_bundle(self, symbol: str, **kwargs) -> Optional["SymbolBundle"]:  # noqa: ANN003
+        """Get several pages of one symbol on the client's threads. See yfs.bundle."""
+        from .bundle import get_symbol_bundle  # pylint: disable=import-outside-toplevel
+
+        kwargs.setdefault("executor", self.executor)
+        return self._call(get_symbol_bundle, symbol, **kwargs)
+
+    def _get_multiple(
+        self, function: Callable, symbols: List[str], **kwargs  # noqa: ANN003
+    ) -> Any:  # noqa: ANN401
+        kwargs.setdefault("with_threads", True)
+        kwargs.setdefault("thread_count", self.thread_count)
+        kwargs.setdefault("progress_bar", False)
+        self._use_negative_cache(kwargs)
+
+        if kwargs["with_threads"]:
+            kwargs.setdefault("executor", self.executor)
+
+        return self._call(function, symbols, **kwargs)
+
+    def get_multiple_summary_pages(
+        self, symbols: List[str], **kwargs  # noqa: ANN003
+    ) -> Optional["SummaryPageGroup"]:
+        """Get multiple summary pages on the client's threads. See yfs.summary."""
+        from .summary import get_multiple_summary_pages  # pylint: disable=C0415
+
+        kwargs.setdefault("page_cache", self.page_cache)
+        return self._get_multiple(get_multiple_summary_pages, symbols, **kwargs)
+
+    def get_multiple_statistics_pages(
+        self, symbols: List[str], **kwargs  # noqa: ANN003
+    ) -> Optional["StatisticsPageGroup"]:
+        """Get multiple statistics pages on the client's threads. See yfs.statistics."""
+        from .statistics import get_multiple_statistics_pages  # pylint: disable=C0415
+
+        kwargs.setdefault("page_cache", self.page_cache)
+        return self._get_multiple(get_multiple_statistics_pages, symbols, **kwargs)
+
+    def get_multiple_fundamentals(
+        self, symbols: List[str], **kwargs  # noqa: ANN003
+    ) -> Optional["FundamentalsGroup"]:
+        """Get multiple fundamentals on the client's threads. See yfs.fundamentals."""
+        from .fundamentals import get_multiple_fundamentals  # pylint: disable=C0415
+
+        return self._get_multiple(get_multiple_fundamentals, symbols, **kwargs)
+
+    def get_multiple_price_histories(
+        self, symbols: List[str], **kwargs  # noqa: ANN003
+    ) -> Optional["PriceHistoryGroup"]:
+        """Get multiple price histories on the client's threads. See yfs.history."""
+        from .history import get_multiple_price_histories  # pylint: disable=C0415
+
+        return self._get_multiple(get_multiple_price_histories, symbols, **kwargs)
+
+    def close(self) -> None:
+        """Wait for running tasks, then close the thread pool, caches, archive and session."""
+        with self._lock:
+            self._closed = True
+            executor, self._executor = self._executor, None
+
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+        if self.negative_cache is not None:
+            self.negative_cache.flush()
+
+        if self.archive is not None:
+            self.archive.close()
+
+        self.session.close()
+
+    def __enter__(self) -> "YFSClient":
+        """Use the client as a context manager which closes it on exit."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close the client."""
+        self.close()
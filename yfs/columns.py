@@ -0,0 +1,169 @@
+"""Column buffers for building dataframes from parsed page models."""
+
+from datetime import date, datetime
+from operator import attrgetter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Type, TYPE_CHECKING
+
+from pydantic import BaseModel as Base
+from pydantic.fields import ModelField
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+
+def field_dtype(field: ModelField) -> str:
+    """Map a pydantic field to the pandas dtype used for its column.
+
+    Example:
+        |Field type         |dtype              |
+        |-------------------|-------------------|
+        |Optional[float]    |float64            |
+        |Optional[int]      |Int64              |
+        |Optional[bool]     |boolean            |
+        |Optional[Date]     |datetime64[ns]     |
+        |Optional[DateTime] |datetime64[ns, UTC]|
+        |str                |object             |
+
+    Returns:
+        str: A pandas dtype string.
+    """
+    type_ = field.outer_type_
+
+    if isinstance(type_, type):
+        if issubclass(type_, bool):
+            return "boolean"
+        if issubclass(type_, int):
+            return "Int64"
+        if issubclass(type_, float):
+            return "float64"
+        if issubclass(type_, datetime):
+            return "datetime64[ns, UTC]"
+        if issubclass(type_, date):
+            return "datetime64[ns]"
+
+    return "object"
+
+
+def to_typed_array(values: List, dtype: str) -> Iterable:
+    """Convert a list of column values to an array with the dtype."""
+    import numpy as np  # pylint: disable=import-outside-toplevel
+    import pandas  # pylint: disable=import-outside-toplevel
+
+    if dtype == "float64":
+        return np.array(values, dtype="float64")
+
+    if dtype.startswith("datetime64"):
+        return pandas.to_datetime(values, utc=dtype.endswith("UTC]"))
+
+    if dtype == "object":
+        return values
+
+    return pandas.array(values, dtype=dtype)
+
+
+class Column:
+    """A single column buffer.
+
+    Attributes:
+        name (str): Column name.
+        dtype (str): pandas dtype of the column.
+        getter (Callable): Extracts the column value from an appended object.
+        values (list): Buffered column values.
+    """
+
+    __slots__ = ("name", "dtype", "getter", "values")
+
+    def __init__(self, name: str, dtype: str, getter: Callable) -> None:
+        """Create an empty column."""
+        self.name = name
+        self.dtype = dtype
+        self.getter = getter
+        self.values: List = []
+
+
+class ColumnBuffer:
+    """Collects model attributes column by column as objects are appended.
+
+    The buffered columns are turned into a typed dataframe in one step without
+    serializing each model to a dictionary first.
+    """
+
+    def __init__(self, columns: Iterable[Column], index: Optional[str] = None) -> None:
+        """Create a buffer.
+
+        Args:
+            columns (Iterable[Column]): Columns to collect.
+            index (str): Name of the column to use as the dataframe index.
+        """
+        self.columns: Dict[str, Column] = {column.name: column for column in columns}
+        self.index = index
+
+    @classmethod
+    def from_models(
+        cls,
+        models: Iterable[Tuple[Optional[str], Type[Base]]],
+        index: Optional[str] = None,
+        exclude: Iterable[str] = (),
+    ) -> "ColumnBuffer":
+        """Create a buffer with a column for every field of the models.
+
+        Args:
+            models: Pairs of (attribute path, model). The attribute path is the path to
+                the nested model on the appended object, or None for the object itself.
+                When models share a field name the first model wins.
+            index (str): Name of the column to use as the dataframe index.
+            exclude (Iterable[str]): Field names to skip.
+
+        Returns:
+            ColumnBuffer: An empty buffer.
+        """
+        exclude = set(exclude)
+        columns = {}
+
+        for path, model in models:
+            for name, field in model.__fields__.items():
+                if name in exclude or name in columns:
+                    continue
+
+                getter = attrgetter(f"{path}.{name}" if path else name)
+                columns[name] = Column(name, field_dtype(field), getter)
+
+        return cls(columns.values(), index=index)
+
+    def append(self, obj: object) -> None:
+        """Append the column values of one object."""
+        for column in self.columns.values():
+            column.values.append(column.getter(obj))
+
+    def extend(self, objects: Iterable) -> None:
+        """Append the column values of multiple objects."""
+        for obj in objects:
+            self.append(obj)
+
+    def clear(self) -> None:
+        """Remove all buffered values."""
+        for column in self.columns.values():
+            column.values = []
+
+    def to_dataframe(self) -> "DataFrame":
+        """Build a typed dataframe from the buffered columns sorted by the index."""
+        from pandas import DataFrame  # pylint: disable=import-outside-toplevel
+
+        data = {
+            name: to_typed_array(column.values, column.dtype)
+            for name, column in self.columns.items()
+        }
+
+        dataframe = DataFrame(data, copy=False)
+
+        if self.index:
+            dataframe.set_index(self.index, inplace=True)
+            dataframe.sort_index(inplace=True)
+
+        return dataframe
+
+    def __len__(self) -> int:
+        """Return the number of buffered rows."""
+        for column in self.columns.values():
+            return len(column.values)
+        return 0
@@ -0,0 +1,131 @@
+"""Build HTML documents from yahoo finance responses and query them.
+
+Selectors are compiled once per process with compile_selector and evaluated on the
+document tree built by parse_html. select memoizes results per document, so parsers
+sharing a page run every distinct query once.
+"""
+
+from functools import lru_cache
+from typing import List, Optional, TYPE_CHECKING, Union
+
+from .metrics import Stage, timer
+from .profiling import profiled
+
+if TYPE_CHECKING:
+    from lxml.etree import XPath
+    from lxml.html import HtmlElement
+    from requests_html import Element, HTML
+
+
+@profiled
+def parse_html(text: str, url: str = None, page: str = None) -> "HTML":
+    """Wrap page text in an HTML object with its document tree already built.
+
+    requests_html builds the document tree lazily on the first search. Building it here
+    keeps the HTML parse time in the html_parse stage instead of the first selector.
+
+    Args:
+        text (str): Response text.
+        url (str): Url the text was downloaded from.
+        page (str): Page name passed to the metrics callbacks. Example: summary.
+
+    Returns:
+        HTML: A parsed HTML object.
+    """
+    from requests_html import HTML  # pylint: disable=import-outside-toplevel
+
+    with timer(Stage.HTML_PARSE, page=page or "unknown"):
+        html = HTML(html=text, url=url)
+        html.pq  # pylint: disable=pointless-statement
+
+    return html
+
+
+Selection = List["HtmlElement"]
+Node = Union["HTML", "Element", "HtmlElement"]
+
+_SELECTIONS = "_selections"
+
+
+@lru_cache(maxsize=None)
+def compile_selector(selector: str) -> "XPath":
+    """Translate a CSS selector into a compiled XPath expression.
+
+    The translation is the one pyquery, and so HTML.find, uses. It runs once per
+    selector for the whole process and the compiled expression is shared by every page
+    parser.
+
+    Args:
+        selector (str): CSS selector. Example: div#quote-header-info.
+
+    Returns:
+        XPath: Compiled expression returning the matching elements of a root element and
+            its descendants in document order.
+    """
+    from lxml.etree import XPath  # pylint: disable=import-outside-toplevel
+    from pyquery.cssselectpatch import JQueryTranslator  # pylint: disable=import-outside-toplevel
+
+    return XPath(
+        JQueryTranslator(xhtml=False).css_to_xpath(selector, prefix="descendant-or-self::")
+    )
+
+
+def as_node(element: Node) -> "HtmlElement":
+    """Return the lxml element of an HTML document, a requests_html Element or lxml element.
+
+    Unlike Element.lxml this never parses the element's HTML again.
+    """
+    from requests_html import HTML  # pylint: disable=import-outside-toplevel
+
+    if isinstance(element, HTML):
+        return element.lxml
+
+    return getattr(element, "element", element)
+
+
+def select(html: Node, selector: str, within: Optional[Node] = None) -> Selection:
+    """Return the elements matching a CSS selector, evaluating each query once per document.
+
+    Results are memoized on the HTML object by (selector, root element), so parsers
+    sharing a document, or asking for the same selector twice, reuse the first result.
+
+    Args:
+        html (HTML): Parsed document. Element and lxml elements work too, but are not
+            memoized.
+        selector (str): CSS selector.
+        within (Element): Only search this element and its descendants. Defaults to the
+            whole document.
+
+    Returns:
+        List[HtmlElement]: Matching lxml elements in document order.
+    """
+    from requests_html import HTML  # pylint: disable=import-outside-toplevel
+
+    root = as_node(html if within is None else within)
+
+    if not isinstance(html, HTML):
+        return compile_selector(selector)(root)
+
+    selections = vars(html).setdefault(_SELECTIONS, {})
+
+    key = (selector, root)
+
+    if key not in selections:
+        selections[key] = compile_selector(selector)(root)
+
+    return selections[key]
+
+
+def select_first(
+    html: Node, selector: str, within: Optional[Node] = None
+) -> Optional["HtmlElement"]:
+    """Return the first element matching a CSS selector or None. See select."""
+    found = select(html, selector, within)
+    return found[0] if found else None
+
+
+def element_text(element: Node) -> str:
+    """Return the text of an element like Element.text without parsing it again."""
+    from pyquery.text import extract_text  # pylint: disable=import-outside-toplevel
+
+    return extract_text(as_node(element))
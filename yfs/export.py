@@ -0,0 +1,319 @@
+"""Export page groups and option chains to Apache Arrow tables and Parquet files.
+
+Arrow tables are built straight from the column buffers in yfs.columns without
+creating a pandas DataFrame first. pyarrow is an optional dependency and can be installed
+with `pip install yfs[parquet]`.
+"""
+
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Mapping, Optional, Set, Union
+
+from pydantic import BaseModel as Base
+
+from .columns import Column, ColumnBuffer
+from .options import MultipleOptionChains, option_contract_columns, OptionContract, OptionsChain
+from .records import OptionContractRecord, OptionsChainRecord, SummaryPageRecord
+from .statistics import (
+    statistics_page_columns,
+    StatisticsPage,
+    Valuation,
+    valuation_columns,
+    ValuationMeasuresTable,
+)
+from .summary import summary_page_columns, SummaryPage
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover
+    pa = pc = ds = pq = None
+
+
+COLUMN_FACTORIES = {
+    SummaryPage: summary_page_columns,
+    SummaryPageRecord: summary_page_columns,
+    StatisticsPage: statistics_page_columns,
+    OptionContract: option_contract_columns,
+    OptionContractRecord: option_contract_columns,
+    Valuation: valuation_columns,
+}
+"""* Maps the row objects which can be exported to their column buffer factory."""
+
+
+def require_pyarrow() -> None:
+    """Raise an ImportError when pyarrow is not installed."""
+    if pa is None:
+        raise ImportError(
+            "pyarrow is required for arrow and parquet export: pip install yfs[parquet]"
+        )
+
+
+def arrow_type(dtype: str) -> "pa.DataType":
+    """Map a yfs.columns dtype string to a stable arrow type.
+
+    Example:
+        |dtype              |Arrow type            |
+        |-------------------|----------------------|
+        |float64            |double                |
+        |Int64              |int64                 |
+        |boolean            |bool                  |
+        |datetime64[ns]     |date32                |
+        |datetime64[ns, UTC]|timestamp[us, tz=UTC] |
+        |object             |string                |
+    """
+    require_pyarrow()
+
+    types = {
+        "float64": pa.float64(),
+        "Int64": pa.int64(),
+        "boolean": pa.bool_(),
+        "datetime64[ns]": pa.date32(),
+        "datetime64[ns, UTC]": pa.timestamp("us", tz="UTC"),
+    }
+    return types.get(dtype, pa.string())
+
+
+def arrow_schema(columns: ColumnBuffer) -> "pa.Schema":
+    """Build the arrow schema for a column buffer."""
+    return pa.schema(
+        [pa.field(name, arrow_type(column.dtype)) for name, column in columns.columns.items()]
+    )
+
+
+def record_batch(columns: ColumnBuffer, schema: Optional["pa.Schema"] = None) -> "pa.RecordBatch":
+    """Convert the values of a column buffer to an arrow RecordBatch."""
+    schema = schema or arrow_schema(columns)
+    arrays = [pa.array(columns.columns[field.name].values, type=field.type) for field in schema]
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def _is_container(items: object) -> bool:
+    """Return True for iterables of rows. Strings, mappings and plain models are not."""
+    if isinstance(items, (str, bytes, Mapping)) or not isinstance(items, Iterable):
+        return False
+
+    # Iterating a pydantic model yields its (field, value) pairs unless it is a group.
+    return not isinstance(items, Base) or items.__class__.__iter__ is not Base.__iter__
+
+
+def iter_rows(items: Iterable) -> Iterator:
+    """Flatten groups, option chains and valuation tables into the rows that are exported.
+
+    Rows are the objects in COLUMN_FACTORIES. None is skipped.
+
+    Raises:
+        TypeError: When an item is neither a row nor an iterable of rows. Strings,
+            dictionaries and pydantic models which are not groups are not iterated.
+    """
+    if items is None:
+        return
+
+    if items.__class__ in COLUMN_FACTORIES:
+        yield items
+    elif isinstance(items, (OptionsChain, OptionsChainRecord)):
+        yield from items.chain
+    elif isinstance(items, ValuationMeasuresTable):
+        yield from items.valuations
+    elif not _is_container(items):
+        raise TypeError(f"Can not export {items.__class__.__name__} objects.")
+    else:
+        for item in items:
+            yield from iter_rows(item)
+
+
+def _table(items: Iterable, factory: Callable[[], ColumnBuffer]) -> "pa.Table":
+    require_pyarrow()
+
+    columns = factory()
+    columns.extend(iter_rows(items))
+    table = pa.Table.from_batches([record_batch(columns)])
+
+    if columns.index:
+        table = table.sort_by(columns.index)
+
+    return table
+
+
+def summary_table(pages: Iterable[SummaryPage]) -> "pa.Table":
+    """Build an arrow table from a SummaryPageGroup or SummaryRecordGroup."""
+    return _table(pages, summary_page_columns)
+
+
+def statistics_table(pages: Iterable[StatisticsPage]) -> "pa.Table":
+    """Build an arrow table from a StatisticsPageGroup.
+
+    The columns match StatisticsPageGroup.dataframe: quote, financial highlights and
+    trading information fields.
+    """
+    return _table(pages, statistics_page_columns)
+
+
+def valuation_table(table: ValuationMeasuresTable, symbol: Optional[str] = None) -> "pa.Table":
+    """Build an arrow table from a ValuationMeasuresTable.
+
+    Args:
+        table (ValuationMeasuresTable): Valuation measures of a single symbol.
+        symbol (str): If passed a symbol column is added as the first column.
+    """
+
+    def factory() -> ColumnBuffer:
+        columns = valuation_columns()
+        if symbol is None:
+            return columns
+
+        symbol_column = Column("symbol", "object", lambda _: symbol)
+        return ColumnBuffer([symbol_column, *columns.columns.values()], index=columns.index)
+
+    return _table(table.valuations, factory)
+
+
+def option_chains_table(
+    chains: Union[MultipleOptionChains, OptionsChain, Iterable[OptionsChain]],
+) -> "pa.Table":
+    """Build an arrow table with one row per contract from option chains."""
+    return _table(chains, option_contract_columns)
+
+
+class ParquetPageWriter:
+    """Stream pages to parquet in record batches as they arrive.
+
+    Rows are buffered in a ColumnBuffer and written every batch_size rows so memory use
+    stays bounded no matter how many pages are written.
+
+    Example:
+    ```python
+    with ParquetPageWriter("summary", partition_by="symbol") as writer:
+        for symbol in symbols:
+            writer.append(get_summary_page(symbol))
+    ```
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        partition_by: Optional[str] = None,
+        batch_size: int = 1_000,
+        columns: Optional[Callable[[], ColumnBuffer]] = None,
+    ) -> None:
+        """Create a writer.
+
+        Args:
+            path (Path): A parquet file path, or a directory when partition_by is set.
+            partition_by (str): Column to hive partition the output by. Example: symbol.
+            batch_size (int): Number of rows per record batch.
+            columns (Callable): Column buffer factory. Inferred from the first row when None.
+        """
+        require_pyarrow()
+
+        self.path = Path(path)
+        self.partition_by = partition_by
+        self.batch_size = batch_size
+
+        self._factory = columns
+        self._columns: Optional[ColumnBuffer] = None
+        self._schema: Optional["pa.Schema"] = None
+        self._writer: Optional["pq.ParquetWriter"] = None
+        self._batch_count = 0
+        self._partitions: Set = set()
+
+    def append(self, item: object) -> None:
+        """Append a page, a group of pages, option chains or an iterable of those.
+
+        Raises:
+            TypeError: When an item can not be exported. See iter_rows.
+        """
+        for row in iter_rows(item):
+            if self._columns is None:
+                factory = self._factory or COLUMN_FACTORIES[row.__class__]
+                self._columns = factory()
+                self._schema = arrow_schema(self._columns)
+
+            self._columns.append(row)
+
+            if len(self._columns) >= self.batch_size:
+                self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered rows as a record batch."""
+        if self._columns is None or len(self._columns) == 0:
+            return
+
+        batch = record_batch(self._columns, self._schema)
+        self._columns.clear()
+
+        if self.partition_by:
+            self._write_partitions(batch)
+        else:
+            if self._writer is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._writer = pq.ParquetWriter(str(self.path), self._schema)
+            self._writer.write_batch(batch)
+
+        self._batch_count += 1
+
+    def _write_partitions(self, batch: "pa.RecordBatch") -> None:
+        """Write a batch to hive partitions, replacing the files of earlier runs.
+
+        The first batch this writer sends to a partition deletes the files already in
+        it, so a partition never mixes rows of an earlier run with rows of this one.
+        Later batches are added next to the files this writer wrote.
+        """
+        values = batch.column(batch.schema.get_field_index(self.partition_by))
+        new_values = set(values.to_pylist()) - self._partitions
+        is_new = pc.is_in(values, value_set=pa.array(list(new_values), type=values.type))
+
+        for mask, behavior in (
+            (is_new, "delete_matching"),
+            (pc.invert(is_new), "overwrite_or_ignore"),
+        ):
+            rows = batch.filter(mask)
+
+            if rows.num_rows:
+                ds.write_dataset(
+                    rows,
+                    self.path,
+                    format="parquet",
+                    partitioning=[self.partition_by],
+                    partitioning_flavor="hive",
+                    basename_template=f"part-{self._batch_count}-{{i}}.parquet",
+                    existing_data_behavior=behavior,
+                )
+
+        self._partitions.update(new_values)
+
+    def close(self) -> None:
+        """Flush the remaining rows and close the parquet file."""
+        self.flush()
+
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self) -> "ParquetPageWriter":
+        """Enter the context manager."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close the writer when leaving the context manager."""
+        self.close()
+
+
+def write_parquet(
+    items: Iterable,
+    path: Union[str, Path],
+    partition_by: Optional[str] = None,
+    batch_size: int = 1_000,
+) -> None:
+    """Write pages, page groups or option chains to parquet.
+
+    Args:
+        items: A page group, option chains, a valuation measures table, or any iterable
+            of pages such as a generator yielding pages as they are downloaded.
+        path (Path): A parquet file path, or a directory when partition_by is set.
+        partition_by (str): Column to hive partition the output by. Example: symbol.
+        batch_size (int): Number of rows per record batch.
+    """
+    with ParquetPageWriter(path, partition_by=partition_by, batch_size=batch_size) as writer:
+        writer.append(items)
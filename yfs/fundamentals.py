@@ -0,0 +1,544 @@
+"""Download summary and statistics data from the yahoo finance quote summary api.
+
+A StatisticsPage costs a page download of about a megabyte and a SummaryPage a second
+one. The quote summary api returns the same data as a few JSON modules, so one small
+request per symbol fills both a SummaryPage and a StatisticsPage.
+
+```python
+fundamentals = get_fundamentals("aapl")
+print(fundamentals.summary_page.market_cap)
+print(fundamentals.statistics_page.financial_highlights.profit_margin)
+
+group = get_multiple_fundamentals(["aapl", "tsla", "msft"], with_threads=True)
+print(group.statistics_pages.dataframe)
+```
+"""
+
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING, Union
+
+import pendulum
+from pydantic import BaseModel as Base
+
+from .lookup import fuzzy_search
+from .metrics import Stage, timer
+from .multidownloader import (
+    _download_pages_with_threads,
+    _download_pages_without_threads,
+    DownloadReport,
+    SymbolOutcome,
+)
+from .quote import Quote
+from .requestor import requestor
+from .statistics import (
+    FinancialHighlights,
+    PeriodType,
+    StatisticsPage,
+    StatisticsPageGroup,
+    TradingInformation,
+    Valuation,
+    ValuationMeasuresTable,
+)
+from .summary import SummaryPage, SummaryPageGroup
+from .urls import quote_summary_url
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+    from .negative_cache import NegativeCache
+
+QUOTE_SUMMARY_MODULES = (
+    "price",
+    "summaryDetail",
+    "defaultKeyStatistics",
+    "financialData",
+    "calendarEvents",
+)
+"""* Quote summary modules requested for every symbol."""
+
+FieldSpec = Dict[str, Tuple[str, str, str]]
+"""* Model field to (module, key, kind). Keys of nested objects are joined by a dot."""
+
+QUOTE_FIELDS: FieldSpec = {
+    "name": ("price", "longName", "text"),
+    "close": ("price", "regularMarketPrice", "float"),
+    "change": ("price", "regularMarketChange", "float"),
+    "percent_change": ("price", "regularMarketChangePercent", "percent"),
+}
+"""* Quote fields."""
+
+SUMMARY_FIELDS: FieldSpec = {
+    "open": ("summaryDetail", "open", "float"),
+    "high": ("summaryDetail", "dayHigh", "float"),
+    "low": ("summaryDetail", "dayLow", "float"),
+    "previous_close": ("summaryDetail", "previousClose", "float"),
+    "bid_price": ("summaryDetail", "bid", "float"),
+    "bid_size": ("summaryDetail", "bidSize", "int"),
+    "ask_price": ("summaryDetail", "ask", "float"),
+    "ask_size": ("summaryDetail", "askSize", "int"),
+    "fifty_two_week_low": ("summaryDetail", "fiftyTwoWeekLow", "float"),
+    "fifty_two_week_high": ("summaryDetail", "fiftyTwoWeekHigh", "float"),
+    "volume": ("summaryDetail", "volume", "int"),
+    "average_volume": ("summaryDetail", "averageVolume", "int"),
+    "market_cap": ("summaryDetail", "marketCap", "int"),
+    "beta_five_year_monthly": ("summaryDetail", "beta", "float"),
+    "pe_ratio_ttm": ("summaryDetail", "trailingPE", "float"),
+    "eps_ttm": ("defaultKeyStatistics", "trailingEps", "float"),
+    "earnings_date": ("calendarEvents", "earnings.earningsDate", "date"),
+    "forward_dividend_yield": ("summaryDetail", "dividendRate", "float"),
+    "forward_dividend_yield_percentage": ("summaryDetail", "dividendYield", "percent"),
+    "exdividend_date": ("summaryDetail", "exDividendDate", "date"),
+    "one_year_target_est": ("financialData", "targetMeanPrice", "float"),
+}
+"""* SummaryPage fields. name, close, change and percent_change come from the quote."""
+
+VALUATION_FIELDS: FieldSpec = {
+    "date": ("price", "regularMarketTime", "date"),
+    "market_cap_intraday": ("price", "marketCap", "int"),
+    "enterprise_value": ("defaultKeyStatistics", "enterpriseValue", "int"),
+    "trailing_pe": ("summaryDetail", "trailingPE", "float"),
+    "forward_pe": ("defaultKeyStatistics", "forwardPE", "float"),
+    "peg_ratio_five_year_expected": ("defaultKeyStatistics", "pegRatio", "float"),
+    "price_sales_ttm": ("summaryDetail", "priceToSalesTrailing12Months", "float"),
+    "price_book_mrq": ("defaultKeyStatistics", "priceToBook", "float"),
+    "enterprise_revenue": ("defaultKeyStatistics", "enterpriseToRevenue", "float"),
+    "enterprise_ebitda": ("defaultKeyStatistics", "enterpriseToEbitda", "float"),
+}
+"""* Valuation fields of the current valuation."""
+
+FINANCIAL_HIGHLIGHTS_FIELDS: FieldSpec = {
+    "fiscal_year_ends": ("defaultKeyStatistics", "lastFiscalYearEnd", "date"),
+    "most_recent_quarter_mrq": ("defaultKeyStatistics", "mostRecentQuarter", "date"),
+    "profit_margin": ("financialData", "profitMargins", "percent"),
+    "operating_margin_ttm": ("financialData", "operatingMargins", "percent"),
+    "return_on_assets_ttm": ("financialData", "returnOnAssets", "percent"),
+    "return_on_equity_ttm": ("financialData", "returnOnEquity", "percent"),
+    "revenue_ttm": ("financialData", "totalRevenue", "int"),
+    "revenue_per_share_ttm": ("financialData", "revenuePerShare", "float"),
+    "quarterly_revenue_growth_yoy": ("financialData", "revenueGrowth", "percent"),
+    "gross_profit_ttm": ("financialData", "grossProfits", "int"),
+    "ebitda": ("financialData", "ebitda", "int"),
+    "net_income_avi_to_common_ttm": ("defaultKeyStatistics", "netIncomeToCommon", "int"),
+    "diluted_eps_ttm": ("defaultKeyStatistics", "trailingEps", "float"),
+    "quarterly_earnings_growth_yoy": (
+        "defaultKeyStatistics",
+        "earningsQuarterlyGrowth",
+        "percent",
+    ),
+    "total_cash_mrq": ("financialData", "totalCash", "int"),
+    "total_cash_per_share_mrq": ("financialData", "totalCashPerShare", "float"),
+    "total_debt_mrq": ("financialData", "totalDebt", "int"),
+    "total_debt_equity_mrq": ("financialData", "debtToEquity", "float"),
+    "current_ratio_mrq": ("financialData", "currentRatio", "float"),
+    "book_value_per_share_mrq": ("defaultKeyStatistics", "bookValue", "float"),
+    "levered_free_cash_flow_ttm": ("financialData", "freeCashflow", "int"),
+    "operating_cash_flow_ttm": ("financialData", "operatingCashflow", "int"),
+}
+"""* FinancialHighlights fields."""
+
+TRADING_INFORMATION_FIELDS: FieldSpec = {
+    "beta_five_year_monthly": ("defaultKeyStatistics", "beta", "float"),
+    "fifty_two_week_change": ("defaultKeyStatistics", "52WeekChange", "percent"),
+    "sp500_fifty_two_week_change": ("defaultKeyStatistics", "SandP52WeekChange", "percent"),
+    "fifty_two_week_high": ("summaryDetail", "fiftyTwoWeekHigh", "float"),
+    "fifty_two_week_low": ("summaryDetail", "fiftyTwoWeekLow", "float"),
+    "fifty_day_moving_average": ("summaryDetail", "fiftyDayAverage", "float"),
+    "two_hundred_day_moving_average": ("summaryDetail", "twoHundredDayAverage", "float"),
+    "average_three_month_volume": ("summaryDetail", "averageVolume", "int"),
+    "average_ten_day_volume": ("summaryDetail", "averageVolume10days", "int"),
+    "shares_outstanding": ("defaultKeyStatistics", "sharesOutstanding", "int"),
+    "float": ("defaultKeyStatistics", "floatShares", "int"),
+    "percent_held_by_insiders": ("defaultKeyStatistics", "heldPercentInsiders", "percent"),
+    "percent_held_by_institutions": (
+        "defaultKeyStatistics",
+        "heldPercentInstitutions",
+        "percent",
+    ),
+    "shares_short": ("defaultKeyStatistics", "sharesShort", "int"),
+    "shares_short_date": ("defaultKeyStatistics", "dateShortInterest", "date"),
+    "short_ratio": ("defaultKeyStatistics", "shortRatio", "float"),
+    "short_ratio_date": ("defaultKeyStatistics", "dateShortInterest", "date"),
+    "short_percent_of_float": ("defaultKeyStatistics", "shortPercentOfFloat", "percent"),
+    "short_percent_of_float_date": ("defaultKeyStatistics", "dateShortInterest", "date"),
+    "short_percent_of_shares_outstanding": (
+        "defaultKeyStatistics",
+        "sharesPercentSharesOut",
+        "percent",
+    ),
+    "short_percent_of_shares_outstanding_date": (
+        "defaultKeyStatistics",
+        "dateShortInterest",
+        "date",
+    ),
+    "shares_short_prior_month": ("defaultKeyStatistics", "sharesShortPriorMonth", "int"),
+    "shares_short_prior_month_date": (
+        "defaultKeyStatistics",
+        "sharesShortPreviousMonthDate",
+        "date",
+    ),
+    "forward_annual_dividend_rate": ("summaryDetail", "dividendRate", "float"),
+    "forward_annual_dividend_yield": ("summaryDetail", "dividendYield", "percent"),
+    "trailing_annual_dividend_rate": ("summaryDetail", "trailingAnnualDividendRate", "float"),
+    "trailing_annual_dividend_yield": (
+        "summaryDetail",
+        "trailingAnnualDividendYield",
+        "percent",
+    ),
+    "five_year_average_dividend_yield": ("summaryDetail", "fiveYearAvgDividendYield", "float"),
+    "payout_ratio": ("summaryDetail", "payoutRatio", "percent"),
+    "dividend_date": ("calendarEvents", "dividendDate", "date"),
+    "exdividend_date": ("summaryDetail", "exDividendDate", "date"),
+    "last_split_factor": ("defaultKeyStatistics", "lastSplitFactor", "text"),
+    "last_split_date": ("defaultKeyStatistics", "lastSplitDate", "date"),
+}
+"""* TradingInformation fields."""
+
+
+def _raw_value(modules: Dict, module: str, key: str) -> object:
+    """Return the raw value of a module key. Lists of values return the first value."""
+    value = modules.get(module)
+
+    for part in key.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+
+    if isinstance(value, list):
+        value = value[0] if value else None
+
+    if isinstance(value, dict):
+        value = value.get("raw")
+
+    return value
+
+
+def _convert(value: object, kind: str) -> object:
+    """Convert a raw api value to the type used by the page models.
+
+    Percentages are fractions in the api and percent values in the page models, dates
+    are unix timestamps.
+    """
+    if value is None or isinstance(value, bool):
+        return None
+
+    if kind == "text":
+        return value if isinstance(value, str) and value else None
+
+    if not isinstance(value, (int, float)):
+        return None
+
+    if kind == "int":
+        return int(value)
+
+    if kind == "percent":
+        return value * 100
+
+    if kind == "date":
+        return pendulum.from_timestamp(value).date()
+
+    return float(value)
+
+
+def map_fields(modules: Dict, fields: FieldSpec) -> Dict[str, object]:
+    """Map the modules of a quote summary response to model fields.
+
+    Args:
+        modules (dict): Quote summary modules by name.
+        fields (FieldSpec): Model field to (module, key, kind).
+
+    Returns:
+        dict: Value of every field. Missing values are None.
+    """
+    return {
+        field: _convert(_raw_value(modules, module, key), kind)
+        for field, (module, key, kind) in fields.items()
+    }
+
+
+class Fundamentals(Base):
+    """Summary and statistics data of one symbol from the quote summary api.
+
+    The valuation measures only have the current valuation. The api has no history of
+    valuations.
+
+    Attributes:
+        symbol (str): Ticker symbol.
+        summary_page (SummaryPage): Data of the summary page.
+        statistics_page (StatisticsPage): Data of the statistics page.
+
+    Notes:
+        This class inherits from the pydantic BaseModel which allows for the use
+        of .json() and .dict() for serialization to json strings and dictionaries.
+
+        .json(): Serialize to a JSON object.
+        .dict(): Serialize to a dictionary.
+    """
+
+    symbol: str
+    summary_page: SummaryPage
+    statistics_page: StatisticsPage
+
+    def __lt__(self, other) -> bool:  # noqa: ANN001
+        """Compare Fundamentals objects to allow ordering by symbol."""
+        if other.__class__ is self.__class__:
+            return self.symbol < other.symbol
+
+        return None
+
+
+class FundamentalsGroup(Base):
+    """Group of Fundamentals objects from multiple symbols.
+
+    Attributes:
+        fundamentals (List[Fundamentals]): Fundamentals of every symbol found.
+
+    Notes:
+        This class inherits from the pydantic BaseModel which allows for the use
+        of .json() and .dict() for serialization to json strings and dictionaries.
+
+        .json(): Serialize to a JSON object.
+        .dict(): Serialize to a dictionary.
+    """
+
+    fundamentals: List[Fundamentals] = list()
+
+    def append(self, fundamentals: Fundamentals) -> None:
+        """Append a Fundamentals object to the group."""
+        if fundamentals.__class__ is Fundamentals:
+            self.fundamentals.append(fundamentals)
+        else:
+            raise AttributeError("Can only append Fundamentals objects.")
+
+    @property
+    def symbols(self) -> List[str]:
+        """List of symbols in the group."""
+        return [fundamentals.symbol for fundamentals in self]
+
+    def sort(self) -> None:
+        """Sort Fundamentals objects by symbol."""
+        self.fundamentals = sorted(self.fundamentals)
+
+    @property
+    def summary_pages(self) -> SummaryPageGroup:
+        """Return the summary pages as a SummaryPageGroup."""
+        group = SummaryPageGroup()
+
+        for fundamentals in self:
+            group.append(fundamentals.summary_page)
+
+        return group
+
+    @property
+    def statistics_pages(self) -> StatisticsPageGroup:
+        """Return the statistics pages as a StatisticsPageGroup."""
+        group = StatisticsPageGroup()
+
+        for fundamentals in self:
+            group.append(fundamentals.statistics_page)
+
+        return group
+
+    def __getitem__(self, symbol: str) -> Fundamentals:
+        """Return the fundamentals of a symbol.
+
+        Raises:
+            KeyError: If the symbol is not in the group.
+        """
+        symbol = symbol.upper()
+
+        for fundamentals in self.fundamentals:
+            if fundamentals.symbol == symbol:
+                return fundamentals
+
+        raise KeyError(symbol)
+
+    def __iter__(self) -> Iterable:
+        """Iterate over Fundamentals objects."""
+        return iter(self.fundamentals)
+
+    def __len__(self) -> int:
+        """Length of Fundamentals objects."""
+        return len(self.fundamentals)
+
+
+def parse_quote_summary_response(symbol: str, data: Dict) -> Optional[Fundamentals]:
+    """Build Fundamentals from a decoded quote summary api response.
+
+    The values are already numbers, so the models are built without the string
+    cleaners of the page models.
+
+    Args:
+        symbol (str): Ticker symbol.
+        data (dict): Decoded JSON of a quote summary api response.
+
+    Returns:
+        Fundamentals: If the response has a result.
+        None: If the symbol is not found.
+    """
+    results = (data.get("quoteSummary") or {}).get("result")
+
+    if not results:
+        return None
+
+    with timer(Stage.CLEAN, page="fundamentals"):
+        modules = results[0]
+        symbol = (_raw_value(modules, "price", "symbol") or symbol).upper()
+        quote_data = map_fields(modules, QUOTE_FIELDS)
+        quote_data["name"] = (
+            quote_data["name"] or _convert(_raw_value(modules, "price", "shortName"), "text")
+        ) or symbol
+        summary_data = map_fields(modules, SUMMARY_FIELDS)
+        valuation_data = map_fields(modules, VALUATION_FIELDS)
+        highlights_data = map_fields(modules, FINANCIAL_HIGHLIGHTS_FIELDS)
+        trading_data = map_fields(modules, TRADING_INFORMATION_FIELDS)
+
+    with timer(Stage.MODEL, page="fundamentals"):
+        quote = Quote.construct(**quote_data)
+        valuations = []
+
+        if valuation_data["date"] is not None:
+            valuations.append(
+                Valuation.construct(period_type=PeriodType.QUARTERLY.value, **valuation_data)
+            )
+
+        return Fundamentals.construct(
+            symbol=symbol,
+            summary_page=SummaryPage.construct(
+                symbol=symbol, quote=quote, **quote_data, **summary_data
+            ),
+            statistics_page=StatisticsPage.construct(
+                symbol=symbol,
+                quote=quote,
+                valuation_measures=ValuationMeasuresTable.construct(valuations=valuations),
+                financial_highlights=FinancialHighlights.construct(**highlights_data),
+                trading_information=TradingInformation.construct(**trading_data),
+            ),
+        )
+
+
+def get_fundamentals(
+    symbol: str,
+    use_fuzzy_search: bool = True,
+    page_not_found_ok: bool = False,
+    **kwargs,  # noqa: ANN003
+) -> Optional[Fundamentals]:
+    """Get summary and statistics data of a symbol with one quote summary api request.
+
+    Args:
+        symbol (str): Ticker symbol.
+        use_fuzzy_search (bool): If True does a symbol lookup validation prior
+            to requesting data.
+        page_not_found_ok (bool): If True Returns None when the symbol is not found.
+        **kwargs: Pass (session, proxies, and timeout) to the requestor function.
+
+    Returns:
+        Fundamentals: When data is found.
+        None: No data is found and page_not_found_ok is True.
+
+    Raises:
+        AttributeError: When no data is found and the page_not_found_ok arg is false.
+    """
+    if use_fuzzy_search:
+        fuzzy_response = fuzzy_search(symbol, first_ticker=True, **kwargs)
+
+        if fuzzy_response:
+            symbol = fuzzy_response.symbol
+
+    response = requestor(quote_summary_url(symbol, QUOTE_SUMMARY_MODULES), **kwargs)
+
+    if response.ok:
+        with timer(Stage.HTML_PARSE, page="fundamentals"):
+            data = response.json()
+
+        fundamentals = parse_quote_summary_response(symbol, data)
+
+        if fundamentals is not None:
+            return fundamentals
+
+    if page_not_found_ok:
+        return None
+
+    raise AttributeError(f"{symbol} fundamentals not found.")
+
+
+def get_multiple_fundamentals(  # pylint: disable=too-many-arguments
+    symbols: List[str],
+    use_fuzzy_search: bool = True,
+    page_not_found_ok: bool = True,
+    with_threads: bool = False,
+    thread_count: int = 5,
+    progress_bar: bool = True,
+    retries: int = 0,
+    with_report: bool = False,
+    on_outcome: Optional[Callable[[SymbolOutcome], None]] = None,
+    executor: Optional["Executor"] = None,
+    use_negative_cache: bool = False,
+    negative_cache: Optional["NegativeCache"] = None,
+    **kwargs,  # noqa: ANN003
+) -> Union[Optional[FundamentalsGroup], Tuple[Optional[FundamentalsGroup], DownloadReport]]:
+    """Get the fundamentals of multiple symbols.
+
+    Args:
+        symbols (List[str]): Ticker symbols or company names.
+        use_fuzzy_search (bool): If True does a symbol lookup validation prior
+            to requesting data.
+        page_not_found_ok (bool): If True Returns None when a symbol is not found.
+        with_threads (bool): If True uses threading.
+        thread_count (int): Number of threads to use if with_threads is set to True.
+        progress_bar (bool): If True shows the progress bar else the progress bar
+            is not shown.
+        retries (int): Number of times a throttled or failed symbol is retried.
+        with_report (bool): If True a DownloadReport with the outcome of every symbol
+            is returned as well. Errors are recorded in the report instead of raised.
+        on_outcome (Callable): Called with the SymbolOutcome of every symbol as soon
+            as it is known. Errors are recorded instead of raised.
+        executor (Executor): Thread pool reused when with_threads is True instead of
+            creating one for this call. It is not shut down.
+        use_negative_cache (bool): If True symbols whose page was not found (404) within
+            the negative cache ttl are skipped without a request. Off by default.
+        negative_cache (NegativeCache): Cache to use instead of
+            yfs.negative_cache.default_negative_cache.
+        **kwargs: Pass (session, proxies, and timeout) to the requestor function.
+
+    Returns:
+        FundamentalsGroup: When data is found.
+        None: No data is found and page_not_found_ok is True.
+        Tuple: (fundamentals, DownloadReport) when with_report is True.
+
+    Raises:
+        AttributeError: When a symbol is not found and the page_not_found_ok arg is false.
+    """
+    symbols = list(dict.fromkeys(symbols))
+    group_object = FundamentalsGroup
+    callable_ = get_fundamentals
+
+    if with_threads:
+        return _download_pages_with_threads(
+            group_object,
+            callable_,
+            symbols,
+            use_fuzzy_search=use_fuzzy_search,
+            page_not_found_ok=page_not_found_ok,
+            thread_count=thread_count,
+            progress_bar=progress_bar,
+            retries=retries,
+            with_report=with_report,
+            on_outcome=on_outcome,
+            executor=executor,
+            use_negative_cache=use_negative_cache,
+            negative_cache=negative_cache,
+            **kwargs,
+        )
+    return _download_pages_without_threads(
+        group_object,
+        callable_,
+        symbols,
+        use_fuzzy_search=use_fuzzy_search,
+        page_not_found_ok=page_not_found_ok,
+        progress_bar=progress_bar,
+        retries=retries,
+        with_report=with_report,
+        on_outcome=on_outcome,
+        use_negative_cache=use_negative_cache,
+        negative_cache=negative_cache,
+        **kwargs,
+    )
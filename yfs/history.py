@@ -0,0 +1,677 @@
+"""Download price history (OHLCV bars) from the yahoo finance chart api.
+
+Bars are kept as typed numpy columns instead of one model per bar, and can be turned
+into a pandas DataFrame or an Apache Arrow table. Many symbols are downloaded with the
+same machinery as get_multiple_summary_pages. A HistoryStore keeps the histories on
+disk and only downloads the bars after the last stored bar.
+
+```python
+history = get_price_history("aapl", start="2020-01-01", interval="1d")
+print(history.close[-5:])
+
+store = HistoryStore("~/prices")
+histories = store.update_many(["aapl", "tsla", "msft"], with_threads=True)
+```
+"""
+
+from datetime import date
+from enum import Enum
+from functools import partial
+import os
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING, Union
+
+import pendulum
+from pendulum.datetime import DateTime
+
+from .lookup import fuzzy_search
+from .metrics import Stage, timer
+from .multidownloader import (
+    _download_pages_with_threads,
+    _download_pages_without_threads,
+    DownloadReport,
+    SymbolOutcome,
+)
+from .requestor import requestor
+from .urls import chart_url
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+    import numpy
+    from pandas import DataFrame
+    import pyarrow
+
+    from .negative_cache import NegativeCache
+
+
+class Interval(str, Enum):
+    """Enum for the bar sizes of the chart api."""
+
+    ONE_MINUTE = "1m"
+    TWO_MINUTES = "2m"
+    FIVE_MINUTES = "5m"
+    FIFTEEN_MINUTES = "15m"
+    THIRTY_MINUTES = "30m"
+    SIXTY_MINUTES = "60m"
+    NINETY_MINUTES = "90m"
+    ONE_HOUR = "1h"
+    ONE_DAY = "1d"
+    FIVE_DAYS = "5d"
+    ONE_WEEK = "1wk"
+    ONE_MONTH = "1mo"
+    THREE_MONTHS = "3mo"
+
+
+PRICE_COLUMNS = ("open", "high", "low", "close", "adj_close")
+"""* float64 columns of a PriceHistory. volume is int64 and timestamps are int64 seconds."""
+
+Timestamp = Union[DateTime, date, str, int, float]
+
+
+def to_unix_timestamp(value: Timestamp) -> int:
+    """Convert a DateTime, date, date string or unix timestamp to a unix timestamp."""
+    if isinstance(value, (int, float)):
+        return int(value)
+
+    if isinstance(value, str):
+        value = pendulum.parse(value)
+    elif not isinstance(value, DateTime):
+        value = pendulum.datetime(value.year, value.month, value.day)
+
+    return value.int_timestamp
+
+
+class PriceHistory:
+    """OHLCV bars of one symbol as numpy columns sorted by timestamp.
+
+    Attributes:
+        symbol (str): Ticker symbol.
+        interval (Interval): Bar size.
+        timestamps (numpy.ndarray): int64 unix timestamps of the bar starts.
+        open (numpy.ndarray): float64 open prices.
+        high (numpy.ndarray): float64 high prices.
+        low (numpy.ndarray): float64 low prices.
+        close (numpy.ndarray): float64 close prices.
+        adj_close (numpy.ndarray): float64 close prices adjusted for splits and dividends.
+        volume (numpy.ndarray): int64 volumes.
+    """
+
+    __slots__ = ("symbol", "interval", "timestamps", "volume", *PRICE_COLUMNS)
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        symbol: str,
+        interval: Union[Interval, str],
+        timestamps: "numpy.ndarray",
+        open: "numpy.ndarray",  # pylint: disable=redefined-builtin
+        high: "numpy.ndarray",
+        low: "numpy.ndarray",
+        close: "numpy.ndarray",
+        adj_close: "numpy.ndarray",
+        volume: "numpy.ndarray",
+    ) -> None:
+        """Create a history from columns of equal length."""
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
+        self.symbol = symbol.upper()
+        self.interval = Interval(interval)
+        self.timestamps = np.asarray(timestamps, dtype="int64")
+        self.open = np.asarray(open, dtype="float64")
+        self.high = np.asarray(high, dtype="float64")
+        self.low = np.asarray(low, dtype="float64")
+        self.close = np.asarray(close, dtype="float64")
+        self.adj_close = np.asarray(adj_close, dtype="float64")
+        self.volume = np.asarray(volume, dtype="int64")
+
+    @classmethod
+    def empty(cls, symbol: str, interval: Union[Interval, str]) -> "PriceHistory":
+        """Create a history without bars."""
+        return cls(symbol, interval, [], [], [], [], [], [], [])
+
+    @property
+    def columns(self) -> Dict[str, "numpy.ndarray"]:
+        """The columns by name, timestamps first."""
+        return {
+            "timestamps": self.timestamps,
+            **{name: getattr(self, name) for name in PRICE_COLUMNS},
+            "volume": self.volume,
+        }
+
+    @property
+    def last_timestamp(self) -> Optional[int]:
+        """Timestamp of the last bar. None without bars."""
+        return int(self.timestamps[-1]) if len(self) else None
+
+    def _take(self, index: Union[slice, "numpy.ndarray"]) -> "PriceHistory":
+        return PriceHistory(
+            self.symbol,
+            self.interval,
+            **{name: column[index] for name, column in self.columns.items()},
+        )
+
+    def between(
+        self, start: Optional[Timestamp] = None, end: Optional[Timestamp] = None
+    ) -> "PriceHistory":
+        """Return the bars with start <= timestamp < end."""
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
+        first = 0 if start is None else np.searchsorted(self.timestamps, to_unix_timestamp(start))
+        last = (
+            len(self)
+            if end is None
+            else np.searchsorted(self.timestamps, to_unix_timestamp(end), "left")
+        )
+        return self._take(slice(int(first), int(last)))
+
+    def merge(self, newer: "PriceHistory") -> "PriceHistory":
+        """Return the bars of self followed by newer.
+
+        Bars of self at or after the first bar of newer are replaced, so a bar which
+        was still forming when it was stored is updated.
+        """
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
+        if not len(newer):
+            return self
+
+        keep = np.searchsorted(self.timestamps, newer.timestamps[0], "left")
+        old, new = self.columns, newer.columns
+        return PriceHistory(
+            self.symbol,
+            self.interval,
+            **{name: np.concatenate([old[name][:keep], new[name]]) for name in old},
+        )
+
+    @property
+    def dataframe(self) -> "DataFrame":
+        """Return the bars as a dataframe indexed by their UTC start time."""
+        from pandas import DataFrame, to_datetime  # pylint: disable=import-outside-toplevel
+
+        columns = self.columns
+        index = to_datetime(columns.pop("timestamps"), unit="s", utc=True)
+        return DataFrame(columns, index=index.rename("date"))
+
+    def to_arrow(self) -> "pyarrow.Table":
+        """Return the bars as an arrow table with a symbol column.
+
+        Raises:
+            ImportError: If pyarrow is not installed.
+        """
+        from .export import pa, require_pyarrow  # pylint: disable=import-outside-toplevel
+
+        require_pyarrow()
+        columns = self.columns
+        timestamps = columns.pop("timestamps").astype("datetime64[s]")
+        return pa.table(
+            {
+                "symbol": pa.array([self.symbol] * len(self), pa.string()),
+                "date": pa.array(timestamps, pa.timestamp("s", tz="UTC")),
+                **columns,
+            }
+        )
+
+    def __len__(self) -> int:
+        """Return the number of bars."""
+        return len(self.timestamps)
+
+    def __lt__(self, other: "PriceHistory") -> bool:
+        """Compare PriceHistory objects to allow ordering by symbol."""
+        return self.symbol < other.symbol
+
+
+def _float_column(values: Optional[List], length: int) -> "numpy.ndarray":
+    """Convert a chart api column to float64. Missing values (null) become nan.
+
+    A missing column or one which does not match the timestamps is all nan.
+    """
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    if values is None or len(values) != length:
+        return np.full(length, np.nan)
+
+    return np.array(values, dtype="float64")
+
+
+def parse_chart_response(
+    symbol: str, interval: Union[Interval, str], data: Dict
+) -> Optional[PriceHistory]:
+    """Build a PriceHistory from a decoded chart api response.
+
+    Bars without a close price, which yahoo sends for halted or not yet traded periods,
+    are dropped.
+
+    Args:
+        symbol (str): Ticker symbol.
+        interval (Interval): Bar size which was requested.
+        data (dict): Decoded JSON of a chart api response.
+
+    Returns:
+        PriceHistory: If the response has a result. It can have no bars.
+        None: If the symbol is not found.
+    """
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    results = (data.get("chart") or {}).get("result")
+
+    if not results:
+        return None
+
+    with timer(Stage.CLEAN, page="history"):
+        result = results[0]
+        indicators = result.get("indicators") or {}
+        quote = (indicators.get("quote") or [{}])[0]
+        timestamps = np.array(result.get("timestamp") or [], dtype="int64")
+        length = len(timestamps)
+        columns = {
+            name: _float_column(quote.get(name), length)
+            for name in ("open", "high", "low", "close")
+        }
+        adj_close = (indicators.get("adjclose") or [{}])[0].get("adjclose")
+        columns["adj_close"] = (
+            columns["close"] if adj_close is None else _float_column(adj_close, length)
+        )
+        volume = _float_column(quote.get("volume"), length)
+        traded = ~np.isnan(columns["close"])
+
+        return PriceHistory(
+            symbol,
+            interval,
+            timestamps[traded],
+            volume=np.nan_to_num(volume[traded]).astype("int64"),
+            **{name: column[traded] for name, column in columns.items()},
+        )
+
+
+def get_price_history(  # pylint: disable=too-many-arguments
+    symbol: str,
+    start: Optional[Timestamp] = None,
+    end: Optional[Timestamp] = None,
+    interval: Union[Interval, str] = Interval.ONE_DAY,
+    use_fuzzy_search: bool = True,
+    page_not_found_ok: bool = False,
+    **kwargs,  # noqa: ANN003
+) -> Optional[PriceHistory]:
+    """Get the price history of a symbol.
+
+    Args:
+        symbol (str): Ticker symbol.
+        start (Timestamp): First bar. DateTime, date, date string or unix timestamp.
+            Defaults to the first bar yahoo has.
+        end (Timestamp): Bars before end are returned. Defaults to now.
+        interval (Interval): Bar size. Intraday bars are only kept by yahoo for a
+            limited time.
+        use_fuzzy_search (bool): If True does a symbol lookup validation prior
+            to requesting data.
+        page_not_found_ok (bool): If True Returns None when the symbol is not found.
+        **kwargs: Pass (session, proxies, and timeout) to the requestor function.
+
+    Returns:
+        PriceHistory: When the symbol is found, possibly without bars.
+        None: No data is found and page_not_found_ok is True.
+
+    Raises:
+        AttributeError: When no data is found and the page_not_found_ok arg is false.
+    """
+    if use_fuzzy_search:
+        fuzzy_response = fuzzy_search(symbol, first_ticker=True, **kwargs)
+
+        if fuzzy_response:
+            symbol = fuzzy_response.symbol
+
+    interval = Interval(interval)
+    period1 = 0 if start is None else to_unix_timestamp(start)
+    period2 = pendulum.now("UTC").int_timestamp if end is None else to_unix_timestamp(end)
+
+    response = requestor(chart_url(symbol, period1, period2, interval.value), **kwargs)
+
+    if response.ok:
+        with timer(Stage.HTML_PARSE, page="history"):
+            data = response.json()
+
+        history = parse_chart_response(symbol, interval, data)
+
+        if history is not None:
+            return history
+
+    if page_not_found_ok:
+        return None
+
+    raise AttributeError(f"{symbol} price history not found.")
+
+
+class PriceHistoryGroup:
+    """Group of PriceHistory objects from multiple symbols."""
+
+    def __init__(self, histories: Iterable[PriceHistory] = ()) -> None:
+        """Create a group."""
+        self.histories: List[PriceHistory] = list(histories)
+
+    def append(self, history: PriceHistory) -> None:
+        """Append a PriceHistory to the group."""
+        if history.__class__ is PriceHistory:
+            self.histories.append(history)
+        else:
+            raise AttributeError("Can only append PriceHistory objects.")
+
+    @property
+    def symbols(self) -> List[str]:
+        """List of symbols in the group."""
+        return [history.symbol for history in self]
+
+    def sort(self) -> None:
+        """Sort PriceHistory objects by symbol."""
+        self.histories = sorted(self.histories)
+
+    @property
+    def dataframe(self) -> Optional["DataFrame"]:
+        """Return the bars of every symbol indexed by (symbol, date)."""
+        from pandas import concat  # pylint: disable=import-outside-toplevel
+
+        if self.histories:
+            return concat(
+                [history.dataframe for history in self], keys=self.symbols, names=["symbol"]
+            )
+
+        return None
+
+    def to_arrow(self) -> "pyarrow.Table":
+        """Return the bars of every symbol as one arrow table with a symbol column."""
+        from .export import pa, require_pyarrow  # pylint: disable=import-outside-toplevel
+
+        require_pyarrow()
+        return pa.concat_tables([history.to_arrow() for history in self])
+
+    def __getitem__(self, symbol: str) -> PriceHistory:
+        """Return the history of a symbol.
+
+        Raises:
+            KeyError: If the symbol is not in the group.
+        """
+        symbol = symbol.upper()
+
+        for history in self.histories:
+            if history.symbol == symbol:
+                return history
+
+        raise KeyError(symbol)
+
+    def __iter__(self) -> Iterable:
+        """Iterate over PriceHistory objects."""
+        return iter(self.histories)
+
+    def __len__(self) -> int:
+        """Length of PriceHistory objects."""
+        return len(self.histories)
+
+
+def _download_histories(  # pylint: disable=too-many-arguments
+    callable_: Callable,
+    symbols: List[str],
+    use_fuzzy_search: bool,
+    page_not_found_ok: bool,
+    with_threads: bool,
+    thread_count: int,
+    progress_bar: bool,
+    retries: int,
+    with_report: bool,
+    on_outcome: Optional[Callable[[SymbolOutcome], None]],
+    executor: Optional["Executor"],
+    **kwargs,  # noqa: ANN003
+) -> Union[Optional[PriceHistoryGroup], Tuple[Optional[PriceHistoryGroup], DownloadReport]]:
+    symbols = list(dict.fromkeys(symbols))
+
+    if with_threads:
+        return _download_pages_with_threads(
+            PriceHistoryGroup,
+            callable_,
+            symbols,
+            use_fuzzy_search=use_fuzzy_search,
+            page_not_found_ok=page_not_found_ok,
+            thread_count=thread_count,
+            progress_bar=progress_bar,
+            retries=retries,
+            with_report=with_report,
+            on_outcome=on_outcome,
+            executor=executor,
+            **kwargs,
+        )
+    return _download_pages_without_threads(
+        PriceHistoryGroup,
+        callable_,
+        symbols,
+        use_fuzzy_search=use_fuzzy_search,
+        page_not_found_ok=page_not_found_ok,
+        progress_bar=progress_bar,
+        retries=retries,
+        with_report=with_report,
+        on_outcome=on_outcome,
+        **kwargs,
+    )
+
+
+def get_multiple_price_histories(  # pylint: disable=too-many-arguments
+    symbols: List[str],
+    start: Optional[Timestamp] = None,
+    end: Optional[Timestamp] = None,
+    interval: Union[Interval, str] = Interval.ONE_DAY,
+    use_fuzzy_search: bool = True,
+    page_not_found_ok: bool = True,
+    with_threads: bool = False,
+    thread_count: int = 5,
+    progress_bar: bool = True,
+    retries: int = 0,
+    with_report: bool = False,
+    on_outcome: Optional[Callable[[SymbolOutcome], None]] = None,
+    executor: Optional["Executor"] = None,
+    use_negative_cache: bool = False,
+    negative_cache: Optional["NegativeCache"] = None,
+    **kwargs,  # noqa: ANN003
+) -> Union[Optional[PriceHistoryGroup], Tuple[Optional[PriceHistoryGroup], DownloadReport]]:
+    """Get the price histories of multiple symbols.
+
+    Args:
+        symbols (List[str]): Ticker symbols or company names.
+        start (Timestamp): First bar. Defaults to the first bar yahoo has.
+        end (Timestamp): Bars before end are returned. Defaults to now.
+        interval (Interval): Bar size.
+        use_fuzzy_search (bool): If True does a symbol lookup validation prior
+            to requesting data.
+        page_not_found_ok (bool): If True symbols which are not found are left out.
+        with_threads (bool): If True uses threading.
+        thread_count (int): Number of threads to use if with_threads is set to True.
+        progress_bar (bool): If True shows the progress bar else the progress bar
+            is not shown.
+        retries (int): Number of times a throttled or failed symbol is retried.
+        with_report (bool): If True a DownloadReport with the outcome of every symbol
+            is returned as well. Errors are recorded in the report instead of raised.
+        on_outcome (Callable): Called with the SymbolOutcome of every symbol as soon
+            as it is known. Errors are recorded instead of raised.
+        executor (Executor): Thread pool reused when with_threads is True instead of
+            creating one for this call. It is not shut down.
+        use_negative_cache (bool): If True symbols whose page was not found (404) within
+            the negative cache ttl are skipped without a request. Off by default.
+        negative_cache (NegativeCache): Cache to use instead of
+            yfs.negative_cache.default_negative_cache.
+        **kwargs: Pass (session, proxies, and timeout) to the requestor function.
+
+    Returns:
+        PriceHistoryGroup: When data is found.
+        None: No data is found and page_not_found_ok is True.
+        Tuple: (histories, DownloadReport) when with_report is True.
+
+    Raises:
+        AttributeError: When a symbol is not found and the page_not_found_ok arg is false.
+    """
+    return _download_histories(
+        partial(get_price_history, start=start, end=end, interval=interval),
+        symbols,
+        use_fuzzy_search=use_fuzzy_search,
+        page_not_found_ok=page_not_found_ok,
+        with_threads=with_threads,
+        thread_count=thread_count,
+        progress_bar=progress_bar,
+        retries=retries,
+        with_report=with_report,
+        on_outcome=on_outcome,
+        executor=executor,
+        use_negative_cache=use_negative_cache,
+        negative_cache=negative_cache,
+        **kwargs,
+    )
+
+
+class HistoryStore:
+    """Price histories stored on disk as one numpy .npz file per symbol and interval.
+
+    update downloads only the bars from the last stored bar on and appends them, so
+    refreshing thousands of symbols costs one small response per symbol.
+
+    Attributes:
+        directory (Path): Root directory. Files are stored as <interval>/<SYMBOL>.npz.
+    """
+
+    def __init__(self, directory: Union[str, Path]) -> None:
+        """Create a store. The directory is created on the first save."""
+        self.directory = Path(directory).expanduser()
+
+    def path(self, symbol: str, interval: Union[Interval, str] = Interval.ONE_DAY) -> Path:
+        """Return the file path of a symbol's history."""
+        return self.directory / Interval(interval).value / f"{symbol.upper()}.npz"
+
+    def load(
+        self, symbol: str, interval: Union[Interval, str] = Interval.ONE_DAY
+    ) -> Optional[PriceHistory]:
+        """Return the stored history of a symbol or None if nothing is stored."""
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
+        path = self.path(symbol, interval)
+
+        if not path.exists():
+            return None
+
+        with np.load(path) as columns:
+            return PriceHistory(
+                symbol,
+                interval,
+                **{name: columns[name] for name in columns.files},
+            )
+
+    def save(self, history: PriceHistory) -> Path:
+        """Store a history, replacing the stored one. The file is replaced atomically."""
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
+        path = self.path(history.symbol, history.interval)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_suffix(f".{os.getpid()}.tmp")
+
+        with open(temporary, "wb") as file:
+            np.savez(file, **history.columns)
+
+        os.replace(temporary, path)
+        return path
+
+    def symbols(self, interval: Union[Interval, str] = Interval.ONE_DAY) -> List[str]:
+        """Return the symbols with a stored history."""
+        return sorted(
+            path.stem for path in (self.directory / Interval(interval).value).glob("*.npz")
+        )
+
+    def update(  # pylint: disable=too-many-arguments
+        self,
+        symbol: str,
+        interval: Union[Interval, str] = Interval.ONE_DAY,
+        start: Optional[Timestamp] = None,
+        end: Optional[Timestamp] = None,
+        use_fuzzy_search: bool = False,
+        page_not_found_ok: bool = False,
+        **kwargs,  # noqa: ANN003
+    ) -> Optional[PriceHistory]:
+        """Download the bars after the stored history of a symbol and store them.
+
+        The download starts at the last stored bar, which is replaced, so a bar stored
+        while it was still forming is completed. Without a stored history the download
+        starts at start.
+
+        Args:
+            symbol (str): Ticker symbol.
+            interval (Interval): Bar size.
+            start (Timestamp): First bar when nothing is stored yet.
+            end (Timestamp): Bars before end are downloaded. Defaults to now.
+            use_fuzzy_search (bool): If True does a symbol lookup validation prior
+                to requesting data.
+            page_not_found_ok (bool): If True Returns None when the symbol is not found.
+            **kwargs: Pass (session, proxies, and timeout) to the requestor function.
+
+        Returns:
+            PriceHistory: The complete stored history.
+            None: No data is found and page_not_found_ok is True.
+        """
+        if use_fuzzy_search:
+            fuzzy_response = fuzzy_search(symbol, first_ticker=True, **kwargs)
+
+            if fuzzy_response:
+                symbol = fuzzy_response.symbol
+
+        stored = self.load(symbol, interval)
+
+        if stored is not None and len(stored):
+            start = stored.last_timestamp
+
+        newer = get_price_history(
+            symbol,
+            start=start,
+            end=end,
+            interval=interval,
+            use_fuzzy_search=False,
+            page_not_found_ok=page_not_found_ok,
+            **kwargs,
+        )
+
+        if newer is None:
+            return stored
+
+        history = newer if stored is None else stored.merge(newer)
+        self.save(history)
+        return history
+
+    def update_many(  # pylint: disable=too-many-arguments
+        self,
+        symbols: List[str],
+        interval: Union[Interval, str] = Interval.ONE_DAY,
+        start: Optional[Timestamp] = None,
+        end: Optional[Timestamp] = None,
+        use_fuzzy_search: bool = False,
+        page_not_found_ok: bool = True,
+        with_threads: bool = False,
+        thread_count: int = 5,
+        progress_bar: bool = True,
+        retries: int = 0,
+        with_report: bool = False,
+        on_outcome: Optional[Callable[[SymbolOutcome], None]] = None,
+        executor: Optional["Executor"] = None,
+        **kwargs,  # noqa: ANN003
+    ) -> Union[Optional[PriceHistoryGroup], Tuple[Optional[PriceHistoryGroup], DownloadReport]]:
+        """Update the stored histories of multiple symbols. See update.
+
+        The download arguments are the same as for get_multiple_price_histories.
+
+        Returns:
+            PriceHistoryGroup: The complete stored histories of the updated symbols.
+            None: No data is found and page_not_found_ok is True.
+            Tuple: (histories, DownloadReport) when with_report is True.
+        """
+        return _download_histories(
+            partial(self.update, interval=interval, start=start, end=end),
+            symbols,
+            use_fuzzy_search=use_fuzzy_search,
+            page_not_found_ok=page_not_found_ok,
+            with_threads=with_threads,
+            thread_count=thread_count,
+            progress_bar=progress_bar,
+            retries=retries,
+            with_report=with_report,
+            on_outcome=on_outcome,
+            executor=executor,
+            **kwargs,
+        )
@@ -8,7 +8,9 @@ from pydantic import Field, PydanticValueError, ValidationError, validator
 
 from .asset_types import AssetTypes, VALID_ASSET_TYPES
 from .exchanges import UnitedStatesExchanges, VALID_EXCHANGE_ENUM_VALUES, VALID_EXCHANGE_UNION
+from .negative_cache import default_negative_cache, negative_key, NegativeCache
 from .requestor import requestor
+from .urls import lookup_url
 
 
 RAISE_ERROR_ON_UNKOWN_EXCHANGE_OR_ASSET = config(
@@ -165,6 +167,8 @@ def fuzzy_search(
     asset_type: AssetTypes = AssetTypes.EQUITY,
     first_ticker: bool = True,
     use_filter: bool = False,
+    use_negative_cache: bool = False,
+    negative_cache: Optional[NegativeCache] = None,
     **kwargs,  # noqa: ANN003
 ) -> Optional[Union[ValidSymbol, ValidSymbolList]]:
     """Lookup and validate symbols or company names.
@@ -215,6 +219,9 @@ def fuzzy_search(
         asset_type: One of the yfs.asset_type.AssetTypes. Default is AssetTypes.EQUITY
         first_ticker: If set to true returns the first ValidSymbol in the ValidSymbolList.
             This is normally the best recommended match from the yahoo finance quote lookup.
+        use_negative_cache: If set to true a search term without results is remembered
+            and not searched again until the negative result expires. Off by default.
+        negative_cache: Cache to use instead of yfs.negative_cache.default_negative_cache.
         **kwargs: Pass (session, proxies, and timeout) to the requestor function.
 
     Returns:
@@ -232,10 +239,13 @@ def fuzzy_search(
             yfs.asset_types.AssetTypes enum. If this error is raised please raise and issue on
             github with the output.
     """
-    url = (
-        "https://finance.yahoo.com/_finance_doubledown/api/"
-        f"resource/searchassist;searchTerm={quote_lookup}"
-    )
+    cache = default_negative_cache if negative_cache is None else negative_cache
+    key = negative_key("lookup", quote_lookup)
+
+    if use_negative_cache and key in cache:
+        return None
+
+    url = lookup_url(quote_lookup)
 
     response = requestor(url, **kwargs)
 
@@ -249,6 +259,12 @@ def fuzzy_search(
             raise error
 
         else:
+            if use_negative_cache:
+                if len(search_response) == 0:
+                    cache.add(key)
+                else:
+                    cache.discard(key)
+
             if use_filter is True:
                 valid_symbols = search_response.filter_symbols(exchange_type, asset_type)
             else:
@@ -0,0 +1,547 @@
+"""Exchange trading sessions and market hours aware refresh scheduling.
+
+Every exchange in yfs.exchanges is mapped to a TradingSession with its timezone,
+regular trading hours, lunch breaks and weekend days. Holidays and early closes are
+read from a bundled calendar, yfs/data/holidays.json, which covers the United States,
+Canadian and London exchanges. Exchanges without a bundled calendar only skip their
+weekends. Point the YFS_HOLIDAY_CALENDAR environmental variable to a JSON file with
+the same layout to replace the bundled calendar.
+
+The RefreshScheduler uses the sessions to refresh symbols often while their exchange
+is open and to stop refreshing them while it is closed:
+
+```python
+scheduler = RefreshScheduler(open_interval=60)
+scheduler.add("AAPL", UnitedStatesExchanges.NASDAQ)
+scheduler.add("SHOP", "Toronto")
+scheduler.run(get_multiple_summary_pages)
+```
+"""
+
+from dataclasses import dataclass
+from datetime import date, time
+from enum import Enum
+from functools import lru_cache
+import json
+from pathlib import Path
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from decouple import config
+import pendulum
+from pendulum.datetime import DateTime
+
+from .exchanges import (
+    AfricanExchanges,
+    AsianExchanges,
+    AustralianExchanges,
+    CanadianExchanges,
+    EuropeanExchanges,
+    MiddleEasternExchanges,
+    SouthAmericanExchanges,
+    UnitedStatesExchanges,
+    VALID_EXCHANGE_ENUMS,
+)
+from .paths import DATA_DIRECTORY
+
+HOLIDAY_CALENDAR_PATH = config(
+    "YFS_HOLIDAY_CALENDAR", default=str(DATA_DIRECTORY / "holidays.json")
+)
+"""* Path of the JSON holiday calendar."""
+
+MAX_CLOSED_DAYS = 14
+"""* Number of days searched for the next open session."""
+
+ExchangeLike = Union[Enum, str]
+
+
+class MarketState(str, Enum):
+    """Enum for the state of an exchange at a moment in time."""
+
+    OPEN = "open"
+    CLOSED = "closed"
+    BREAK = "break"
+    WEEKEND = "weekend"
+    HOLIDAY = "holiday"
+
+
+@dataclass(frozen=True)
+class HolidayCalendar:
+    """Days an exchange is closed or closes early.
+
+    Attributes:
+        holidays (frozenset): Dates the exchange is closed.
+        early_closes (Dict[date, time]): Local closing time of shortened sessions.
+    """
+
+    holidays: frozenset = frozenset()
+    early_closes: Dict[date, time] = None
+
+    def close_on(self, day: date) -> Optional[time]:
+        """Return the early closing time of day or None."""
+        return (self.early_closes or {}).get(day)
+
+
+EMPTY_CALENDAR = HolidayCalendar()
+
+
+@lru_cache(maxsize=None)
+def load_calendars(path: Union[str, Path] = None) -> Dict[str, HolidayCalendar]:
+    """Load holiday calendars from a JSON file.
+
+    The file maps a calendar name to a list of holidays and a mapping of early closes:
+
+    ```json
+    {"US": {"holidays": ["2026-01-01"], "early_closes": {"2026-11-27": "13:00"}}}
+    ```
+
+    Args:
+        path (Path): The JSON file. Defaults to HOLIDAY_CALENDAR_PATH.
+
+    Returns:
+        Dict[str, HolidayCalendar]: Calendars by name.
+    """
+    content = json.loads(Path(path or HOLIDAY_CALENDAR_PATH).read_text())
+    calendars = {}
+
+    for name, calendar in content.items():
+        calendars[name] = HolidayCalendar(
+            holidays=frozenset(date.fromisoformat(day) for day in calendar.get("holidays", [])),
+            early_closes={
+                date.fromisoformat(day): time.fromisoformat(close)
+                for day, close in calendar.get("early_closes", {}).items()
+            },
+        )
+
+    return calendars
+
+
+@dataclass(frozen=True)
+class TradingSession:  # pylint: disable=too-many-instance-attributes
+    """The regular trading hours of an exchange.
+
+    Attributes:
+        timezone (str): IANA timezone of the exchange.
+        open (time): Local opening time.
+        close (time): Local closing time.
+        breaks (Tuple[Tuple[time, time], ...]): Local (start, end) of lunch breaks.
+        weekend (Tuple[int, ...]): Weekdays without trading. Monday is 0.
+        calendar (str): Name of the holiday calendar.
+    """
+
+    timezone: str
+    open: time
+    close: time
+    breaks: Tuple[Tuple[time, time], ...] = ()
+    weekend: Tuple[int, ...] = (5, 6)
+    calendar: Optional[str] = None
+
+    @property
+    def holidays(self) -> HolidayCalendar:
+        """The holiday calendar. Empty when no calendar is bundled for the exchange."""
+        return load_calendars().get(self.calendar, EMPTY_CALENDAR)
+
+    def local(self, at: Optional[DateTime] = None) -> DateTime:
+        """Convert at, or now when None, to the timezone of the exchange."""
+        if at is None:
+            return pendulum.now(self.timezone)
+        return pendulum.instance(at).in_timezone(self.timezone)
+
+    def is_trading_day(self, day: date) -> bool:
+        """Return True when day is neither a weekend day nor a holiday."""
+        return day.weekday() not in self.weekend and day not in self.holidays.holidays
+
+    def segments(self, day: date) -> List[Tuple[DateTime, DateTime]]:
+        """Return the local (open, close) of every trading segment of day.
+
+        A session with a lunch break has two segments. Non trading days have none.
+        """
+        if not self.is_trading_day(day):
+            return []
+
+        close = self.holidays.close_on(day) or self.close
+        bounds = [self.open]
+
+        for start, end in self.breaks:
+            if start < close:
+                bounds.extend([start, end])
+
+        bounds.append(close)
+
+        return [
+            (self._at(day, start), self._at(day, end))
+            for start, end in zip(bounds[::2], bounds[1::2])
+            if start < end
+        ]
+
+    def _at(self, day: date, clock: time) -> DateTime:
+        return pendulum.datetime(
+            day.year, day.month, day.day, clock.hour, clock.minute, tz=self.timezone
+        )
+
+    def state(self, at: Optional[DateTime] = None) -> MarketState:
+        """Return the state of the exchange at a moment. Defaults to now."""
+        local = self.local(at)
+        day = local.date()
+
+        if day.weekday() in self.weekend:
+            return MarketState.WEEKEND
+
+        if day in self.holidays.holidays:
+            return MarketState.HOLIDAY
+
+        segments = self.segments(day)
+
+        for start, end in segments:
+            if start <= local < end:
+                return MarketState.OPEN
+
+        if segments and segments[0][0] <= local < segments[-1][1]:
+            return MarketState.BREAK
+
+        return MarketState.CLOSED
+
+    def is_open(self, at: Optional[DateTime] = None) -> bool:
+        """Return True when the exchange is trading at a moment. Defaults to now."""
+        return self.state(at) is MarketState.OPEN
+
+    def next_open(self, at: Optional[DateTime] = None) -> DateTime:
+        """Return the start of the next trading segment, or at itself when open.
+
+        Raises:
+            ValueError: No trading segment was found within MAX_CLOSED_DAYS.
+        """
+        local = self.local(at)
+
+        for offset in range(MAX_CLOSED_DAYS + 1):
+            for start, end in self.segments(local.date().add(days=offset)):
+                if local < end:
+                    return max(start, local)
+
+        raise ValueError(f"No trading session within {MAX_CLOSED_DAYS} days of {local}.")
+
+    def next_close(self, at: Optional[DateTime] = None) -> DateTime:
+        """Return the end of the trading segment which is open or opens next."""
+        local = self.next_open(at)
+
+        for start, end in self.segments(local.date()):
+            if start <= local < end:
+                return end
+
+        raise ValueError(f"No trading segment open at {local}.")  # pragma: no cover
+
+
+def _session(  # pylint: disable=too-many-arguments
+    timezone: str,
+    open_: str,
+    close: str,
+    breaks: Iterable[Tuple[str, str]] = (),
+    weekend: Tuple[int, ...] = (5, 6),
+    calendar: Optional[str] = None,
+) -> TradingSession:
+    return TradingSession(
+        timezone=timezone,
+        open=time.fromisoformat(open_),
+        close=time.fromisoformat(close),
+        breaks=tuple(
+            (time.fromisoformat(start), time.fromisoformat(end)) for start, end in breaks
+        ),
+        weekend=weekend,
+        calendar=calendar,
+    )
+
+
+_NEW_YORK = _session("America/New_York", "09:30", "16:00", calendar="US")
+_TORONTO = _session("America/Toronto", "09:30", "16:00", calendar="CA")
+_LONDON = _session("Europe/London", "08:00", "16:30", calendar="GB")
+_XETRA = _session("Europe/Berlin", "09:00", "17:30", calendar="DE")
+_GERMAN_REGIONAL = _session("Europe/Berlin", "08:00", "22:00", calendar="DE")
+_TOKYO = _session("Asia/Tokyo", "09:00", "15:30", [("11:30", "12:30")], calendar="JP")
+_KOREA = _session("Asia/Seoul", "09:00", "15:30", calendar="KR")
+_CHINA = _session("Asia/Shanghai", "09:30", "15:00", [("11:30", "13:00")], calendar="CN")
+
+EXCHANGE_SESSIONS: Dict[Enum, TradingSession] = {
+    **{exchange: _NEW_YORK for exchange in UnitedStatesExchanges},
+    **{exchange: _TORONTO for exchange in CanadianExchanges},
+    SouthAmericanExchanges.BUENOS_AIRES: _session(
+        "America/Argentina/Buenos_Aires", "11:00", "17:00", calendar="AR"
+    ),
+    SouthAmericanExchanges.MEXICO: _session(
+        "America/Mexico_City", "08:30", "15:00", calendar="MX"
+    ),
+    SouthAmericanExchanges.SAO_PAOLO: _session(
+        "America/Sao_Paulo", "10:00", "17:00", calendar="BR"
+    ),
+    SouthAmericanExchanges.SANTIAGO: _session("America/Santiago", "09:30", "16:00", calendar="CL"),
+    EuropeanExchanges.AMSTERDAM: _session("Europe/Amsterdam", "09:00", "17:30", calendar="NL"),
+    EuropeanExchanges.ATHENS: _session("Europe/Athens", "10:00", "17:20", calendar="GR"),
+    EuropeanExchanges.BARCELONA: _session("Europe/Madrid", "09:00", "17:30", calendar="ES"),
+    EuropeanExchanges.BERLIN: _GERMAN_REGIONAL,
+    EuropeanExchanges.BRUSSELS: _session("Europe/Brussels", "09:00", "17:30", calendar="BE"),
+    EuropeanExchanges.COPENHAGEN: _session("Europe/Copenhagen", "09:00", "17:00", calendar="DK"),
+    EuropeanExchanges.DUSSELDORF: _GERMAN_REGIONAL,
+    EuropeanExchanges.EURONEXT: _session("Europe/Paris", "09:00", "17:30", calendar="FR"),
+    EuropeanExchanges.FTSE_GLOBAL_INDEX: _LONDON,
+    EuropeanExchanges.FRANKFURT: _XETRA,
+    EuropeanExchanges.HAMBURG: _GERMAN_REGIONAL,
+    EuropeanExchanges.HANOVER: _GERMAN_REGIONAL,
+    EuropeanExchanges.HELSINKI: _session("Europe/Helsinki", "10:00", "18:30", calendar="FI"),
+    EuropeanExchanges.IRISH: _session("Europe/Dublin", "08:00", "16:30", calendar="IE"),
+    EuropeanExchanges.ISTANBOL: _session("Europe/Istanbul", "10:00", "18:00", calendar="TR"),
+    EuropeanExchanges.LISBON: _session("Europe/Lisbon", "08:00", "16:30", calendar="PT"),
+    EuropeanExchanges.LONDON: _LONDON,
+    EuropeanExchanges.LONDON_INTERNATIONAL: _LONDON,
+    EuropeanExchanges.MADRID: _session("Europe/Madrid", "09:00", "17:30", calendar="ES"),
+    EuropeanExchanges.MILAN: _session("Europe/Rome", "09:00", "17:30", calendar="IT"),
+    EuropeanExchanges.MUNICH: _GERMAN_REGIONAL,
+    EuropeanExchanges.NORWAY: _session("Europe/Oslo", "09:00", "16:20", calendar="NO"),
+    EuropeanExchanges.PARIS: _session("Europe/Paris", "09:00", "17:30", calendar="FR"),
+    EuropeanExchanges.PRAGUE: _session("Europe/Prague", "09:00", "16:20", calendar="CZ"),
+    EuropeanExchanges.STOCKHOLM: _session("Europe/Stockholm", "09:00", "17:30", calendar="SE"),
+    EuropeanExchanges.STUTTGART: _GERMAN_REGIONAL,
+    EuropeanExchanges.SWISS: _session("Europe/Zurich", "09:00", "17:30", calendar="CH"),
+    EuropeanExchanges.VIENNA: _session("Europe/Vienna", "09:00", "17:30", calendar="AT"),
+    EuropeanExchanges.ZURICH: _session("Europe/Zurich", "09:00", "17:30", calendar="CH"),
+    AfricanExchanges.CAIRO: _session(
+        "Africa/Cairo", "10:00", "14:30", weekend=(4, 5), calendar="EG"
+    ),
+    AfricanExchanges.JOHANNESBURG: _session(
+        "Africa/Johannesburg", "09:00", "17:00", calendar="ZA"
+    ),
+    MiddleEasternExchanges.PAKISTAN: _session("Asia/Karachi", "09:30", "15:30", calendar="PK"),
+    MiddleEasternExchanges.SAUDI: _session(
+        "Asia/Riyadh", "10:00", "15:00", weekend=(4, 5), calendar="SA"
+    ),
+    MiddleEasternExchanges.TEL_AVIV: _session("Asia/Jerusalem", "10:00", "17:25", calendar="IL"),
+    AsianExchanges.BOMBAY: _session("Asia/Kolkata", "09:15", "15:30", calendar="IN"),
+    AsianExchanges.COLOMBO: _session("Asia/Colombo", "09:30", "14:30", calendar="LK"),
+    AsianExchanges.HONG_KONG: _session(
+        "Asia/Hong_Kong", "09:30", "16:00", [("12:00", "13:00")], calendar="HK"
+    ),
+    AsianExchanges.JAKARTA: _session(
+        "Asia/Jakarta", "09:00", "16:00", [("12:00", "13:30")], calendar="ID"
+    ),
+    AsianExchanges.OSAKA: _TOKYO,
+    AsianExchanges.KOREA: _KOREA,
+    AsianExchanges.KOSDAQ: _KOREA,
+    AsianExchanges.KUALA_LUMPUR: _session(
+        "Asia/Kuala_Lumpur", "09:00", "17:00", [("12:30", "14:30")], calendar="MY"
+    ),
+    AsianExchanges.SHENZHEN: _CHINA,
+    AsianExchanges.SHANGHAI: _CHINA,
+    AsianExchanges.SINGAPORE: _session(
+        "Asia/Singapore", "09:00", "17:00", [("12:00", "13:00")], calendar="SG"
+    ),
+    AsianExchanges.TAIWAN: _session("Asia/Taipei", "09:00", "13:30", calendar="TW"),
+    AsianExchanges.THAILAND: _session(
+        "Asia/Bangkok", "10:00", "16:30", [("12:30", "14:30")], calendar="TH"
+    ),
+    AsianExchanges.TOKYO: _TOKYO,
+    AustralianExchanges.AUSTRALIAN: _session("Australia/Sydney", "10:00", "16:00", calendar="AU"),
+    AustralianExchanges.NEW_ZEALAND: _session("Pacific/Auckland", "10:00", "16:45", calendar="NZ"),
+}
+"""* Trading session of every exchange. UnknownExchanges have no session."""
+
+_EXCHANGES_BY_TEXT = {
+    **{exchange.name: exchange for exchange in VALID_EXCHANGE_ENUMS},
+    **{exchange.value: exchange for exchange in VALID_EXCHANGE_ENUMS},
+}
+
+
+def session_for(exchange: ExchangeLike) -> Optional[TradingSession]:
+    """Return the trading session of an exchange.
+
+    Args:
+        exchange (Enum | str): An exchange enum, or its name or value, for example the
+            exchange of a ValidSymbol from a fuzzy search.
+
+    Returns:
+        TradingSession: The session of the exchange.
+        None: The exchange is unknown.
+    """
+    if not isinstance(exchange, Enum):
+        exchange = _EXCHANGES_BY_TEXT.get(exchange)
+
+    return EXCHANGE_SESSIONS.get(exchange)
+
+
+def is_open(exchange: ExchangeLike, at: Optional[DateTime] = None) -> bool:
+    """Return True when the exchange is trading at a moment. Defaults to now.
+
+    Unknown exchanges are treated as always open.
+    """
+    session = session_for(exchange)
+    return session is None or session.is_open(at)
+
+
+def next_open(exchange: ExchangeLike, at: Optional[DateTime] = None) -> DateTime:
+    """Return when the exchange opens next. at itself, or now, when it is open.
+
+    Unknown exchanges are treated as always open.
+    """
+    session = session_for(exchange)
+
+    if session is None:
+        return pendulum.instance(at) if at is not None else pendulum.now("UTC")
+
+    return session.next_open(at)
+
+
+class RefreshScheduler:
+    """Decides when every symbol is refreshed based on the state of its exchange.
+
+    While the exchange of a symbol is open it is refreshed every open_interval
+    seconds, with one last refresh when the session closes. Outside trading hours of
+    a trading day it is refreshed every closed_interval seconds, or not at all when
+    closed_interval is None. On weekends and holidays it is not refreshed until the
+    exchange opens again. Symbols are always due for their first refresh, so their
+    last price is known even while the exchange is closed.
+
+    Symbols on unknown exchanges are refreshed every unknown_interval seconds.
+    """
+
+    def __init__(
+        self,
+        open_interval: float = 60.0,
+        closed_interval: Optional[float] = None,
+        unknown_interval: Optional[float] = None,
+    ) -> None:
+        """Create a scheduler.
+
+        Args:
+            open_interval (float): Seconds between refreshes while the exchange is open.
+            closed_interval (float): Seconds between refreshes outside trading hours on
+                trading days. None to wait for the next open.
+            unknown_interval (float): Seconds between refreshes of symbols whose exchange
+                has no known session. Defaults to open_interval.
+        """
+        self.open_interval = open_interval
+        self.closed_interval = closed_interval
+        self.unknown_interval = open_interval if unknown_interval is None else unknown_interval
+
+        self.sessions: Dict[str, Optional[TradingSession]] = {}
+        self.last_refresh: Dict[str, DateTime] = {}
+        self.run_count = 0
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, symbol: str, exchange: ExchangeLike) -> None:
+        """Schedule a symbol traded on exchange."""
+        with self._lock:
+            self.sessions[symbol.upper()] = session_for(exchange)
+
+    def remove(self, symbol: str) -> None:
+        """Stop scheduling a symbol. Unknown symbols are ignored."""
+        with self._lock:
+            self.sessions.pop(symbol.upper(), None)
+            self.last_refresh.pop(symbol.upper(), None)
+
+    @property
+    def symbols(self) -> List[str]:
+        """The scheduled symbols."""
+        return list(self.sessions)
+
+    def next_refresh(self, symbol: str) -> DateTime:
+        """Return when a symbol is due for a refresh, in UTC."""
+        symbol = symbol.upper()
+        session = self.sessions[symbol]
+        last = self.last_refresh.get(symbol)
+
+        if last is None:
+            return pendulum.datetime(1970, 1, 1, tz="UTC")
+
+        if session is None:
+            return last.add(seconds=self.unknown_interval)
+
+        return self._next_session_refresh(session, last).in_timezone("UTC")
+
+    def _next_session_refresh(self, session: TradingSession, last: DateTime) -> DateTime:
+        if session.is_open(last):
+            candidate = last.add(seconds=self.open_interval)
+            close = session.next_close(last)
+            return min(candidate, close)
+
+        if self.closed_interval is not None:
+            candidate = last.add(seconds=self.closed_interval)
+
+            if session.is_trading_day(session.local(candidate).date()):
+                return min(candidate, session.next_open(last))
+
+        return session.next_open(last)
+
+    def due(self, at: Optional[DateTime] = None) -> List[str]:
+        """Return the symbols due for a refresh at a moment. Defaults to now."""
+        at = pendulum.now("UTC") if at is None else pendulum.instance(at)
+
+        with self._lock:
+            return [symbol for symbol in self.sessions if self.next_refresh(symbol) <= at]
+
+    def mark_refreshed(self, symbols: Iterable[str], at: Optional[DateTime] = None) -> None:
+        """Record that symbols were refreshed at a moment. Defaults to now."""
+        at = pendulum.now("UTC") if at is None else pendulum.instance(at)
+
+        with self._lock:
+            for symbol in symbols:
+                if symbol.upper() in self.sessions:
+                    self.last_refresh[symbol.upper()] = at
+
+    def seconds_until_next(self, at: Optional[DateTime] = None) -> Optional[float]:
+        """Return seconds until the next symbol is due. None when nothing is scheduled."""
+        at = pendulum.now("UTC") if at is None else pendulum.instance(at)
+
+        with self._lock:
+            refreshes = [self.next_refresh(symbol) for symbol in self.sessions]
+
+        if not refreshes:
+            return None
+
+        return max(0.0, (min(refreshes) - at).total_seconds())
+
+    def run(
+        self,
+        job: Callable[[List[str]], object],
+        max_runs: Optional[int] = None,
+        idle_interval: float = 60.0,
+    ) -> None:
+        """Call job with the due symbols whenever symbols are due. Blocks the caller.
+
+        Args:
+            job (Callable): Called with the list of due symbols. Example:
+                get_multiple_summary_pages.
+            max_runs (int): Stop after job was called this many times.
+            idle_interval (float): Seconds to wait while no symbols are scheduled.
+        """
+        self._stop.clear()
+        runs = 0
+
+        while not self._stop.is_set():
+            symbols = self.due()
+
+            if symbols:
+                job(symbols)
+                self.mark_refreshed(symbols)
+                self.run_count += 1
+                runs += 1
+
+                if max_runs is not None and runs >= max_runs:
+                    break
+
+            wait = self.seconds_until_next()
+            self._stop.wait(idle_interval if wait is None else wait)
+
+    def start(self, job: Callable[[List[str]], object]) -> "RefreshScheduler":
+        """Run the scheduler on a background thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, args=(job,), daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop scheduling and wait for the running job to finish."""
+        self._stop.set()
+
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
@@ -0,0 +1,336 @@
+"""Per stage timing instrumentation.
+
+Every page download is split into four stages which are timed separately:
+
+|Stage      |What is timed                                                         |
+|-----------|----------------------------------------------------------------------|
+|fetch      |The HTTP request: connecting (DNS, TLS), waiting on yahoo and the body |
+|html_parse |Building the lxml tree of the response text                           |
+|clean      |Finding the page elements and cleaning field names and rows           |
+|model      |Constructing the pydantic models, including the value cleaners        |
+
+Timings are passed to callbacks registered with add_callback, or with collect for the
+current thread only. When no callback is registered the timers are shared no-op
+objects so the overhead is a single function call per stage.
+
+Example:
+```python
+from yfs import metrics
+
+collector = metrics.PrometheusCollector()
+metrics.add_callback(collector)
+
+get_multiple_summary_pages(symbols)
+print(collector.render())
+```
+"""
+
+from contextlib import contextmanager
+from enum import Enum
+import socket
+import threading
+from time import perf_counter
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+Callback = Callable[[str, float, Dict[str, str]], None]
+"""* Signature of a metrics callback: callback(stage, seconds, labels)."""
+
+_callbacks: Tuple[Callback, ...] = ()
+_callbacks_lock = threading.Lock()
+
+
+class _ThreadCallbacks(threading.local):
+    callbacks: Tuple[Callback, ...] = ()
+
+
+_thread = _ThreadCallbacks()
+
+
+class Stage(str, Enum):
+    """Enum for the timed stages of a page download."""
+
+    FETCH = "fetch"
+    HTML_PARSE = "html_parse"
+    CLEAN = "clean"
+    MODEL = "model"
+
+
+def add_callback(callback: Callback) -> Callback:
+    """Register a callback receiving (stage, seconds, labels) for every timed stage.
+
+    Returns:
+        The callback so it can be used as a decorator.
+    """
+    global _callbacks  # pylint: disable=global-statement
+
+    with _callbacks_lock:
+        _callbacks = (*_callbacks, callback)
+
+    return callback
+
+
+def remove_callback(callback: Callback) -> None:
+    """Unregister a callback. Unknown callbacks are ignored."""
+    global _callbacks  # pylint: disable=global-statement
+
+    with _callbacks_lock:
+        _callbacks = tuple(registered for registered in _callbacks if registered is not callback)
+
+
+def clear_callbacks() -> None:
+    """Unregister all callbacks."""
+    global _callbacks  # pylint: disable=global-statement
+
+    with _callbacks_lock:
+        _callbacks = ()
+
+
+@contextmanager
+def collect(callback: Callback) -> Iterator[Callback]:
+    """Send the timings of the current thread to callback inside the with block.
+
+    Unlike add_callback only timings of the calling thread are received, which allows
+    attributing timings to the symbol a worker thread is downloading.
+    """
+    previous = _thread.callbacks
+    _thread.callbacks = (*previous, callback)
+    try:
+        yield callback
+    finally:
+        _thread.callbacks = previous
+
+
+def enabled() -> bool:
+    """Return True when at least one callback is registered for the current thread."""
+    return bool(_callbacks or _thread.callbacks)
+
+
+def record(stage: Union[Stage, str], seconds: float, **labels: str) -> None:
+    """Send a timing to every registered callback."""
+    stage = stage.value if isinstance(stage, Stage) else stage
+
+    for callback in _callbacks:
+        callback(stage, seconds, labels)
+
+    for callback in _thread.callbacks:
+        callback(stage, seconds, labels)
+
+
+class _NullTimer:
+    """Timer used while instrumentation is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullTimer":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        return None
+
+    def label(self, **labels: str) -> None:
+        """Ignore labels."""
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    """Times the body of a with statement and records it on exit."""
+
+    __slots__ = ("stage", "labels", "start")
+
+    def __init__(self, stage: Stage, labels: Dict[str, str]) -> None:
+        self.stage = stage
+        self.labels = labels
+        self.start = 0.0
+
+    def __enter__(self) -> "_Timer":
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        record(self.stage, perf_counter() - self.start, **self.labels)
+
+    def label(self, **labels: str) -> None:
+        """Add labels known only after the timed code ran, for example a status code."""
+        self.labels.update(labels)
+
+
+def timer(stage: Stage, **labels: str) -> Union[_Timer, _NullTimer]:
+    """Time a stage with a with statement.
+
+    Example:
+    ```python
+    with timer(Stage.MODEL, page="summary"):
+        page = SummaryPage(**data)
+    ```
+
+    Args:
+        stage (Stage): The timed stage.
+        **labels: Labels passed to the callbacks. Example: page="summary".
+    """
+    if not (_callbacks or _thread.callbacks):
+        return _NULL_TIMER
+
+    return _Timer(stage, labels)
+
+
+def _label_key(labels: Dict[str, str]) -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+class TimingRecorder:
+    """Callback keeping every timing in memory. Useful for tests and one off runs.
+
+    Attributes:
+        events (List[Tuple[str, float, Dict[str, str]]]): Recorded (stage, seconds, labels).
+    """
+
+    def __init__(self) -> None:
+        """Create an empty recorder."""
+        self.events: List[Tuple[str, float, Dict[str, str]]] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, stage: str, seconds: float, labels: Dict[str, str]) -> None:
+        """Record a timing."""
+        with self._lock:
+            self.events.append((stage, seconds, dict(labels)))
+
+    def totals(self) -> Dict[str, float]:
+        """Return the total seconds spent per stage."""
+        totals: Dict[str, float] = {}
+
+        for stage, seconds, _ in self.events:
+            totals[stage] = totals.get(stage, 0.0) + seconds
+
+        return totals
+
+
+class PrometheusCollector:
+    """Callback aggregating timings into Prometheus style histograms and counters.
+
+    Exposes `<namespace>_stage_seconds` histograms per stage and labels, and a
+    `<namespace>_http_responses_total` counter per HTTP status code. render() returns
+    the Prometheus text exposition format, ready to be served on a /metrics endpoint.
+    """
+
+    DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, namespace: str = "yfs", buckets: Iterable[float] = DEFAULT_BUCKETS) -> None:
+        """Create a collector.
+
+        Args:
+            namespace (str): Prefix of the metric names.
+            buckets (Iterable[float]): Upper bounds of the histogram buckets in seconds.
+        """
+        self.namespace = namespace
+        self.buckets = tuple(sorted(buckets))
+        self._histograms: Dict[Tuple, List] = {}
+        self._responses: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, stage: str, seconds: float, labels: Dict[str, str]) -> None:
+        """Add a timing to the histogram of its stage and labels."""
+        labels = dict(labels)
+        status = labels.pop("status", None)
+        key = (("stage", stage), *_label_key(labels))
+
+        with self._lock:
+            histogram = self._histograms.get(key)
+
+            if histogram is None:
+                # bucket counts, sum, count
+                histogram = self._histograms[key] = [[0] * len(self.buckets), 0.0, 0]
+
+            for index, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    histogram[0][index] += 1
+
+            histogram[1] += seconds
+            histogram[2] += 1
+
+            if status is not None:
+                self._responses[status] = self._responses.get(status, 0) + 1
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+
+        def format_labels(pairs: Iterable[Tuple[str, str]]) -> str:
+            return "{" + ",".join(f'{name}="{value}"' for name, value in pairs) + "}"
+
+        seconds = f"{self.namespace}_stage_seconds"
+        responses = f"{self.namespace}_http_responses_total"
+        lines = [
+            f"# HELP {seconds} Time spent per page download stage.",
+            f"# TYPE {seconds} histogram",
+        ]
+
+        with self._lock:
+            for key, (bucket_counts, total, count) in sorted(self._histograms.items()):
+                for bound, bucket_count in zip(self.buckets, bucket_counts):
+                    lines.append(
+                        f"{seconds}_bucket{format_labels((*key, ('le', repr(bound))))} "
+                        f"{bucket_count}"
+                    )
+                lines.append(f"{seconds}_bucket{format_labels((*key, ('le', '+Inf')))} {count}")
+                lines.append(f"{seconds}_sum{format_labels(key)} {total}")
+                lines.append(f"{seconds}_count{format_labels(key)} {count}")
+
+            lines.append(f"# HELP {responses} HTTP responses per status code.")
+            lines.append(f"# TYPE {responses} counter")
+
+            for status, count in sorted(self._responses.items()):
+                lines.append(f"{responses}{format_labels([('status', status)])} {count}")
+
+        return "\n".join(lines) + "\n"
+
+
+class StatsdCollector:
+    """Callback sending timings to a StatsD server over UDP.
+
+    Every timing is sent as `<prefix>.<stage>:<milliseconds>|ms` and every HTTP
+    response as `<prefix>.http.<status>:1|c`. Labels are appended as DogStatsD tags
+    when tags is True, otherwise their values are joined into the metric name.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8125,
+        prefix: str = "yfs",
+        tags: bool = False,
+    ) -> None:
+        """Create a collector sending to host:port."""
+        self.address = (host, port)
+        self.prefix = prefix
+        self.tags = tags
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def _name_and_tags(self, name: str, labels: Dict[str, str]) -> Tuple[str, str]:
+        if self.tags:
+            tags = ",".join(f"{label}:{value}" for label, value in _label_key(labels))
+            return name, f"|#{tags}" if tags else ""
+
+        values = [value for _, value in _label_key(labels)]
+        return ".".join([name, *values]), ""
+
+    def __call__(self, stage: str, seconds: float, labels: Dict[str, str]) -> None:
+        """Send a timing and, for fetches, a response counter."""
+        labels = dict(labels)
+        status: Optional[str] = labels.pop("status", None)
+
+        name, tags = self._name_and_tags(f"{self.prefix}.{stage}", labels)
+        self._send(f"{name}:{seconds * 1000:.3f}|ms{tags}")
+
+        if status is not None:
+            self._send(f"{self.prefix}.http.{status}:1|c")
+
+    def _send(self, line: str) -> None:
+        try:
+            self._socket.sendto(line.encode(), self.address)
+        except OSError:
+            pass  # metrics are best effort and must never fail a download
+
+    def close(self) -> None:
+        """Close the UDP socket."""
+        self._socket.close()
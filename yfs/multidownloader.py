@@ -1,75 +1,431 @@
 """Download multiple pages with or without threads."""
 
-from concurrent.futures import as_completed, ThreadPoolExecutor
-from typing import Callable, List, Optional
+from concurrent.futures import as_completed, Executor, ThreadPoolExecutor
+from contextlib import contextmanager
+from enum import Enum
+from time import perf_counter, sleep
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, TYPE_CHECKING, Union
 
-import enlighten
+from decouple import config
 from pydantic import BaseModel as Base
 
 from .lookup import fuzzy_search
+from .metrics import collect, Stage
+from .negative_cache import default_negative_cache, negative_key, NegativeCache
 
+if TYPE_CHECKING:
+    import enlighten
 
-def _download_pages_without_threads(  # pylint: disable=too-many-arguments
+RETRY_BACKOFF = config("YFS_RETRY_BACKOFF", default=0.5, cast=float)
+"""* Seconds to wait before the first retry. The wait doubles on every retry."""
+
+
+class OutcomeStatus(str, Enum):
+    """Enum for the outcome of downloading the page of one symbol."""
+
+    OK = "ok"
+    NOT_FOUND = "not_found"
+    INVALID_SYMBOL = "invalid_symbol"
+    THROTTLED = "throttled"
+    ERROR = "error"
+
+
+RETRYABLE_STATUSES = (OutcomeStatus.THROTTLED, OutcomeStatus.ERROR)
+"""* Outcome statuses which are retried and worth requeueing."""
+
+
+class SymbolOutcome(Base):
+    """The outcome of downloading the page of one symbol.
+
+    Attributes:
+        symbol (str): The symbol which was downloaded. Upper case after a fuzzy search.
+        query (str): The symbol or company name as it was passed in.
+        status (OutcomeStatus): Outcome of the download.
+        http_status (int): Status code of the last response. None if no response
+            was received.
+        retries (int): Number of retries.
+        fetch_seconds (float): Time spent on requests, including retries.
+        parse_seconds (float): Time spent on HTML parsing, cleaning and models.
+        error (str): The error message if an exception was raised.
+        cached (bool): True if the status was taken from the negative cache without
+            sending a request.
+
+    Notes:
+        This class inherits from the pydantic BaseModel which allows for the use
+        of .json() and .dict() for serialization to json strings and dictionaries.
+
+        .json(): Serialize to a JSON object.
+        .dict(): Serialize to a dictionary.
+    """
+
+    symbol: str
+    query: str
+    status: OutcomeStatus = OutcomeStatus.OK
+    http_status: Optional[int]
+    retries: int = 0
+    fetch_seconds: float = 0.0
+    parse_seconds: float = 0.0
+    error: Optional[str]
+    cached: bool = False
+
+
+class DownloadReport(Base):
+    """Per symbol outcomes of a multiple page download.
+
+    Attributes:
+        outcomes (List[SymbolOutcome]): One outcome per requested symbol.
+        seconds (float): Wall clock duration of the download.
+
+    Notes:
+        This class inherits from the pydantic BaseModel which allows for the use
+        of .json() and .dict() for serialization to json strings and dictionaries.
+
+        .json(): Serialize to a JSON object.
+        .dict(): Serialize to a dictionary.
+    """
+
+    outcomes: List[SymbolOutcome] = []
+    seconds: float = 0.0
+
+    def append(self, outcome: SymbolOutcome) -> None:
+        """Append an outcome."""
+        self.outcomes.append(outcome)
+
+    def by_status(self, *statuses: OutcomeStatus) -> List[SymbolOutcome]:
+        """Return the outcomes with one of the statuses."""
+        return [outcome for outcome in self.outcomes if outcome.status in statuses]
+
+    @property
+    def failed(self) -> List[SymbolOutcome]:
+        """Outcomes which were throttled or raised an error and are worth requeueing."""
+        return self.by_status(*RETRYABLE_STATUSES)
+
+    def requeue(self) -> List[str]:
+        """Return the queries of the failed outcomes, ready to pass to a new download."""
+        return [outcome.query for outcome in self.failed]
+
+    def counts(self) -> Dict[str, int]:
+        """Return the number of outcomes per status."""
+        counts: Dict[str, int] = {}
+
+        for outcome in self.outcomes:
+            counts[outcome.status.value] = counts.get(outcome.status.value, 0) + 1
+
+        return counts
+
+    @property
+    def symbols_per_second(self) -> float:
+        """Successfully downloaded symbols per second."""
+        if not self.seconds:
+            return 0.0
+        return len(self.by_status(OutcomeStatus.OK)) / self.seconds
+
+    def __len__(self) -> int:
+        """Return the number of outcomes."""
+        return len(self.outcomes)
+
+
+class _OutcomeTimings:
+    """Metrics callback adding the timings of one thread to a SymbolOutcome."""
+
+    def __init__(self, outcome: SymbolOutcome) -> None:
+        self.outcome = outcome
+
+    def __call__(self, stage: str, seconds: float, labels: Dict[str, str]) -> None:
+        if stage == Stage.FETCH.value:
+            self.outcome.fetch_seconds += seconds
+            self.outcome.http_status = labels.get("status", self.outcome.http_status)
+        else:
+            self.outcome.parse_seconds += seconds
+
+
+def _outcome_status(
+    result: Optional[Base], error: Optional[Exception], http_status: Optional[int]
+) -> OutcomeStatus:
+    if result is not None:
+        return OutcomeStatus.OK
+
+    if http_status == 429:
+        return OutcomeStatus.THROTTLED
+
+    if http_status is None or http_status >= 500:
+        return OutcomeStatus.ERROR
+
+    if error is not None and not isinstance(error, AttributeError):
+        return OutcomeStatus.ERROR
+
+    return OutcomeStatus.NOT_FOUND
+
+
+def _download_symbol(  # pylint: disable=too-many-arguments
+    callable_: Callable,
+    symbol: str,
+    query: str,
+    page_not_found_ok: bool,
+    retries: int,
+    raise_errors: bool,
+    **kwargs,  # noqa: ANN003
+) -> Tuple[Optional[Base], SymbolOutcome]:
+    """Download the page of one symbol, retrying throttled and failed requests."""
+    outcome = SymbolOutcome(symbol=symbol, query=query)
+
+    with collect(_OutcomeTimings(outcome)):
+        for attempt in range(retries + 1):
+            if attempt:
+                sleep(RETRY_BACKOFF * 2 ** (attempt - 1))
+
+            outcome.retries = attempt
+            outcome.http_status = None
+            result, error = None, None
+
+            try:
+                result = callable_(
+                    symbol,
+                    use_fuzzy_search=False,
+                    page_not_found_ok=page_not_found_ok,
+                    **kwargs,  # session, proxies, timeout
+                )
+            except Exception as exception:  # pylint: disable=broad-except
+                error = exception
+
+            outcome.status = _outcome_status(result, error, outcome.http_status)
+
+            if outcome.status not in RETRYABLE_STATUSES:
+                break
+
+    if error is not None:
+        if raise_errors:
+            raise error
+        outcome.error = f"{error.__class__.__name__}: {error}"
+
+    return result, outcome
+
+
+def progress_counter(total: int, desc: str, unit: str) -> "enlighten.Counter":
+    """Create an enlighten progress bar. enlighten is only imported when a bar is shown."""
+    import enlighten  # pylint: disable=import-outside-toplevel
+
+    return enlighten.Counter(total=total, desc=desc, unit=unit)
+
+
+def _lookup(
+    symbol: str,
+    raise_errors: bool,
+    use_negative_cache: bool,
+    negative_cache: NegativeCache,
+    **kwargs,  # noqa: ANN003
+) -> Union[Optional[Base], Exception]:
+    """Fuzzy search a symbol. Errors are returned instead of raised unless raise_errors."""
+    try:
+        return fuzzy_search(
+            symbol,
+            first_ticker=True,
+            use_negative_cache=use_negative_cache,
+            negative_cache=negative_cache,
+            **kwargs,
+        )
+    except Exception as exception:  # pylint: disable=broad-except
+        if raise_errors:
+            raise
+        return exception
+
+
+def _valid_symbols(
+    symbols: List[str], lookups: List[Union[Optional[Base], Exception]], report: DownloadReport
+) -> Dict[str, str]:
+    """Map the symbols found by a fuzzy search to their query.
+
+    Queries without a lookup result are added to the report as invalid symbols and
+    failed lookups as errors.
+    """
+    valid_symbols = {}
+
+    for query, lookup in zip(symbols, lookups):
+        if isinstance(lookup, Exception):
+            report.append(
+                SymbolOutcome(
+                    symbol=query,
+                    query=query,
+                    status=OutcomeStatus.ERROR,
+                    error=f"{lookup.__class__.__name__}: {lookup}",
+                )
+            )
+        elif lookup is None:
+            report.append(
+                SymbolOutcome(symbol=query, query=query, status=OutcomeStatus.INVALID_SYMBOL)
+            )
+        else:
+            valid_symbols.setdefault(lookup.symbol, query)
+
+    return valid_symbols
+
+
+def _without_negative_results(  # pylint: disable=too-many-arguments
+    queries: Dict[str, str],
+    kind: str,
+    negative_cache: NegativeCache,
+    page_not_found_ok: bool,
+    raise_errors: bool,
+    report: DownloadReport,
+    on_outcome: Optional[Callable[[SymbolOutcome], None]],
+) -> Dict[str, str]:
+    """Return the queries without a negative result.
+
+    The others are reported as not found without sending a request.
+
+    Raises:
+        AttributeError: When a symbol has a negative result, raise_errors is True and
+            page_not_found_ok is False, as the page getters do.
+    """
+    remaining = {}
+
+    for symbol, query in queries.items():
+        if negative_key(kind, symbol) not in negative_cache:
+            remaining[symbol] = query
+            continue
+
+        if raise_errors and not page_not_found_ok:
+            raise AttributeError(f"{symbol} page not found. Cached as not found.")
+
+        outcome = SymbolOutcome(
+            symbol=symbol, query=query, status=OutcomeStatus.NOT_FOUND, cached=True
+        )
+        report.append(outcome)
+
+        if on_outcome:
+            on_outcome(outcome)
+
+    return remaining
+
+
+def _remember_outcome(negative_cache: NegativeCache, kind: str, outcome: SymbolOutcome) -> None:
+    """Cache a page the server answered with 404, and forget the result of a found page.
+
+    A page which was downloaded but could not be parsed is not cached, since the
+    symbol exists and the next download may succeed.
+    """
+    if outcome.status is OutcomeStatus.NOT_FOUND and outcome.http_status == 404:
+        negative_cache.add(negative_key(kind, outcome.symbol))
+    elif outcome.status is OutcomeStatus.OK:
+        negative_cache.discard(negative_key(kind, outcome.symbol))
+
+
+def _finish(
+    pages: Base, report: DownloadReport, start: float, with_report: bool
+) -> Union[Optional[Base], Tuple[Optional[Base], DownloadReport]]:
+    report.seconds = perf_counter() - start
+    pages = pages if len(pages) > 0 else None
+
+    if with_report:
+        return pages, report
+
+    return pages
+
+
+@contextmanager
+def _worker_pool(executor: Optional[Executor], thread_count: int) -> Iterator[Executor]:
+    """Yield executor, or a new thread pool which is shut down afterwards when None."""
+    if executor is not None:
+        yield executor
+        return
+
+    with ThreadPoolExecutor(max_workers=thread_count) as pool:
+        yield pool
+
+
+def _download_pages_without_threads(  # pylint: disable=too-many-arguments, too-many-locals
     group_object: Base,
     callable_: Callable,
     symbols: List[str],
     use_fuzzy_search: bool,
     page_not_found_ok: bool,
     progress_bar: bool,
+    retries: int = 0,
+    with_report: bool = False,
+    on_outcome: Optional[Callable[[SymbolOutcome], None]] = None,
+    use_negative_cache: bool = False,
+    negative_cache: Optional[NegativeCache] = None,
     **kwargs,  # noqa: ANN003
-) -> Optional[Base]:
-
+) -> Union[Optional[Base], Tuple[Optional[Base], DownloadReport]]:
+    start = perf_counter()
     pages = group_object()
+    report = DownloadReport()
+    raise_errors = not (with_report or on_outcome)
+    cache = default_negative_cache if negative_cache is None else negative_cache
+    kind = group_object.__name__
 
     if use_fuzzy_search:
-        valid_symbols = []
+        lookups = []
 
         if progress_bar:
-            pbar = enlighten.Counter(
+            pbar = progress_counter(
                 total=len(symbols), desc="Validating symbols...", unit="symbols"
             )
 
         for symbol in symbols:
-            result = fuzzy_search(
+            result = _lookup(
                 symbol,
-                first_ticker=True,
+                raise_errors,
+                use_negative_cache,
+                cache,
                 **kwargs,  # session, proxies, timeout
             )
 
-            valid_symbols.append(result)
+            lookups.append(result)
 
             if progress_bar:
                 pbar.update()
 
-        valid_symbols = filter(lambda s: s is not None, valid_symbols)
-        symbols = list(set(s.symbol for s in valid_symbols))
+        queries = _valid_symbols(symbols, lookups, report)
+
+        if on_outcome:
+            for outcome in report.outcomes:
+                on_outcome(outcome)
+    else:
+        queries = {symbol: symbol for symbol in symbols}
+
+    if use_negative_cache:
+        queries = _without_negative_results(
+            queries, kind, cache, page_not_found_ok, raise_errors, report, on_outcome
+        )
 
     if progress_bar:
-        pbar = enlighten.Counter(
-            total=len(symbols), desc="Downloading Page Data...", unit="symbols"
+        pbar = progress_counter(
+            total=len(queries), desc="Downloading Page Data...", unit="symbols"
         )
 
-    for symbol in symbols:
-        results = callable_(
+    for symbol, query in queries.items():
+        results, outcome = _download_symbol(
+            callable_,
             symbol,
-            use_fuzzy_search=False,
-            page_not_found_ok=page_not_found_ok,
+            query,
+            page_not_found_ok,
+            retries,
+            raise_errors,
             **kwargs,  # session, proxies, timeout
         )
 
         if results:
             pages.append(results)
 
+        report.append(outcome)
+
+        if use_negative_cache:
+            _remember_outcome(cache, kind, outcome)
+
+        if on_outcome:
+            on_outcome(outcome)
+
         if progress_bar:
             pbar.update()
 
-    if len(pages) > 0:
-        return pages
+    if use_negative_cache:
+        cache.flush()
 
-    return None
+    return _finish(pages, report, start, with_report)
 
 
-def _download_pages_with_threads(  # pylint: disable=too-many-arguments
+def _download_pages_with_threads(  # pylint: disable=too-many-arguments, too-many-locals
     group_object: Base,
     callable_: Callable,
     symbols: List[str],
@@ -77,19 +433,31 @@ def _download_pages_with_threads(  # pylint: disable=too-many-arguments
     page_not_found_ok: bool,
     thread_count: int,
     progress_bar: bool,
+    retries: int = 0,
+    with_report: bool = False,
+    on_outcome: Optional[Callable[[SymbolOutcome], None]] = None,
+    executor: Optional[Executor] = None,
+    use_negative_cache: bool = False,
+    negative_cache: Optional[NegativeCache] = None,
     **kwargs,  # noqa: ANN003
-) -> Optional[Base]:
+) -> Union[Optional[Base], Tuple[Optional[Base], DownloadReport]]:
+    start = perf_counter()
     pages = group_object()
+    report = DownloadReport()
+    raise_errors = not (with_report or on_outcome)
+    cache = default_negative_cache if negative_cache is None else negative_cache
+    kind = group_object.__name__
 
     if use_fuzzy_search:
-        valid_symbols = []
 
-        with ThreadPoolExecutor(max_workers=thread_count) as executor:
+        with _worker_pool(executor, thread_count) as pool:
             futures = [
-                executor.submit(
-                    fuzzy_search,
+                pool.submit(
+                    _lookup,
                     symbol,
-                    first_ticker=True,
+                    raise_errors,
+                    use_negative_cache,
+                    cache,
                     **kwargs,
                     # kwargs for requestor: session, proxies, timeout
                 )
@@ -97,47 +465,69 @@ def _download_pages_with_threads(  # pylint: disable=too-many-arguments
             ]
 
             if progress_bar:
-                pbar = enlighten.Counter(
+                pbar = progress_counter(
                     total=len(futures), desc="Validating symbols...", unit="symbols"
                 )
 
             for future in as_completed(futures):
-                valid_symbols.append(future.result())
+                future.result()
 
                 if progress_bar:
                     pbar.update()
 
-        valid_symbols = filter(lambda s: s is not None, valid_symbols)
-        symbols = list(set(s.symbol for s in valid_symbols))
+        lookups = [future.result() for future in futures]
+        queries = _valid_symbols(symbols, lookups, report)
+
+        if on_outcome:
+            for outcome in report.outcomes:
+                on_outcome(outcome)
+    else:
+        queries = {symbol: symbol for symbol in symbols}
 
-    with ThreadPoolExecutor(max_workers=thread_count) as executor:
+    if use_negative_cache:
+        queries = _without_negative_results(
+            queries, kind, cache, page_not_found_ok, raise_errors, report, on_outcome
+        )
+
+    with _worker_pool(executor, thread_count) as pool:
         futures = [
-            executor.submit(
+            pool.submit(
+                _download_symbol,
                 callable_,
                 symbol,
-                use_fuzzy_search=False,
-                page_not_found_ok=page_not_found_ok,
+                query,
+                page_not_found_ok,
+                retries,
+                raise_errors,
                 **kwargs,
                 # kwargs for requestor: session, proxies, timeout
             )
-            for symbol in symbols
+            for symbol, query in queries.items()
         ]
 
         if progress_bar:
-            pbar = enlighten.Counter(
+            pbar = progress_counter(
                 total=len(futures), desc="Downloading Page Data...", unit="symbols"
             )
 
         for future in as_completed(futures):
-            results = future.result()
+            results, outcome = future.result()
 
             if results:
                 pages.append(results)
 
+            report.append(outcome)
+
+            if use_negative_cache:
+                _remember_outcome(cache, kind, outcome)
+
+            if on_outcome:
+                on_outcome(outcome)
+
             if progress_bar:
                 pbar.update()
 
-    if len(pages) > 0:
-        return pages
+    if use_negative_cache:
+        cache.flush()
 
-    return None
+    return _finish(pages, report, start, with_report)
@@ -0,0 +1,143 @@
+"""Remember symbols which have no lookup results or no page data.
+
+Watchlists scraped from social feeds are full of cashtags which are not symbols. Every
+run each of them costs a quote lookup and often a failed page download. With
+use_negative_cache fuzzy_search and the multiple page downloads consult a NegativeCache
+first and skip the request while a negative result is younger than the cache ttl. The
+cache is off by default, and only search terms without results and pages answered with
+404 are cached.
+
+Setting the YFS_NEGATIVE_CACHE_PATH environmental variable saves the default cache so
+junk symbols are skipped on the next run as well.
+
+```python
+cache = NegativeCache("~/.yfs/negative_cache.json", ttl=7 * 86_400)
+pages = get_multiple_summary_pages(watchlist, use_negative_cache=True, negative_cache=cache)
+cache.flush()
+```
+"""
+
+import atexit
+import json
+import os
+from pathlib import Path
+import threading
+import time
+from typing import Dict, Optional, Union
+
+from decouple import config
+
+NEGATIVE_CACHE_TTL = config("YFS_NEGATIVE_CACHE_TTL", default=86_400, cast=float)
+"""* Seconds a negative result is reused."""
+
+NEGATIVE_CACHE_PATH = config("YFS_NEGATIVE_CACHE_PATH", default="")
+"""* File of the default negative cache. Empty to keep it in memory only."""
+
+
+def negative_key(kind: str, value: str) -> str:
+    """Build the cache key of a negative result.
+
+    Args:
+        kind (str): What was not found. Example: lookup or SummaryPageGroup.
+        value (str): Search term or symbol. Case and surrounding whitespace are ignored.
+    """
+    return f"{kind}:{value.strip().upper()}"
+
+
+class NegativeCache:
+    """Negative results which are reused for ttl seconds, optionally saved to a file.
+
+    The file is read on first use and written by flush.
+
+    Attributes:
+        path (Path): JSON file the cache is saved to. None to keep it in memory only.
+        ttl (float): Seconds a negative result is reused.
+    """
+
+    def __init__(
+        self, path: Optional[Union[str, Path]] = None, ttl: float = NEGATIVE_CACHE_TTL
+    ) -> None:
+        """Create a cache. An existing file is loaded on first use."""
+        self.path = Path(path).expanduser() if path else None
+        self.ttl = ttl
+        self._entries: Optional[Dict[str, float]] = None
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, float]:
+        """Read the file the first time the cache is used. Call with the lock held."""
+        if self._entries is not None:
+            return self._entries
+
+        self._entries = {}
+
+        if self.path is None or not self.path.exists():
+            return self._entries
+
+        try:
+            data = json.loads(self.path.read_text())
+            self._entries = {key: float(expires) for key, expires in data["entries"].items()}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            # A damaged cache file is ignored and replaced on the next flush.
+            self._entries = {}
+
+        return self._entries
+
+    def __contains__(self, key: str) -> bool:
+        """Return True if key has a negative result which has not expired."""
+        with self._lock:
+            expires = self._load().get(key)
+
+        return expires is not None and expires > time.time()
+
+    def add(self, key: str, ttl: Optional[float] = None) -> None:
+        """Record a negative result for ttl seconds. Defaults to the cache ttl."""
+        expires = time.time() + (self.ttl if ttl is None else ttl)
+
+        with self._lock:
+            self._load()[key] = expires
+            self._dirty = True
+
+    def discard(self, key: str) -> None:
+        """Forget the negative result of key, for example after data was found."""
+        with self._lock:
+            if self._load().pop(key, None) is not None:
+                self._dirty = True
+
+    def clear(self) -> None:
+        """Forget every negative result."""
+        with self._lock:
+            self._entries = {}
+            self._dirty = True
+
+    def flush(self) -> None:
+        """Save the cache if it has a path and changed since it was loaded.
+
+        Expired entries are dropped. The file is replaced atomically.
+        """
+        with self._lock:
+            if self.path is None or not self._dirty:
+                return
+
+            now = time.time()
+            self._entries = {
+                key: expires for key, expires in self._load().items() if expires > now
+            }
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temporary = self.path.with_suffix(f".{os.getpid()}.tmp")
+            temporary.write_text(json.dumps({"entries": self._entries}))
+            os.replace(temporary, self.path)
+            self._dirty = False
+
+    def __len__(self) -> int:
+        """Return the number of negative results which have not expired."""
+        now = time.time()
+
+        with self._lock:
+            return sum(expires > now for expires in self._load().values())
+
+
+default_negative_cache = NegativeCache(NEGATIVE_CACHE_PATH or None)
+"""* Cache used when use_negative_cache is True and no cache is passed."""
+
+atexit.register(default_negative_cache.flush)
@@ -0,0 +1,241 @@
+"""Strike and expiration index of option chains.
+
+The index sorts the expirations of a MultipleOptionChains once and, per expiration and
+contract type, sorts the strikes into a numpy array. Queries find the matching
+expirations and strike ranges with binary search (numpy.searchsorted) instead of
+checking every contract.
+
+```python
+chains = get_options_page("aapl")
+
+# calls with a strike within 5% of the spot price expiring in 20 to 45 days
+calls = chains.query(contract_type="call", spot=117.5, moneyness=0.05, min_days=20, max_days=45)
+```
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import pendulum
+from pendulum.datetime import DateTime
+
+from .options import OptionContract, OptionContractType, OptionsChain
+
+SECONDS_PER_DAY = 86_400
+
+
+class StrikeIndex:
+    """Contracts of one expiration and contract type sorted by strike.
+
+    Attributes:
+        strikes (numpy.ndarray): Sorted strikes. Missing strikes are nan and sort last.
+        contracts (numpy.ndarray): Contracts in strike order.
+        in_the_money (numpy.ndarray): Boolean in the money mask in strike order.
+    """
+
+    __slots__ = ("strikes", "contracts", "in_the_money")
+
+    def __init__(self, contracts: List[OptionContract]) -> None:
+        """Sort contracts by strike."""
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
+        strikes = np.array(
+            [np.nan if contract.strike is None else contract.strike for contract in contracts],
+            dtype="float64",
+        )
+        order = np.argsort(strikes, kind="stable")
+
+        self.strikes = strikes[order]
+        self.contracts = np.empty(len(contracts), dtype=object)
+        self.contracts[:] = contracts
+        self.contracts = self.contracts[order]
+        self.in_the_money = np.array(
+            [contract.in_the_money for contract in contracts], dtype=bool
+        )[order]
+
+    def strike_range(
+        self, min_strike: Optional[float] = None, max_strike: Optional[float] = None
+    ) -> slice:
+        """Return the slice of contracts with min_strike <= strike <= max_strike."""
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
+        start = 0 if min_strike is None else np.searchsorted(self.strikes, min_strike, "left")
+        stop = (
+            len(self.strikes)
+            if max_strike is None
+            else np.searchsorted(self.strikes, max_strike, "right")
+        )
+        return slice(int(start), int(stop))
+
+    def select(
+        self,
+        min_strike: Optional[float] = None,
+        max_strike: Optional[float] = None,
+        in_the_money: Optional[bool] = None,
+    ) -> List[OptionContract]:
+        """Return the contracts within the strike range, optionally only (not) in the money."""
+        window = self.strike_range(min_strike, max_strike)
+        contracts = self.contracts[window]
+
+        if in_the_money is not None:
+            contracts = contracts[self.in_the_money[window] == in_the_money]
+
+        return list(contracts)
+
+    def __len__(self) -> int:
+        """Return the number of contracts."""
+        return len(self.strikes)
+
+
+class OptionChainIndex:
+    """Expiration and strike index over option chains.
+
+    Attributes:
+        chains (List[OptionsChain]): The indexed chains in their original order.
+        expirations (numpy.ndarray): Sorted expiration dates as unix timestamps.
+        positions (numpy.ndarray): Position in chains of every sorted expiration.
+        strike_indexes (List[Dict[OptionContractType, StrikeIndex]]): Strike index per
+            contract type, aligned with chains.
+    """
+
+    def __init__(self, chains: Iterable[OptionsChain]) -> None:
+        """Build the index. Chains are not copied, so rebuild it after changing them."""
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
+        self.chains = list(chains)
+        expirations = np.array(
+            [chain.expiration_date.int_timestamp for chain in self.chains], dtype="int64"
+        )
+        self.positions = np.argsort(expirations, kind="stable")
+        self.expirations = expirations[self.positions]
+        self.strike_indexes: List[Dict[OptionContractType, StrikeIndex]] = []
+
+        for chain in self.chains:
+            by_type: Dict[OptionContractType, List[OptionContract]] = {
+                OptionContractType.CALL: [],
+                OptionContractType.PUT: [],
+            }
+
+            for contract in chain.chain:
+                by_type[OptionContractType(contract.contract_type)].append(contract)
+
+            self.strike_indexes.append(
+                {
+                    contract_type: StrikeIndex(contracts)
+                    for contract_type, contracts in by_type.items()
+                }
+            )
+
+    def expiration_range(
+        self,
+        min_days: Optional[float] = None,
+        max_days: Optional[float] = None,
+        at: Optional[DateTime] = None,
+    ) -> slice:
+        """Return the slice of expirations between min_days and max_days after at.
+
+        Args:
+            min_days (float): Minimum days until expiration. Inclusive.
+            max_days (float): Maximum days until expiration. Inclusive.
+            at (DateTime): Start of the window. Defaults to now.
+        """
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
+        if min_days is None and max_days is None:
+            return slice(0, len(self.expirations))
+
+        start = (at or pendulum.now("UTC")).int_timestamp
+        low = 0 if min_days is None else start + min_days * SECONDS_PER_DAY
+        high = None if max_days is None else start + max_days * SECONDS_PER_DAY
+
+        first = np.searchsorted(self.expirations, low, "left")
+        last = (
+            len(self.expirations)
+            if high is None
+            else np.searchsorted(self.expirations, high, "right")
+        )
+        return slice(int(first), int(last))
+
+    def query(  # pylint: disable=too-many-arguments
+        self,
+        contract_type: Optional[Union[OptionContractType, str]] = None,
+        min_strike: Optional[float] = None,
+        max_strike: Optional[float] = None,
+        spot: Optional[float] = None,
+        moneyness: Optional[float] = None,
+        in_the_money: Optional[bool] = None,
+        min_days: Optional[float] = None,
+        max_days: Optional[float] = None,
+        at: Optional[DateTime] = None,
+        keep_empty: bool = False,
+    ) -> List[OptionsChain]:
+        """Return the chains with only the contracts matching every filter.
+
+        Chains keep their original order. Chains without matching contracts are left
+        out unless keep_empty is True.
+
+        Args:
+            contract_type (OptionContractType): Only calls or only puts. Both when None.
+            min_strike (float): Minimum strike. Inclusive.
+            max_strike (float): Maximum strike. Inclusive.
+            spot (float): Price of the underlying, used with moneyness.
+            moneyness (float): Only strikes within this fraction of spot. Example: 0.05
+                keeps strikes between 95% and 105% of spot. Combined with min_strike and
+                max_strike the narrower bound wins.
+            in_the_money (bool): Only contracts which are (True) or are not (False) in
+                the money.
+            min_days (float): Minimum days until expiration.
+            max_days (float): Maximum days until expiration.
+            at (DateTime): Start of the expiration window. Defaults to now.
+            keep_empty (bool): Keep the chains within the expiration window which have
+                no matching contracts.
+        """
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
+        min_strike, max_strike = _strike_bounds(min_strike, max_strike, spot, moneyness)
+        types = (
+            list(OptionContractType)
+            if contract_type is None
+            else [OptionContractType(contract_type)]
+        )
+        chains = []
+        window = self.expiration_range(min_days, max_days, at)
+
+        for position in np.sort(self.positions[window]):
+            chain, strike_indexes = self.chains[position], self.strike_indexes[position]
+            contracts = []
+
+            for type_ in types:
+                contracts.extend(
+                    strike_indexes[type_].select(min_strike, max_strike, in_the_money)
+                )
+
+            if contracts or keep_empty:
+                chains.append(
+                    OptionsChain.construct(
+                        symbol=chain.symbol, expiration_date=chain.expiration_date, chain=contracts
+                    )
+                )
+
+        return chains
+
+    def __len__(self) -> int:
+        """Return the number of indexed contracts."""
+        return sum(len(index) for indexes in self.strike_indexes for index in indexes.values())
+
+
+def _strike_bounds(
+    min_strike: Optional[float],
+    max_strike: Optional[float],
+    spot: Optional[float],
+    moneyness: Optional[float],
+) -> Tuple[Optional[float], Optional[float]]:
+    if moneyness is None:
+        return min_strike, max_strike
+
+    if spot is None:
+        raise ValueError("spot is required to filter by moneyness.")
+
+    low, high = spot * (1 - moneyness), spot * (1 + moneyness)
+    min_strike = low if min_strike is None else max(min_strike, low)
+    max_strike = high if max_strike is None else min(max_strike, high)
+    return min_strike, max_strike
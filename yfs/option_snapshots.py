@@ -0,0 +1,339 @@
+"""Snapshots of option chains and the deltas between them.
+
+An OptionSnapshotStore keeps the latest state of every contract keyed by
+(symbol, expiration timestamp, contract name). Updating it with a freshly downloaded
+OptionsChain compares the tracked values of all contracts at once with numpy and
+returns a ChainDelta holding only the added, removed and changed contracts. Deltas
+can be applied to another store to reconstruct the same state, for example on a
+consumer which only receives deltas.
+
+```python
+store = OptionSnapshotStore()
+
+while True:
+    chains = get_options_page("aapl", before_days=30)
+
+    for delta in store.update_many(chains):
+        if delta:
+            publish(delta.json())
+```
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING, Union
+
+import pendulum
+from pendulum.datetime import DateTime
+from pydantic import BaseModel as Base
+from pydantic import validator
+
+from .options import MultipleOptionChains, OptionContract, OptionsChain
+
+if TYPE_CHECKING:
+    import numpy
+
+TRACKED_FIELDS = (
+    "last_price",
+    "bid",
+    "ask",
+    "change",
+    "percent_change",
+    "volume",
+    "open_interest",
+    "implied_volatility",
+    "in_the_money",
+)
+"""* OptionContract fields compared between snapshots."""
+
+_INTEGER_FIELDS = ("volume", "open_interest")
+_BOOLEAN_FIELDS = ("in_the_money",)
+
+SnapshotKey = Tuple[str, str]
+
+
+class ChainDelta(Base):
+    """The difference between two snapshots of an option chain.
+
+    Attributes:
+        symbol (str): Ticker symbol.
+        timestamp (str): Expiration timestamp of the chain.
+        expiration_date (DateTime): Expiration date of the chain.
+        added (List[OptionContract]): Contracts which were not in the previous snapshot.
+        removed (List[str]): Names of contracts which are no longer in the chain.
+        changed (Dict[str, Dict[str, Optional[float]]]): New values of the changed
+            tracked fields by contract name. Only the fields which changed are included.
+
+    Notes:
+        This class inherits from the pydantic BaseModel which allows for the use
+        of .json() and .dict() for serialization to json strings and dictionaries.
+
+        .json(): Serialize to a JSON object.
+        .dict(): Serialize to a dictionary.
+    """
+
+    symbol: str
+    timestamp: str
+    expiration_date: DateTime
+    added: List[OptionContract] = []
+    removed: List[str] = []
+    changed: Dict[str, Dict[str, Optional[float]]] = {}
+
+    @validator("added", pre=True)
+    def construct_added(  # pylint: disable=E0213,R0201
+        cls, values: List[Union[OptionContract, dict]]
+    ) -> List[OptionContract]:
+        """Build already cleaned contracts, for example from .json(), without the cleaners."""
+        contracts = []
+
+        for value in values:
+            if isinstance(value, dict):
+                value = OptionContract.construct(
+                    **{**value, "expiration_date": pendulum.parse(str(value["expiration_date"]))}
+                )
+            contracts.append(value)
+
+        return contracts
+
+    @property
+    def key(self) -> SnapshotKey:
+        """The (symbol, timestamp) key of the chain."""
+        return self.symbol, self.timestamp
+
+    def __len__(self) -> int:
+        """Return the number of added, removed and changed contracts."""
+        return len(self.added) + len(self.removed) + len(self.changed)
+
+
+class _ChainSnapshot:
+    """Column arrays of one option chain sorted by contract name."""
+
+    __slots__ = ("symbol", "timestamp", "expiration_date", "names", "types", "strikes", "values")
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        symbol: str,
+        timestamp: str,
+        expiration_date: DateTime,
+        names: "numpy.ndarray",
+        types: "numpy.ndarray",
+        strikes: "numpy.ndarray",
+        values: "numpy.ndarray",
+    ) -> None:
+        self.symbol = symbol
+        self.timestamp = timestamp
+        self.expiration_date = expiration_date
+        self.names = names
+        self.types = types
+        self.strikes = strikes
+        self.values = values
+
+    @classmethod
+    def from_contracts(
+        cls,
+        symbol: str,
+        timestamp: str,
+        expiration_date: DateTime,
+        contracts: List[OptionContract],
+    ) -> "_ChainSnapshot":
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
+        names = np.array([contract.contract_name for contract in contracts], dtype=object)
+        order = np.argsort(names, kind="stable")
+
+        return cls(
+            symbol,
+            timestamp,
+            expiration_date,
+            names[order],
+            np.array([contract.contract_type for contract in contracts], dtype=object)[order],
+            np.array([contract.strike for contract in contracts], dtype="float64")[order],
+            _value_matrix(contracts)[order],
+        )
+
+    def contracts(self) -> List[OptionContract]:
+        """Rebuild the OptionContracts without running the validators again."""
+        contracts = []
+
+        for name, type_, strike, row in zip(self.names, self.types, self.strikes, self.values):
+            data = {field: _to_python(field, value) for field, value in zip(TRACKED_FIELDS, row)}
+            contracts.append(
+                OptionContract.construct(
+                    symbol=self.symbol,
+                    contract_type=type_,
+                    timestamp=self.timestamp,
+                    expiration_date=self.expiration_date,
+                    contract_name=name,
+                    strike=_to_python("strike", strike),
+                    **data,
+                )
+            )
+
+        return contracts
+
+
+def _value_matrix(contracts: List[OptionContract]) -> "numpy.ndarray":
+    """Return the tracked values of the contracts as a float matrix. None becomes nan."""
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    rows = [[getattr(contract, field) for field in TRACKED_FIELDS] for contract in contracts]
+    return np.array(rows, dtype="float64").reshape(len(contracts), len(TRACKED_FIELDS))
+
+
+def _to_python(field: str, value: float) -> Optional[Union[bool, float, int]]:
+    if value != value:  # nan  # pylint: disable=comparison-with-itself
+        return None
+
+    if field in _INTEGER_FIELDS:
+        return int(value)
+
+    if field in _BOOLEAN_FIELDS:
+        return bool(value)
+
+    return float(value)
+
+
+def _changed_cells(old: "numpy.ndarray", new: "numpy.ndarray") -> "numpy.ndarray":
+    """Return a boolean mask of the cells which differ. nan equals nan."""
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    return ~((old == new) | (np.isnan(old) & np.isnan(new)))
+
+
+class OptionSnapshotStore:
+    """Latest state of option chains with vectorized delta computation.
+
+    Attributes:
+        snapshots (Dict[Tuple[str, str], _ChainSnapshot]): Snapshots by
+            (symbol, expiration timestamp).
+    """
+
+    def __init__(self) -> None:
+        """Create an empty store."""
+        self.snapshots: Dict[SnapshotKey, _ChainSnapshot] = {}
+
+    def _diff(self, chain: OptionsChain) -> Tuple[ChainDelta, _ChainSnapshot]:
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
+        if not chain.chain:
+            raise ValueError("Can not snapshot an empty option chain.")
+
+        timestamp = chain.chain[0].timestamp
+        new = _ChainSnapshot.from_contracts(
+            chain.symbol, timestamp, chain.expiration_date, chain.chain
+        )
+        delta = ChainDelta(
+            symbol=chain.symbol, timestamp=timestamp, expiration_date=chain.expiration_date
+        )
+        old = self.snapshots.get(delta.key)
+
+        if old is None:
+            delta.added = list(chain.chain)
+            return delta, new
+
+        _, old_index, new_index = np.intersect1d(
+            old.names, new.names, assume_unique=True, return_indices=True
+        )
+        changed = _changed_cells(old.values[old_index], new.values[new_index])
+
+        for row in np.flatnonzero(changed.any(axis=1)):
+            index = new_index[row]
+            delta.changed[new.names[index]] = {
+                TRACKED_FIELDS[column]: _to_python(
+                    TRACKED_FIELDS[column], new.values[index, column]
+                )
+                for column in np.flatnonzero(changed[row])
+            }
+
+        added = set(new.names[np.isin(new.names, old.names, invert=True)])
+        delta.added = [contract for contract in chain.chain if contract.contract_name in added]
+        delta.removed = list(old.names[np.isin(old.names, new.names, invert=True)])
+        return delta, new
+
+    def diff(self, chain: OptionsChain) -> ChainDelta:
+        """Return the delta between the stored snapshot and chain without storing chain.
+
+        All contracts are added when the chain has no snapshot yet.
+
+        Raises:
+            ValueError: If the chain has no contracts.
+        """
+        delta, _ = self._diff(chain)
+        return delta
+
+    def update(self, chain: OptionsChain) -> ChainDelta:
+        """Store chain as the latest snapshot and return the delta to the previous one."""
+        delta, snapshot = self._diff(chain)
+        self.snapshots[delta.key] = snapshot
+        return delta
+
+    def update_many(
+        self, chains: Union[MultipleOptionChains, Iterable[OptionsChain]]
+    ) -> List[ChainDelta]:
+        """Update the store with every chain. Empty chains are skipped."""
+        return [self.update(chain) for chain in chains if chain.chain]
+
+    def apply(self, delta: ChainDelta) -> None:
+        """Apply a delta, for example one received from another store.
+
+        Raises:
+            ValueError: When the delta changes a contract which is not stored, for
+                example a delta built against a different snapshot. The store is not
+                changed.
+        """
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
+        old = self.snapshots.get(delta.key)
+        snapshot = _ChainSnapshot.from_contracts(
+            delta.symbol, delta.timestamp, delta.expiration_date, delta.added
+        )
+
+        if old is not None:
+            keep = np.isin(old.names, delta.removed, invert=True)
+            names = np.concatenate([old.names[keep], snapshot.names])
+            order = np.argsort(names, kind="stable")
+            snapshot = _ChainSnapshot(
+                delta.symbol,
+                delta.timestamp,
+                delta.expiration_date,
+                names[order],
+                np.concatenate([old.types[keep], snapshot.types])[order],
+                np.concatenate([old.strikes[keep], snapshot.strikes])[order],
+                np.concatenate([old.values[keep], snapshot.values])[order],
+            )
+
+        if delta.changed:
+            keys = np.array(list(delta.changed), dtype=snapshot.names.dtype)
+            rows = np.searchsorted(snapshot.names, keys)
+            found = np.minimum(rows, max(len(snapshot.names) - 1, 0))
+            known = rows < len(snapshot.names)
+            known[known] = snapshot.names[found[known]] == keys[known]
+
+            if not known.all():
+                unknown = ", ".join(keys[~known])
+                raise ValueError(f"Delta changes contracts which are not stored: {unknown}.")
+
+            for row, values in zip(rows, delta.changed.values()):
+                for field, value in values.items():
+                    snapshot.values[row, TRACKED_FIELDS.index(field)] = (
+                        np.nan if value is None else value
+                    )
+
+        self.snapshots[delta.key] = snapshot
+
+    def chain(self, symbol: str, timestamp: str) -> Optional[OptionsChain]:
+        """Rebuild the stored OptionsChain of a symbol and expiration timestamp."""
+        snapshot = self.snapshots.get((symbol, timestamp))
+
+        if snapshot is None:
+            return None
+
+        return OptionsChain.construct(
+            symbol=symbol, expiration_date=snapshot.expiration_date, chain=snapshot.contracts()
+        )
+
+    def keys(self) -> List[SnapshotKey]:
+        """Return the (symbol, expiration timestamp) keys of the stored chains."""
+        return list(self.snapshots)
+
+    def __len__(self) -> int:
+        """Return the number of stored contracts."""
+        return sum(len(snapshot.names) for snapshot in self.snapshots.values())
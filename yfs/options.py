@@ -1,20 +1,38 @@
 """Contains the classes and functions for scraping a yahoo finance option page."""
 
 from enum import Enum
+from functools import partial
 from itertools import cycle
-from typing import Iterable, List, Optional, Tuple, Union
+import threading
+from time import monotonic
+from typing import Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING, Union
 
-import pandas
-from pandas import DataFrame
+from decouple import config
 import pendulum
 from pendulum.datetime import DateTime
 from pydantic import BaseModel as Base
-from pydantic import Field, validator
-from requests_html import HTML
+from pydantic import Field, PrivateAttr, validator
 
 from .cleaner import cleaner, CommonCleaners, field_cleaner
+from .columns import ColumnBuffer
+from .document import as_node, element_text, parse_html, select, select_first
 from .lookup import fuzzy_search
+from .metrics import Stage, timer
+from .page_cache import PageCache, parse_cached
+from .profiling import profiled
 from .requestor import requestor
+from .urls import options_page_url
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+    from requests import Response
+    from requests_html import HTML
+
+    from .option_index import OptionChainIndex
+    from .records import OptionChainRecordGroup, OptionsChainRecord
+
+EXPIRATION_CACHE_TTL = config("YFS_EXPIRATION_CACHE_TTL", default=300.0, cast=float)
+"""* Seconds the expiration list of a symbol is reused by get_options_page."""
 
 
 class ContractExpiration(Base):
@@ -249,6 +267,11 @@ class OptionContract(Base):
         use_enum_values = True
 
 
+def option_contract_columns() -> ColumnBuffer:
+    """Create an empty column buffer for OptionContract objects."""
+    return ColumnBuffer.from_models([(None, OptionContract)])
+
+
 class OptionsChain(Base):
     """Chain of option contracts with the same expiration date.
 
@@ -270,8 +293,10 @@ class OptionsChain(Base):
     chain: List[OptionContract]
 
     @property
-    def dataframe(self) -> DataFrame:
+    def dataframe(self) -> "DataFrame":
         """Return a dataframe of the option chain."""
+        from pandas import DataFrame  # pylint: disable=import-outside-toplevel
+
         data = self.dict()
         chain_data = data["chain"]
         dataframe = DataFrame.from_dict(chain_data)
@@ -283,7 +308,7 @@ class OptionsChain(Base):
         call_chain = list(
             filter(lambda contract: contract.contract_type == OptionContractType.CALL, self.chain)
         )
-        return OptionsChain(
+        return OptionsChain.construct(
             symbol=self.symbol, expiration_date=self.expiration_date, chain=call_chain
         )
 
@@ -293,7 +318,7 @@ class OptionsChain(Base):
         put_chain = list(
             filter(lambda contract: contract.contract_type == OptionContractType.PUT, self.chain)
         )
-        return OptionsChain(
+        return OptionsChain.construct(
             symbol=self.symbol, expiration_date=self.expiration_date, chain=put_chain
         )
 
@@ -320,9 +345,58 @@ class MultipleOptionChains(Base):
     option_chain_list: List[OptionsChain]
     contract_expiration_list: ContractExpirationList
 
+    _index: Optional["OptionChainIndex"] = PrivateAttr(default=None)
+    _index_key: Optional[Tuple] = PrivateAttr(default=None)
+
+    def _chains_key(self) -> Tuple:
+        """Identity and size of every chain, which changes when the chains are changed."""
+        return tuple((id(chain), len(chain.chain)) for chain in self.option_chain_list)
+
+    @property
+    def index(self) -> "OptionChainIndex":
+        """Strike and expiration index of the chains.
+
+        Built on first use and rebuilt when a chain is added, removed, replaced or
+        gains or loses contracts. Call reindex() after changing a contract in place.
+        """
+        if self._index is None or self._index_key != self._chains_key():
+            self.reindex()
+        return self._index
+
+    def reindex(self) -> "OptionChainIndex":
+        """Rebuild the strike and expiration index."""
+        from .option_index import OptionChainIndex  # pylint: disable=import-outside-toplevel
+
+        self._index = OptionChainIndex(self.option_chain_list)
+        self._index_key = self._chains_key()
+        return self._index
+
+    def query(self, **filters) -> "MultipleOptionChains":  # noqa: ANN003
+        """Return the contracts matching the filters using the strike and expiration index.
+
+        Example:
+        ```python
+        chains.query(contract_type="call", spot=117.5, moneyness=0.05, min_days=20, max_days=45)
+        ```
+
+        Args:
+            **filters: contract_type, min_strike, max_strike, spot, moneyness,
+                in_the_money, min_days, max_days, at and keep_empty. See
+                OptionChainIndex.query.
+
+        Returns:
+            MultipleOptionChains: Only chains with matching contracts.
+        """
+        return MultipleOptionChains.construct(
+            option_chain_list=self.index.query(**filters),
+            contract_expiration_list=self.contract_expiration_list,
+        )
+
     @property
-    def dataframe(self) -> DataFrame:
+    def dataframe(self) -> "DataFrame":
         """Return a dataframe of multiple option chains."""
+        import pandas  # pylint: disable=import-outside-toplevel
+
         if len(self.option_chain_list) == 1:
             return self.option_chain_list[0].dataframe
 
@@ -337,7 +411,7 @@ class MultipleOptionChains(Base):
     def calls(self) -> "MultipleOptionChains":
         """Return a MultipleOptionChains object with only call contracts."""
         calls = [chain.calls for chain in self]
-        return MultipleOptionChains(
+        return MultipleOptionChains.construct(
             option_chain_list=calls, contract_expiration_list=self.contract_expiration_list
         )
 
@@ -345,7 +419,7 @@ class MultipleOptionChains(Base):
     def puts(self) -> "MultipleOptionChains":
         """Return a MultipleOptionChains object with only put contracts."""
         puts = [chain.puts for chain in self]
-        return MultipleOptionChains(
+        return MultipleOptionChains.construct(
             option_chain_list=puts, contract_expiration_list=self.contract_expiration_list
         )
 
@@ -371,22 +445,35 @@ class MultipleOptionChains(Base):
         return None  # NOTE: Maybe Should Raise here
 
 
-def get_table_elements(html: HTML) -> Tuple[Optional[HTML], Optional[HTML]]:
+def get_table_elements(html: "HTML") -> Tuple[Optional["HTML"], Optional["HTML"]]:
     """Parse call and put HTML table elements.
 
     Args:
-        html (HTML): HTML element with call and put data.
+        html (HTML): "HTML" element with call and put data.
 
     Returns:
         Tuple of found call and put html elements.
     """
-    calls_table = html.find("table.calls", first=True)
-    puts_table = html.find("table.puts", first=True)
-    return calls_table, puts_table
+    from requests_html import Element  # pylint: disable=import-outside-toplevel
+
+    tables = []
+
+    for selector in ("table.calls", "table.puts"):
+        table = select_first(html, selector)
+        tables.append(
+            None
+            if table is None
+            else Element(element=table, url=html.url, default_encoding=html.encoding)
+        )
 
+    return tables[0], tables[1]
 
+
+@profiled
 def parse_option_table(
-    contract_expiration: ContractExpiration, contract_type: OptionContractType, options_table: HTML
+    contract_expiration: ContractExpiration,
+    contract_type: OptionContractType,
+    options_table: "HTML",
 ) -> List[OptionContract]:
     """Parse and clean fields and rows of a options table HTML element.
 
@@ -394,69 +481,216 @@ def parse_option_table(
         contract_expiration (ContractExpiration): Used to pass ContractExpiration data
             to the returned OptionContract object.
         contract_type (OptionContractType): Call or Put
-        options_table (HTML): HTML element with raw options table data.
+        options_table (HTML): "HTML" element with raw options table data.
 
     Returns:
         A list of OptionContracts parsed from the html options_table.
     """
-    head = options_table.find("thead", first=True)
-    body = options_table.find("tbody", first=True)
+    with timer(Stage.CLEAN, page="options"):
+        table = as_node(options_table)
+        head = select_first(table, "thead")
+        body = select_first(table, "tbody")
 
-    headers = cycle(head.text.split("\n"))
+        headers = cycle(element_text(head).split("\n"))
 
-    contracts = []
+        expiration = contract_expiration.dict()
+        rows = []
 
-    for row in body.find("tr"):
-        data = contract_expiration.dict()
-        data["contract_type"] = contract_type
+        for row in select(body, "tr"):
+            data = dict(expiration)
+            data["contract_type"] = contract_type
 
-        if "in-the-money" in row.attrs["class"]:
-            data["in_the_money"] = True
-        else:
-            data["in_the_money"] = False
+            if "in-the-money" in row.get("class", "").split():
+                data["in_the_money"] = True
+            else:
+                data["in_the_money"] = False
 
-        for value in row.text.split("\n"):
-            column_name = field_cleaner(next(headers))
-            data[column_name] = value
+            for value in element_text(row).split("\n"):
+                column_name = field_cleaner(next(headers))
+                data[column_name] = value
 
-        contracts.append(OptionContract(**data))
+            rows.append(data)
 
-    return contracts
+    with timer(Stage.MODEL, page="options"):
+        return [OptionContract(**data) for data in rows]
 
 
-def get_option_expirations(
-    symbol: str, **kwargs  # noqa: ANN003
-) -> Optional[ContractExpirationList]:
-    """Get and parse option expiration data for the selected symbol.
+class ExpirationCache:
+    """Expiration timestamps per symbol which are reused for ttl seconds.
+
+    Attributes:
+        ttl (float): Seconds an expiration list is reused.
+    """
+
+    def __init__(self, ttl: float = EXPIRATION_CACHE_TTL) -> None:
+        """Create an empty cache."""
+        self.ttl = ttl
+        self._entries: Dict[str, Tuple[float, List[str]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, symbol: str) -> Optional[ContractExpirationList]:
+        """Return a new expiration list of symbol or None if it is missing or expired."""
+        with self._lock:
+            entry = self._entries.get(symbol.upper())
+
+        if entry is None or monotonic() - entry[0] > self.ttl:
+            return None
+
+        return ContractExpirationList(
+            expiration_list=[
+                ContractExpiration(symbol=symbol, timestamp=timestamp) for timestamp in entry[1]
+            ]
+        )
+
+    def set(self, symbol: str, expirations: ContractExpirationList) -> None:
+        """Cache the expiration timestamps of symbol."""
+        timestamps = [expiration.timestamp for expiration in expirations]
+
+        with self._lock:
+            self._entries[symbol.upper()] = (monotonic(), timestamps)
+
+    def clear(self, symbol: Optional[str] = None) -> None:
+        """Forget the expirations of symbol, or of every symbol when None."""
+        with self._lock:
+            if symbol is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(symbol.upper(), None)
+
+
+expiration_cache = ExpirationCache()
+"""* Cache used by get_option_expirations and get_options_page."""
+
+
+EXPIRATIONS_SELECTOR = r"div.Fl\(start\).Pend\(18px\)"
+"""* CSS selector of the element containing the expiration options of an options page."""
+
+
+def parse_option_expirations(symbol: str, html: "HTML") -> Optional[ContractExpirationList]:
+    """Parse the expiration list of an options page.
 
     Args:
         symbol (str): Ticker symbol.
-        kwargs: Pass (session, proxies, and timeout) to the requestor function.
+        html (HTML): An options page.
 
     Returns:
-        ContractExpirationList
+        ContractExpirationList: If the expiration list is found.
+        None: If the expiration list is not found.
     """
-    url = f"https://finance.yahoo.com/quote/{symbol}/options?p={symbol}"
+    elements = select_first(html, EXPIRATIONS_SELECTOR)
+
+    if elements is not None:
+
+        timestamps = [element.get("value") for element in select(html, "option", elements)]
+
+        expiration_list = [
+            ContractExpiration(symbol=symbol, timestamp=timestamp) for timestamp in timestamps
+        ]
+
+        return ContractExpirationList(expiration_list=expiration_list)
+
+    return None
+
+
+def parse_selected_expiration(html: "HTML") -> Optional[str]:
+    """Return the timestamp of the expiration whose chain is shown on an options page."""
+    selected = select_first(html, EXPIRATIONS_SELECTOR + " option[selected]")
+
+    if selected is None:
+        return None
+
+    return selected.get("value")
+
+
+def parse_options_chain(expiration: ContractExpiration, html: "HTML") -> Optional[OptionsChain]:
+    """Parse the chain of an options page.
+
+    Args:
+        expiration (ContractExpiration): The expiration shown on the page.
+        html (HTML): An options page.
+
+    Returns:
+        OptionsChain: If the call and put tables are found.
+        None: If either table is not found.
+    """
+    calls_table, puts_table = get_table_elements(html)
+
+    if calls_table is None or puts_table is None:
+        return None
+
+    calls = parse_option_table(expiration, "call", calls_table)
+    puts = parse_option_table(expiration, "put", puts_table)
+
+    with timer(Stage.MODEL, page="options"):
+        return OptionsChain(
+            symbol=expiration.symbol,
+            expiration_date=expiration.expiration_date,
+            chain=calls + puts,
+        )
+
+
+def _parse_options_response(
+    expiration: ContractExpiration, response: "Response", url: str
+) -> Optional[OptionsChain]:
+    """Parse the chain of a dated options page response."""
+    return parse_options_chain(expiration, parse_html(response.text, url, page="options"))
+
+
+def _get_expiration_page(
+    symbol: str,
+    use_cache: bool,
+    cache: Optional[ExpirationCache] = None,
+    **kwargs,  # noqa: ANN003
+) -> Tuple[Optional[ContractExpirationList], Optional["HTML"]]:
+    """Get the expiration list of symbol from the cache or the undated options page.
+
+    Returns:
+        The expiration list and, if it was downloaded, the undated options page.
+    """
+    cache = expiration_cache if cache is None else cache
+
+    if use_cache:
+        expirations = cache.get(symbol)
+
+        if expirations is not None:
+            return expirations, None
+
+    url = options_page_url(symbol)
 
     response = requestor(url, **kwargs)
 
-    if response.ok:
+    if not response.ok:
+        return None, None
 
-        html = HTML(html=response.text, url=url)
+    html = parse_html(response.text, url, page="options")
+    expirations = parse_option_expirations(symbol, html)
 
-        elements = html.find(r"div.Fl\(start\).Pend\(18px\)", first=True)
+    if expirations is not None:
+        cache.set(symbol, expirations)
 
-        if elements:
+    return expirations, html
 
-            timestamps = [element.attrs["value"] for element in elements.find("option")]
 
-            expiration_list = [
-                ContractExpiration(symbol=symbol, timestamp=timestamp) for timestamp in timestamps
-            ]
+def get_option_expirations(
+    symbol: str,
+    use_cache: bool = True,
+    cache: Optional[ExpirationCache] = None,
+    **kwargs,  # noqa: ANN003
+) -> Optional[ContractExpirationList]:
+    """Get and parse option expiration data for the selected symbol.
 
-            return ContractExpirationList(expiration_list=expiration_list)
+    Args:
+        symbol (str): Ticker symbol.
+        use_cache (bool): If True, reuse expirations downloaded within the last
+            EXPIRATION_CACHE_TTL seconds.
+        cache (ExpirationCache): Cache to use instead of the module expiration_cache.
+        kwargs: Pass (session, proxies, and timeout) to the requestor function.
 
-    return None
+    Returns:
+        ContractExpirationList
+    """
+    expirations, _ = _get_expiration_page(symbol, use_cache, cache, **kwargs)
+    return expirations
 
 
 class OptionPageNotFound(AttributeError):
@@ -470,8 +704,14 @@ def get_options_page(  # pylint: disable=R0913, R0914
     first_chain: bool = False,
     use_fuzzy_search: bool = True,
     page_not_found_ok: bool = False,
+    use_cache: bool = True,
+    cache: Optional[ExpirationCache] = None,
+    page_cache: Optional[PageCache] = None,
+    compact: bool = False,
     **kwargs,  # noqa: ANN003
-) -> Optional[Union[OptionsChain, MultipleOptionChains]]:
+) -> Optional[
+    Union[OptionsChain, MultipleOptionChains, "OptionsChainRecord", "OptionChainRecordGroup"]
+]:
     """Get options data from yahoo finance options page.
 
     Args:
@@ -485,6 +725,15 @@ def get_options_page(  # pylint: disable=R0913, R0914
         use_fuzzy_search (bool): If True, does a symbol lookup validation prior
             to requesting options page data.
         page_not_found_ok (bool): If True, returns None when page is not found.
+        use_cache (bool): If True, reuse expirations downloaded within the last
+            EXPIRATION_CACHE_TTL seconds instead of downloading the undated options page.
+        cache (ExpirationCache): Cache to use instead of the module expiration_cache.
+        page_cache (PageCache): If set, an unchanged dated options page returns the
+            chain parsed last time instead of being parsed again. The undated page
+            is always parsed since its expirations are read from it.
+        compact (bool): If True chains are stored as slotted records to reduce memory
+            usage. An OptionsChainRecord or a yfs.records.OptionChainRecordGroup is
+            returned instead of an OptionsChain or a MultipleOptionChains.
         **kwargs: Pass (session, proxies, and timeout) to the requestor function.
 
     Returns:
@@ -495,23 +744,32 @@ def get_options_page(  # pylint: disable=R0913, R0914
             the after_days and before_days range are returned. This can have
             multiple expirations. Even if one expiration date is found
             the MultipleOptionChains object is returned.
+        OptionsChainRecord: If first_chain and compact are set to True.
+        OptionChainRecordGroup: If first_chain is set to False and compact to True.
         None: If no contracts are found and page_not_found_ok is True.
 
     Raises:
         OptionPageNotFound: If page_not_found_ok is False and the Options page is not found.
 
     """
+    if compact:
+        # pylint: disable=import-outside-toplevel
+        from .records import OptionChainRecordGroup, OptionsChainRecord
+
     if use_fuzzy_search:
         fuzzy_response = fuzzy_search(symbol, first_ticker=True, **kwargs)
 
         if fuzzy_response:
             symbol = fuzzy_response.symbol
 
-    expirations_list = get_option_expirations(symbol, **kwargs)
+    expirations_list, expiration_page = _get_expiration_page(symbol, use_cache, cache, **kwargs)
 
     if expirations_list is None:
         return None
 
+    # The undated page already shows the chain of its selected expiration.
+    selected = None if expiration_page is None else parse_selected_expiration(expiration_page)
+
     if after_days or before_days:
         expirations_list.filter_expirations_between_days(
             after_days=after_days, before_days=before_days
@@ -520,38 +778,38 @@ def get_options_page(  # pylint: disable=R0913, R0914
     mutiple_option_chains = []
 
     for expiration in expirations_list:
-        timestamp = expiration.timestamp
-        symbol = expiration.symbol
-
-        url = f"https://finance.yahoo.com/quote/{symbol}/options?date={timestamp}&p={symbol}"
-
-        response = requestor(url, **kwargs)
-
-        if response.ok:
-
-            html = HTML(html=response.text, url=url)
+        if expiration.timestamp == selected:
+            option_chain = parse_options_chain(expiration, expiration_page)
+        else:
+            url = options_page_url(expiration.symbol, expiration.timestamp)
 
-            calls_table, puts_table = get_table_elements(html)
+            response = requestor(url, **kwargs)
 
-            if calls_table is None or puts_table is None:
+            if not response.ok:
                 continue
 
-            calls = parse_option_table(expiration, "call", calls_table)
-            puts = parse_option_table(expiration, "put", puts_table)
-
-            chain = calls + puts
-
-            option_chain = OptionsChain(
-                symbol=symbol, expiration_date=expiration.expiration_date, chain=chain
+            option_chain = parse_cached(
+                page_cache,
+                url,
+                response.content,
+                partial(_parse_options_response, expiration, response, url),
             )
 
+        if option_chain is not None:
+
             if first_chain:
+                if compact:
+                    return OptionsChainRecord.from_model(option_chain)
+
                 return option_chain
 
             mutiple_option_chains.append(option_chain)
 
     if len(mutiple_option_chains) > 0:
 
+        if compact:
+            return OptionChainRecordGroup(mutiple_option_chains, expirations_list)
+
         return MultipleOptionChains(
             option_chain_list=mutiple_option_chains, contract_expiration_list=expirations_list
         )
@@ -0,0 +1,151 @@
+"""Reuse parsed pages when a page is downloaded again unchanged.
+
+Refreshing statistics or options pages mostly returns the same content as the last
+download, yet building the HTML document, parsing the tables and validating the models
+is repeated every time. A PageCache keeps the last parsed result of every url with a
+hash of the content it was parsed from. When the content of a new response hashes the
+same the cached result is returned without parsing.
+
+```python
+page_cache = PageCache()
+page = get_statistics_page("aapl", page_cache=page_cache)
+page = get_statistics_page("aapl", page_cache=page_cache)  # not parsed if unchanged
+```
+
+Cached results are shared, so treat them as read only.
+"""
+
+from collections import OrderedDict
+import hashlib
+import threading
+from typing import Any, Callable, Optional, Tuple, TypeVar
+
+from decouple import config
+
+PAGE_CACHE_SIZE = config("YFS_PAGE_CACHE_SIZE", default=1024, cast=int)
+"""* Number of parsed pages kept by a PageCache."""
+
+CONTENT_START = b'id="quote-header-info"'
+"""* Marker of the start of the hashed content. The quote header element."""
+
+CONTENT_END = b'id="YDC-Col2"'
+"""* Marker of the end of the hashed content. The side column element."""
+
+T = TypeVar("T")
+
+
+def content_hash(content: bytes) -> str:
+    """Hash the part of a page which holds the parsed data.
+
+    Scripts, ads and the side column change on every request, so only the bytes from
+    the quote header to the side column are hashed. The whole page is hashed when
+    either marker is missing.
+
+    Args:
+        content (bytes): Body of a yahoo finance page.
+
+    Returns:
+        str: Hex digest.
+    """
+    start = content.find(CONTENT_START)
+    end = -1 if start == -1 else content.find(CONTENT_END, start)
+    region = memoryview(content)
+
+    if end != -1:
+        region = region[start:end]
+
+    return hashlib.blake2b(region, digest_size=16).hexdigest()
+
+
+class PageCache:
+    """The last parsed result of every url with the content hash it was parsed from.
+
+    The least recently used url is dropped when more than max_size urls are cached.
+
+    Attributes:
+        max_size (int): Maximum number of cached urls.
+        hits (int): Number of results returned without parsing.
+        misses (int): Number of pages which were parsed.
+    """
+
+    def __init__(self, max_size: int = PAGE_CACHE_SIZE) -> None:
+        """Create an empty cache."""
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, url: str, digest: str) -> Optional[Any]:
+        """Return the result cached for url if it was parsed from content with digest."""
+        with self._lock:
+            entry = self._entries.get(url)
+
+            if entry is None or entry[0] != digest:
+                return None
+
+            self._entries.move_to_end(url)
+            return entry[1]
+
+    def set(self, url: str, digest: str, value: Any) -> None:  # noqa: ANN401
+        """Cache the result parsed from the content of url with digest."""
+        with self._lock:
+            self._entries[url] = (digest, value)
+            self._entries.move_to_end(url)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def parse(self, url: str, content: bytes, parser: Callable[[], T]) -> Optional[T]:
+        """Return the cached result of url if content is unchanged, else call parser.
+
+        Results of None are not cached.
+
+        Args:
+            url (str): Url of the page.
+            content (bytes): Body of the response.
+            parser (Callable): Parses the response. Only called when content changed.
+        """
+        digest = content_hash(content)
+        value = self.get(url, digest)
+
+        if value is not None:
+            with self._lock:
+                self.hits += 1
+            return value
+
+        with self._lock:
+            self.misses += 1
+
+        value = parser()
+
+        if value is not None:
+            self.set(url, digest, value)
+
+        return value
+
+    def clear(self) -> None:
+        """Forget every cached result."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        """Return the number of cached urls."""
+        return len(self._entries)
+
+
+def parse_cached(
+    page_cache: Optional[PageCache], url: str, content: bytes, parser: Callable[[], T]
+) -> Optional[T]:
+    """Call parser, or with a page cache reuse the result of unchanged content.
+
+    Args:
+        page_cache (PageCache): Cache to use. None to always parse.
+        url (str): Url of the page.
+        content (bytes): Body of the response.
+        parser (Callable): Parses the response.
+    """
+    if page_cache is None:
+        return parser()
+
+    return page_cache.parse(url, content, parser)
@@ -10,3 +10,6 @@ PROJECT_ROOT = SOURCE_ROOT.parent
 
 TEST_DIRECTORY = PROJECT_ROOT / "tests"
 """* A path to the yfs test directory"""
+
+DATA_DIRECTORY = SOURCE_ROOT / "data"
+"""* A path to the data files bundled with yfs."""
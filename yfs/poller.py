@@ -0,0 +1,253 @@
+"""Poll quote headers of a watchlist and emit only the quotes which changed."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import random
+import threading
+from time import monotonic
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from loguru import logger
+import pendulum
+from pendulum.datetime import DateTime
+from pydantic import BaseModel as Base
+
+from .quote import parse_quote_header_text, Quote
+from .requestor import requestor
+from .urls import summary_page_url
+
+CHANGE_FIELDS = ("close", "change", "percent_change")
+"""* Quote fields compared to detect a change."""
+
+
+class QuoteChange(Base):
+    """A change of the quote header of one symbol.
+
+    Attributes:
+        symbol (str): Ticker symbol.
+        previous (Quote): The previously fetched quote. None on the first poll of a symbol.
+        current (Quote): The newly fetched quote.
+        changed_fields (List[str]): Fields which differ between previous and current.
+        timestamp (DateTime): When the change was detected.
+
+    Notes:
+        This class inherits from the pydantic BaseModel which allows for the use
+        of .json() and .dict() for serialization to json strings and dictionaries.
+
+        .json(): Serialize to a JSON object.
+        .dict(): Serialize to a dictionary.
+    """
+
+    symbol: str
+    previous: Optional[Quote]
+    current: Quote
+    changed_fields: List[str]
+    timestamp: DateTime
+
+
+def get_quote(symbol: str, **kwargs) -> Optional[Quote]:  # noqa: ANN003
+    """Get the quote header of a symbol without parsing the rest of the summary page.
+
+    Args:
+        symbol (str): Ticker symbol.
+        **kwargs: Pass (session, proxies, and timeout) to the requestor function.
+
+    Returns:
+        Quote: When the quote header is found.
+        None: The page or quote header is not found.
+    """
+    url = summary_page_url(symbol)
+    response = requestor(url, **kwargs)
+
+    if response.ok:
+        return parse_quote_header_text(response.text, url)
+
+    return None
+
+
+def changed_fields(
+    previous: Optional[Quote], current: Quote, fields: Iterable[str] = CHANGE_FIELDS
+) -> List[str]:
+    """Return the fields whose values differ. All fields when previous is None."""
+    if previous is None:
+        return list(fields)
+
+    return [field for field in fields if getattr(previous, field) != getattr(current, field)]
+
+
+class QuotePoller:  # pylint: disable=too-many-instance-attributes
+    """Polls the quote headers of symbols on a cadence and emits QuoteChange events.
+
+    The last fetched Quote of every symbol is kept and a QuoteChange is only emitted
+    when one of the compared fields changed. Events are passed to callbacks and
+    asyncio queues registered with on_change and add_queue. An exception raised by a
+    callback is logged and the poller keeps polling.
+
+    Example:
+    ```python
+    poller = QuotePoller(["aapl", "tsla"], interval=5)
+    poller.on_change(lambda change: print(change.symbol, change.current.close))
+    poller.start()
+    ...
+    poller.stop()
+    ```
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        symbols: Iterable[str],
+        interval: float = 5.0,
+        jitter: float = 0.5,
+        fields: Iterable[str] = CHANGE_FIELDS,
+        emit_initial: bool = True,
+        thread_count: int = 5,
+        **kwargs,  # noqa: ANN003
+    ) -> None:
+        """Create a poller.
+
+        Args:
+            symbols (Iterable[str]): Ticker symbols to poll.
+            interval (float): Seconds between the start of two polls.
+            jitter (float): Up to this many seconds are randomly added to or removed
+                from every interval so many pollers do not hit yahoo at once.
+            fields (Iterable[str]): Quote fields compared to detect a change.
+            emit_initial (bool): If True the first quote of every symbol is emitted.
+            thread_count (int): Number of threads fetching quotes concurrently.
+            **kwargs: Pass (session, proxies, and timeout) to the requestor function.
+        """
+        self.symbols = [symbol.upper() for symbol in symbols]
+        self.interval = interval
+        self.jitter = jitter
+        self.fields = tuple(fields)
+        self.emit_initial = emit_initial
+        self.thread_count = thread_count
+        self.kwargs = kwargs
+
+        self.quotes: Dict[str, Quote] = {}
+        self.errors: Dict[str, Exception] = {}
+        self.poll_count = 0
+
+        self._callbacks: List[Callable[[QuoteChange], None]] = []
+        self._queues: List[Tuple[asyncio.Queue, asyncio.AbstractEventLoop]] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def on_change(self, callback: Callable[[QuoteChange], None]) -> Callable:
+        """Register a callback called with every QuoteChange. Usable as a decorator."""
+        self._callbacks.append(callback)
+        return callback
+
+    def add_queue(
+        self, queue: asyncio.Queue, loop: Optional[asyncio.AbstractEventLoop] = None
+    ) -> None:
+        """Put every QuoteChange on an asyncio queue.
+
+        Args:
+            queue (asyncio.Queue): The queue receiving the changes.
+            loop (asyncio.AbstractEventLoop): The loop the queue belongs to. Defaults to
+                the running loop, so call it from a coroutine when loop is not passed.
+        """
+        self._queues.append((queue, loop or asyncio.get_running_loop()))
+
+    def _fetch(self, symbol: str) -> Optional[Quote]:
+        try:
+            quote = get_quote(symbol, **self.kwargs)
+        except Exception as error:  # pylint: disable=broad-except
+            self.errors[symbol] = error
+            return None
+
+        self.errors.pop(symbol, None)
+        return quote
+
+    def _dispatch(self, change: QuoteChange) -> None:
+        for callback in self._callbacks:
+            try:
+                callback(change)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception(
+                    "QuotePoller callback {!r} failed for {}.", callback, change.symbol
+                )
+
+        for queue, loop in self._queues:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, change)
+            except RuntimeError:
+                logger.exception(
+                    "QuotePoller could not queue the change of {}. The loop is closed.",
+                    change.symbol,
+                )
+
+    def poll(self, executor: Optional[ThreadPoolExecutor] = None) -> List[QuoteChange]:
+        """Fetch every symbol once and emit the changes.
+
+        Symbols which fail to download keep their last quote and are recorded in
+        the errors attribute.
+
+        Returns:
+            The emitted QuoteChange events.
+        """
+        if executor is None:
+            with ThreadPoolExecutor(max_workers=self.thread_count) as pool:
+                return self.poll(pool)
+
+        changes = []
+
+        for symbol, quote in zip(self.symbols, executor.map(self._fetch, self.symbols)):
+            if quote is None:
+                continue
+
+            previous = self.quotes.get(symbol)
+            fields = changed_fields(previous, quote, self.fields)
+            self.quotes[symbol] = quote
+
+            if not fields or (previous is None and not self.emit_initial):
+                continue
+
+            change = QuoteChange(
+                symbol=symbol,
+                previous=previous,
+                current=quote,
+                changed_fields=fields,
+                timestamp=pendulum.now("UTC"),
+            )
+            changes.append(change)
+            self._dispatch(change)
+
+        self.poll_count += 1
+        return changes
+
+    def next_delay(self) -> float:
+        """Return the interval with jitter applied, never below zero."""
+        return max(0.0, self.interval + random.uniform(-self.jitter, self.jitter))
+
+    def run(self, max_polls: Optional[int] = None) -> None:
+        """Poll until stop is called or max_polls polls were done. Blocks the caller."""
+        self._stop.clear()
+
+        with ThreadPoolExecutor(max_workers=self.thread_count) as executor:
+            polls = 0
+
+            while not self._stop.is_set():
+                started = monotonic()
+                self.poll(executor)
+                polls += 1
+
+                if max_polls is not None and polls >= max_polls:
+                    break
+
+                self._stop.wait(max(0.0, self.next_delay() - (monotonic() - started)))
+
+    def start(self) -> "QuotePoller":
+        """Run the poller on a background thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop polling and wait for the running poll to finish."""
+        self._stop.set()
+
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
@@ -0,0 +1,184 @@
+"""Opt-in profiling of the parse functions.
+
+The parse functions are decorated with profiled. While a profiling session is active
+every call is run under a deterministic cProfile profiler of the calling thread, so
+threaded downloads are profiled as well. The profiles of all threads are merged and
+written as per function cumulative stats when the session stops.
+
+Profile part of a program with the profile context manager:
+
+```python
+from yfs.profiling import profile
+
+with profile("yfs.prof") as session:
+    get_multiple_summary_pages(symbols, with_threads=True)
+
+session.stats().print_stats(20)
+```
+
+Or profile a whole run without changing any code by setting the YFS_PROFILE
+environmental variable to an output path:
+
+```
+YFS_PROFILE=yfs.prof python my_script.py
+```
+
+Both write yfs.prof, readable with pstats or snakeviz, and yfs.prof.txt, a text
+report sorted by cumulative time which can be attached to a ticket.
+"""
+
+import atexit
+from contextlib import contextmanager
+import cProfile
+from functools import wraps
+import io
+from pathlib import Path
+import threading
+from typing import Callable, Iterator, List, Optional, TYPE_CHECKING, TypeVar, Union
+
+from decouple import config
+
+if TYPE_CHECKING:
+    import pstats
+
+PROFILE_PATH = config("YFS_PROFILE", default="")
+"""* Output path of the profile of the whole run. Profiling is off when empty."""
+
+F = TypeVar("F", bound=Callable)
+
+_active: Optional["ProfileSession"] = None
+
+
+class ProfileSession:
+    """Collects cProfile stats of profiled functions across threads.
+
+    Attributes:
+        path (Path): Where the stats are written when the session stops. Nothing is
+            written when None.
+        sort (str): pstats sort key of the text report.
+    """
+
+    def __init__(self, path: Union[str, Path] = None, sort: str = "cumulative") -> None:
+        """Create a session. It does not profile anything until started."""
+        self.path = Path(path) if path else None
+        self.sort = sort
+        self._profilers: List[cProfile.Profile] = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def call(self, func: Callable, *args, **kwargs) -> object:  # noqa: ANN002, ANN003
+        """Call func under the profiler of the current thread.
+
+        Nested profiled calls run inside the outer call's profiler. When another
+        profiler is already active in the thread func is called without profiling.
+        """
+        if getattr(self._local, "running", False):
+            return func(*args, **kwargs)
+
+        profiler = getattr(self._local, "profiler", None)
+
+        if profiler is None:
+            profiler = self._local.profiler = cProfile.Profile()
+
+            with self._lock:
+                self._profilers.append(profiler)
+
+        self._local.running = True
+        try:
+            profiler.enable()
+        except ValueError:  # another profiler is active in this thread
+            self._local.running = False
+            return func(*args, **kwargs)
+
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profiler.disable()
+            self._local.running = False
+
+    def start(self) -> "ProfileSession":
+        """Make this the active session."""
+        global _active  # pylint: disable=global-statement
+        _active = self
+        return self
+
+    def stop(self) -> None:
+        """Stop profiling and write the stats if a path is set."""
+        global _active  # pylint: disable=global-statement
+
+        if _active is self:
+            _active = None
+
+        if self.path:
+            self.dump(self.path)
+
+    def stats(self) -> "pstats.Stats":
+        """Return the merged stats of all threads."""
+        import pstats  # pylint: disable=import-outside-toplevel
+
+        with self._lock:
+            profilers = [profiler for profiler in self._profilers if profiler.getstats()]
+
+        stats = pstats.Stats(*profilers) if profilers else pstats.Stats()
+        return stats.sort_stats(self.sort)
+
+    def report(self, limit: int = 50) -> str:
+        """Return a text report of the stats sorted by the sort key."""
+        stream = io.StringIO()
+        stats = self.stats()
+        stats.stream = stream
+        stats.print_stats(limit)
+        return stream.getvalue()
+
+    def dump(self, path: Union[str, Path]) -> None:
+        """Write the stats to path and a text report to path with a .txt suffix added."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.stats().dump_stats(str(path))
+        path.with_name(path.name + ".txt").write_text(self.report())
+
+
+def active_session() -> Optional[ProfileSession]:
+    """Return the active profiling session or None."""
+    return _active
+
+
+@contextmanager
+def profile(path: Union[str, Path] = None, sort: str = "cumulative") -> Iterator[ProfileSession]:
+    """Profile the profiled functions called inside the with block.
+
+    Args:
+        path (Path): Where to write the stats when the block exits. Optional.
+        sort (str): pstats sort key of the text report. Default is cumulative.
+
+    Yields:
+        ProfileSession: Use .stats() or .report() to inspect the results.
+    """
+    session = ProfileSession(path, sort=sort).start()
+    try:
+        yield session
+    finally:
+        session.stop()
+
+
+def profiled(func: F) -> F:
+    """Decorate a function so it is profiled while a session is active.
+
+    When no session is active the only overhead is one extra function call.
+    """
+
+    @wraps(func)
+    def wrapper(*args, **kwargs) -> object:  # noqa: ANN002, ANN003
+        session = _active
+
+        if session is None:
+            return func(*args, **kwargs)
+
+        return session.call(func, *args, **kwargs)
+
+    return wrapper
+
+
+if PROFILE_PATH:
+    atexit.register(ProfileSession(PROFILE_PATH).start().stop)
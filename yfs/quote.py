@@ -1,11 +1,16 @@
 """Module for parsing quote header data from a yahoo finance page."""
 
-from typing import Optional
+from typing import Optional, TYPE_CHECKING
 
 from pydantic import BaseModel as Base
-from requests_html import HTML
 
 from .cleaner import cleaner, CommonCleaners
+from .document import element_text, parse_html, select, select_first
+from .metrics import Stage, timer
+from .profiling import profiled
+
+if TYPE_CHECKING:
+    from requests_html import HTML
 
 
 def clean_quote_name(value: str) -> str:
@@ -61,7 +66,23 @@ class Quote(Base):
     )
 
 
-def parse_quote_header_info(html: HTML) -> Optional[Quote]:
+QUOTE_HEADER_SELECTOR = "div#quote-header-info"
+"""* CSS selector of the quote header element."""
+
+QUOTE_SELECTORS = {
+    "name": r".D\(ib\).Fz\(18px\)",
+    "close": r".Trsdu\(0\.3s\).Fw\(b\).Fz\(36px\).Mb\(-4px\).D\(ib\)",
+    "change": r".Trsdu\(0\.3s\).Fw\(500\)",
+    "percent_change": r".Trsdu\(0\.3s\).Fw\(500\)",
+}
+"""* CSS selectors of the quote fields within the quote header element.
+
+change and percent_change share one element, select evaluates it once.
+"""
+
+
+@profiled
+def parse_quote_header_info(html: "HTML") -> Optional[Quote]:
     """Parse and clean html elements from the quote header info portion of a yahoo finance page.
 
     Args:
@@ -71,26 +92,53 @@ def parse_quote_header_info(html: HTML) -> Optional[Quote]:
         Quote: Quote object containing the parsed quote header data if successfully parsed.
         None: No quote header info data present in the HTML.
     """
-    quote_selectors = {
-        "name": r".D\(ib\).Fz\(18px\)",
-        "close": r".Trsdu\(0\.3s\).Fw\(b\).Fz\(36px\).Mb\(-4px\).D\(ib\)",
-        "change": r".Trsdu\(0\.3s\).Fw\(500\)",
-        "percent_change": r".Trsdu\(0\.3s\).Fw\(500\)",
-    }
+    with timer(Stage.CLEAN, page="quote"):
+        quote_header_info = select_first(html, QUOTE_HEADER_SELECTOR)
 
-    quote_header_info = html.find("div#quote-header-info", first=True)
+        quote_data = {}
 
-    quote_data = {}
+        if quote_header_info is not None:
 
-    if quote_header_info:
+            for field, selector in QUOTE_SELECTORS.items():
+                elements = select(html, selector, quote_header_info)
 
-        for field, selector in quote_selectors.items():
-            element = quote_header_info.find(selector)
-
-            if element and len(element) == 1:
-                quote_data[field] = element[0].text
+                if len(elements) == 1:
+                    quote_data[field] = element_text(elements[0])
 
     if quote_data:
-        return Quote(**quote_data)
+        with timer(Stage.MODEL, page="quote"):
+            return Quote(**quote_data)
 
     return None
+
+
+QUOTE_HEADER_WINDOW = 20_000
+"""* Number of characters parsed from the start of the quote header element."""
+
+
+def parse_quote_header_text(text: str, url: str = None) -> Optional[Quote]:
+    """Parse the quote header from the text of any yahoo finance page.
+
+    Only a window of text starting at the quote header element is parsed instead of
+    the whole page, which is several hundred kilobytes. If the header is not found in
+    the window the whole page is parsed.
+
+    Args:
+        text (str): Text of a yahoo finance page.
+        url (str): Url of the page.
+
+    Returns:
+        Quote: Quote object containing the parsed quote header data if successfully parsed.
+        None: No quote header info data present in the text.
+    """
+    position = text.find('id="quote-header-info"')
+
+    if position != -1:
+        start = text.rfind("<", 0, position)
+        fragment = text[start : start + QUOTE_HEADER_WINDOW]  # noqa: E203
+        quote = parse_quote_header_info(parse_html(fragment, url, page="quote"))
+
+        if quote:
+            return quote
+
+    return parse_quote_header_info(parse_html(text, url, page="quote"))
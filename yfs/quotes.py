@@ -0,0 +1,353 @@
+"""Download the quotes of many symbols per request from the yahoo finance quote api.
+
+A summary page download costs about a megabyte of HTML per symbol. The JSON quote api
+returns the Quote fields of up to QUOTE_BATCH_SIZE symbols in one small response, so a
+snapshot of thousands of symbols takes a few dozen requests.
+
+```python
+quotes = get_quotes(["aapl", "tsla", "msft"])
+print(quotes["AAPL"].close)
+print(quotes.dataframe)
+```
+"""
+
+from concurrent.futures import Executor
+from time import perf_counter, sleep
+from typing import Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING, Union
+
+from decouple import config
+import pendulum
+from pendulum.datetime import DateTime
+from pydantic import BaseModel as Base
+
+from .columns import ColumnBuffer
+from .metrics import Stage, timer
+from .multidownloader import (
+    _outcome_status,
+    _worker_pool,
+    DownloadReport,
+    OutcomeStatus,
+    RETRY_BACKOFF,
+    RETRYABLE_STATUSES,
+    SymbolOutcome,
+)
+from .quote import Quote
+from .requestor import requestor
+from .urls import quote_api_url
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+QUOTE_BATCH_SIZE = config("YFS_QUOTE_BATCH_SIZE", default=200, cast=int)
+"""* Number of symbols requested per quote api request."""
+
+QUOTE_API_FIELDS = (
+    "longName",
+    "shortName",
+    "currency",
+    "regularMarketPrice",
+    "regularMarketChange",
+    "regularMarketChangePercent",
+    "regularMarketTime",
+)
+"""* Quote api fields requested. Other fields are not downloaded."""
+
+
+class SymbolQuote(Quote):
+    """Quote of one symbol downloaded from the quote api.
+
+    Attributes:
+        symbol (str): Ticker symbol.
+        name (str): Company name.
+        close (float): Latest price.
+        change (float): Dollar change in price.
+        percent_change (float): Percent change in price.
+        currency (str): Currency of the prices.
+        market_time (DateTime): Time of the latest price.
+
+    Notes:
+        This class inherits from the pydantic BaseModel which allows for the use
+        of .json() and .dict() for serialization to json strings and dictionaries.
+
+        .json(): Serialize to a JSON object.
+        .dict(): Serialize to a dictionary.
+    """
+
+    symbol: str
+    currency: Optional[str]
+    market_time: Optional[DateTime]
+
+    def __lt__(self, other) -> bool:  # noqa: ANN001
+        """Compare SymbolQuote objects to allow ordering by symbol."""
+        if other.__class__ is self.__class__:
+            return self.symbol < other.symbol
+
+        return None
+
+
+def quote_columns() -> ColumnBuffer:
+    """Create an empty column buffer for SymbolQuote objects."""
+    return ColumnBuffer.from_models([(None, SymbolQuote)], index="symbol")
+
+
+class QuoteGroup(Base):
+    """Group of SymbolQuote objects from multiple symbols.
+
+    Attributes:
+        quotes (List[SymbolQuote]): Quotes in the order of the requested symbols.
+
+    Notes:
+        This class inherits from the pydantic BaseModel which allows for the use
+        of .json() and .dict() for serialization to json strings and dictionaries.
+
+        .json(): Serialize to a JSON object.
+        .dict(): Serialize to a dictionary.
+    """
+
+    quotes: List[SymbolQuote] = list()
+
+    def append(self, quote: SymbolQuote) -> None:
+        """Append a SymbolQuote to the group."""
+        if quote.__class__ is SymbolQuote:
+            self.quotes.append(quote)
+        else:
+            raise AttributeError("Can only append SymbolQuote objects.")
+
+    @property
+    def symbols(self) -> List[str]:
+        """List of symbols in the group."""
+        return [quote.symbol for quote in self]
+
+    def sort(self) -> None:
+        """Sort SymbolQuote objects by symbol."""
+        self.quotes = sorted(self.quotes)
+
+    @property
+    def dataframe(self) -> Optional["DataFrame"]:
+        """Return a dataframe of the quotes indexed by symbol."""
+        if self.quotes:
+            columns = quote_columns()
+            columns.extend(self.quotes)
+            return columns.to_dataframe()
+
+        return None
+
+    def __getitem__(self, symbol: str) -> SymbolQuote:
+        """Return the quote of a symbol.
+
+        Raises:
+            KeyError: If the symbol is not in the group.
+        """
+        symbol = symbol.upper()
+
+        for quote in self.quotes:
+            if quote.symbol == symbol:
+                return quote
+
+        raise KeyError(symbol)
+
+    def __iter__(self) -> Iterable:
+        """Iterate over SymbolQuote objects."""
+        return iter(self.quotes)
+
+    def __len__(self) -> int:
+        """Length of SymbolQuote objects."""
+        return len(self.quotes)
+
+
+def _number(value: object) -> Optional[float]:
+    """Return a quote api number as a float. Formatted numbers use the raw value."""
+    if isinstance(value, dict):
+        value = value.get("raw")
+
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+
+    return None
+
+
+def parse_quote_response(data: Dict) -> List[SymbolQuote]:
+    """Build SymbolQuotes from a decoded quote api response.
+
+    The values are already numbers, so the models are built without the string
+    cleaners of Quote.
+
+    Args:
+        data (dict): Decoded JSON of a quote api response.
+
+    Returns:
+        List[SymbolQuote]: One quote per symbol found.
+    """
+    results = (data.get("quoteResponse") or {}).get("result") or []
+    quotes = []
+
+    with timer(Stage.MODEL, page="quotes"):
+        for result in results:
+            symbol = result.get("symbol")
+
+            if not symbol:
+                continue
+
+            market_time = result.get("regularMarketTime")
+
+            quotes.append(
+                SymbolQuote.construct(
+                    symbol=symbol.upper(),
+                    name=result.get("longName") or result.get("shortName") or symbol,
+                    close=_number(result.get("regularMarketPrice")),
+                    change=_number(result.get("regularMarketChange")),
+                    percent_change=_number(result.get("regularMarketChangePercent")),
+                    currency=result.get("currency"),
+                    market_time=(
+                        None
+                        if _number(market_time) is None
+                        else pendulum.from_timestamp(_number(market_time))
+                    ),
+                )
+            )
+
+    return quotes
+
+
+class QuoteBatchError(Exception):
+    """Raised when the batches of some symbols could not be downloaded.
+
+    Attributes:
+        symbols (List[str]): Symbols of the failed batches.
+        quotes (QuoteGroup): Quotes of the batches which were downloaded. None if no
+            quote was found.
+    """
+
+    def __init__(self, symbols: List[str], quotes: Optional[QuoteGroup]) -> None:
+        """Create the error with the failed symbols and the partial quotes."""
+        super().__init__(f"Quotes of {len(symbols)} symbols failed: {', '.join(symbols)}.")
+        self.symbols = symbols
+        self.quotes = quotes
+
+
+def _get_quote_batch(
+    symbols: List[str], retries: int, **kwargs  # noqa: ANN003
+) -> Tuple[Optional[List[SymbolQuote]], SymbolOutcome]:
+    """Download one batch, retrying throttled and failed requests and connection errors.
+
+    Returns:
+        The quotes of the batch, or None when every attempt failed, and the outcome of
+        the last attempt.
+    """
+    url = quote_api_url(symbols, QUOTE_API_FIELDS)
+    outcome = SymbolOutcome(symbol=symbols[0], query=symbols[0])
+
+    for attempt in range(retries + 1):
+        if attempt:
+            sleep(RETRY_BACKOFF * 2 ** (attempt - 1))
+
+        outcome.retries = attempt
+        outcome.http_status = None
+        quotes, error = None, None
+
+        try:
+            response = requestor(url, **kwargs)
+            outcome.http_status = response.status_code
+
+            if response.ok:
+                with timer(Stage.HTML_PARSE, page="quotes"):
+                    data = response.json()
+
+                quotes = parse_quote_response(data)
+        except Exception as exception:  # pylint: disable=broad-except
+            error = exception
+
+        outcome.status = _outcome_status(quotes, error, outcome.http_status)
+
+        if outcome.status not in RETRYABLE_STATUSES:
+            break
+
+    outcome.error = None if error is None else f"{error.__class__.__name__}: {error}"
+    return quotes, outcome
+
+
+def get_quotes(  # pylint: disable=too-many-arguments, too-many-locals
+    symbols: Iterable[str],
+    batch_size: int = QUOTE_BATCH_SIZE,
+    thread_count: int = 5,
+    retries: int = 0,
+    executor: Optional[Executor] = None,
+    with_report: bool = False,
+    **kwargs,  # noqa: ANN003
+) -> Union[Optional[QuoteGroup], Tuple[Optional[QuoteGroup], DownloadReport]]:
+    """Get the quotes of many symbols with a few quote api requests.
+
+    Symbols are split into batches of batch_size which are downloaded concurrently.
+    Symbols are not validated with a fuzzy search; unknown symbols are left out.
+
+    Args:
+        symbols (Iterable[str]): Ticker symbols.
+        batch_size (int): Number of symbols per request.
+        thread_count (int): Number of batches downloaded at once.
+        retries (int): Number of times a batch which was throttled, failed or raised a
+            connection error or timeout is retried.
+        executor (Executor): Thread pool reused instead of creating one for this call.
+            It is not shut down.
+        with_report (bool): If True a DownloadReport with the outcome of every symbol
+            is returned as well. Failed batches are recorded in the report instead of
+            raised.
+        **kwargs: Pass (session, proxies, and timeout) to the requestor function.
+
+    Returns:
+        QuoteGroup: Quotes in the order of symbols.
+        None: No quote is found.
+        Tuple: (quotes, DownloadReport) when with_report is True.
+
+    Raises:
+        QuoteBatchError: When a batch failed after every retry and with_report is
+            False. The quotes of the other batches are on the error.
+    """
+    started = perf_counter()
+    symbols = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+    batches = [
+        symbols[start : start + batch_size]  # noqa: E203
+        for start in range(0, len(symbols), batch_size)
+    ]
+
+    if len(batches) <= 1:
+        results = [_get_quote_batch(batch, retries, **kwargs) for batch in batches]
+    else:
+        with _worker_pool(executor, thread_count) as pool:
+            futures = [
+                pool.submit(_get_quote_batch, batch, retries, **kwargs) for batch in batches
+            ]
+            results = [future.result() for future in futures]
+
+    found = {quote.symbol: quote for quotes, _ in results if quotes for quote in quotes}
+    report = DownloadReport()
+    failed = []
+    group = QuoteGroup()
+
+    for batch, (quotes, outcome) in zip(batches, results):
+        if quotes is None:
+            failed.extend(batch)
+
+        for symbol in batch:
+            status = outcome.status
+
+            if quotes is not None and symbol not in found:
+                status = OutcomeStatus.NOT_FOUND
+
+            report.append(
+                outcome.copy(update={"symbol": symbol, "query": symbol, "status": status})
+            )
+
+    for symbol in symbols:
+        if symbol in found:
+            group.append(found[symbol])
+
+    quotes = group if len(group) > 0 else None
+    report.seconds = perf_counter() - started
+
+    if with_report:
+        return quotes, report
+
+    if failed:
+        raise QuoteBatchError(failed, quotes)
+
+    return quotes
@@ -0,0 +1,297 @@
+"""Compact slotted records for holding large amounts of parsed page data in memory.
+
+The pydantic models in yfs carry a `__dict__`, a `__fields_set__` set and nested
+models for every object. When holding data for thousands of symbols the records in this
+module can be used instead. Each record only stores already cleaned values in
+`__slots__` and converts back to the pydantic model on demand.
+"""
+
+from typing import Iterable, List, Optional, Tuple, Type, TYPE_CHECKING, Union
+
+from pendulum.datetime import DateTime
+from pydantic import BaseModel as Base
+
+from .options import (
+    ContractExpirationList,
+    MultipleOptionChains,
+    option_contract_columns,
+    OptionContract,
+    OptionsChain,
+)
+from .quote import Quote
+from .summary import summary_page_columns, SummaryPage, SummaryPageGroup
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+
+class Record:
+    """Base class for slotted records.
+
+    Subclasses define `__slots__` with the field names of the pydantic model they
+    represent and set `_model` to that model.
+    """
+
+    __slots__: Tuple[str, ...] = ()
+    _model: Type[Base] = Base
+
+    def __init__(self, *args: object, **kwargs: object) -> None:
+        """Set slot values by position or keyword. Missing values default to None."""
+        values = dict(zip(self.__slots__, args), **kwargs)
+
+        for field in self.__slots__:
+            setattr(self, field, values.get(field))
+
+    @classmethod
+    def from_model(cls, model: Base) -> "Record":
+        """Create a record from a pydantic model."""
+        return cls(*(getattr(model, field) for field in cls.__slots__))
+
+    def to_model(self) -> Base:
+        """Convert the record to its pydantic model.
+
+        The values held by a record are already cleaned so the model is constructed
+        without running the validators again.
+        """
+        return self._model.construct(**self.dict())
+
+    def dict(self) -> dict:
+        """Serialize to a dictionary."""
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    def astuple(self) -> tuple:
+        """Serialize to a tuple ordered by `__slots__`."""
+        return tuple(getattr(self, field) for field in self.__slots__)
+
+    def __eq__(self, other: object) -> bool:
+        """Compare records of the same type by value."""
+        if other.__class__ is self.__class__:
+            return self.astuple() == other.astuple()
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        """Represent the record with its field values."""
+        values = ", ".join(f"{field}={getattr(self, field)!r}" for field in self.__slots__)
+        return f"{self.__class__.__name__}({values})"
+
+
+class QuoteRecord(Record):
+    """Slotted version of yfs.quote.Quote."""
+
+    __slots__ = ("name", "close", "change", "percent_change")
+    _model = Quote
+
+
+class SummaryPageRecord(Record):
+    """Slotted version of yfs.summary.SummaryPage.
+
+    The quote header is not stored separately. The SummaryPage name, close, change
+    and percent_change fields are copied from the quote, so the quote is rebuilt
+    from those fields.
+    """
+
+    __slots__ = tuple(field for field in SummaryPage.__fields__ if field != "quote")
+    _model = SummaryPage
+
+    @property
+    def quote(self) -> QuoteRecord:
+        """Quote header rebuilt from the summary fields."""
+        return QuoteRecord(self.name, self.close, self.change, self.percent_change)
+
+    def to_model(self) -> SummaryPage:
+        """Convert the record to a SummaryPage including the nested Quote."""
+        return SummaryPage.construct(quote=self.quote.to_model(), **self.dict())
+
+    def __lt__(self, other: "SummaryPageRecord") -> Optional[bool]:
+        """Compare SummaryPageRecord objects to allow ordering by symbol."""
+        if other.__class__ is self.__class__:
+            return self.symbol < other.symbol
+
+        return None
+
+
+class OptionContractRecord(Record):
+    """Slotted version of yfs.options.OptionContract."""
+
+    __slots__ = tuple(OptionContract.__fields__)
+    _model = OptionContract
+
+
+class OptionsChainRecord:
+    """Slotted version of yfs.options.OptionsChain holding OptionContractRecords."""
+
+    __slots__ = ("symbol", "expiration_date", "chain")
+
+    def __init__(self, symbol: str, expiration_date: DateTime, chain: Iterable) -> None:
+        """Store the chain as a tuple of OptionContractRecords."""
+        self.symbol = symbol
+        self.expiration_date = expiration_date
+        self.chain = tuple(
+            (
+                contract
+                if isinstance(contract, OptionContractRecord)
+                else OptionContractRecord.from_model(contract)
+            )
+            for contract in chain
+        )
+
+    @classmethod
+    def from_model(cls, options_chain: OptionsChain) -> "OptionsChainRecord":
+        """Create a record from an OptionsChain."""
+        return cls(options_chain.symbol, options_chain.expiration_date, options_chain.chain)
+
+    def to_model(self) -> OptionsChain:
+        """Convert the record to an OptionsChain."""
+        return OptionsChain.construct(
+            symbol=self.symbol,
+            expiration_date=self.expiration_date,
+            chain=[contract.to_model() for contract in self.chain],
+        )
+
+    @property
+    def dataframe(self) -> "DataFrame":
+        """Return a dataframe of the option contracts."""
+        columns = option_contract_columns()
+        columns.extend(self.chain)
+        return columns.to_dataframe()
+
+    def __len__(self) -> int:
+        """Return the number of OptionContractRecords in the chain."""
+        return len(self.chain)
+
+    def __iter__(self) -> Iterable:
+        """Iterate over OptionContractRecords."""
+        return iter(self.chain)
+
+
+class OptionChainRecordGroup:
+    """Memory efficient drop in for MultipleOptionChains.
+
+    OptionsChain objects appended to the group are converted to OptionsChainRecords
+    so the pydantic contract models can be garbage collected. This class is returned
+    by yfs.options.get_options_page when compact is True.
+    """
+
+    __slots__ = ("option_chain_list", "contract_expiration_list")
+
+    def __init__(
+        self,
+        option_chain_list: Optional[Iterable] = None,
+        contract_expiration_list: Optional[ContractExpirationList] = None,
+    ) -> None:
+        """Create a group from OptionsChain or OptionsChainRecord objects."""
+        self.option_chain_list: List[OptionsChainRecord] = []
+        self.contract_expiration_list = contract_expiration_list
+
+        for option_chain in option_chain_list or []:
+            self.append(option_chain)
+
+    @classmethod
+    def from_model(cls, option_chains: MultipleOptionChains) -> "OptionChainRecordGroup":
+        """Create an OptionChainRecordGroup from a MultipleOptionChains."""
+        return cls(option_chains.option_chain_list, option_chains.contract_expiration_list)
+
+    def to_model(self) -> MultipleOptionChains:
+        """Convert the records to a MultipleOptionChains of OptionsChain objects."""
+        return MultipleOptionChains.construct(
+            option_chain_list=[option_chain.to_model() for option_chain in self],
+            contract_expiration_list=self.contract_expiration_list,
+        )
+
+    def append(self, option_chain: Union[OptionsChain, OptionsChainRecord]) -> None:
+        """Append an OptionsChain or an OptionsChainRecord to the group.
+
+        Args:
+            option_chain (OptionsChain): An OptionsChain object to add to the group.
+        """
+        if option_chain.__class__ is OptionsChain:
+            self.option_chain_list.append(OptionsChainRecord.from_model(option_chain))
+        elif option_chain.__class__ is OptionsChainRecord:
+            self.option_chain_list.append(option_chain)
+        else:
+            raise AttributeError("Can only append OptionsChain or OptionsChainRecord objects.")
+
+    @property
+    def dataframe(self) -> "DataFrame":
+        """Return a dataframe of the option contracts of every chain."""
+        columns = option_contract_columns()
+
+        for option_chain in self:
+            columns.extend(option_chain.chain)
+
+        return columns.to_dataframe()
+
+    def __iter__(self) -> Iterable:
+        """Iterate over OptionsChainRecord objects."""
+        return iter(self.option_chain_list)
+
+    def __len__(self) -> int:
+        """Return the number of option chains."""
+        return len(self.option_chain_list)
+
+
+class SummaryRecordGroup:
+    """Memory efficient drop in for SummaryPageGroup.
+
+    SummaryPage objects appended to the group are converted to SummaryPageRecords so
+    the pydantic models can be garbage collected. This class can be passed as the
+    group object to the multidownloader functions.
+    """
+
+    __slots__ = ("pages",)
+
+    def __init__(self, pages: Optional[Iterable] = None) -> None:
+        """Create a group from SummaryPage or SummaryPageRecord objects."""
+        self.pages: List[SummaryPageRecord] = []
+
+        for page in pages or []:
+            self.append(page)
+
+    @classmethod
+    def from_group(cls, group: SummaryPageGroup) -> "SummaryRecordGroup":
+        """Create a SummaryRecordGroup from a SummaryPageGroup."""
+        return cls(group.pages)
+
+    def to_group(self) -> SummaryPageGroup:
+        """Convert the records to a SummaryPageGroup of SummaryPage objects."""
+        return SummaryPageGroup(pages=[page.to_model() for page in self.pages])
+
+    def append(self, page: Union[SummaryPage, SummaryPageRecord]) -> None:
+        """Append a SummaryPage or a SummaryPageRecord to the group.
+
+        Args:
+            page (SummaryPage): A SummaryPage object to add to the group.
+        """
+        if page.__class__ is SummaryPage:
+            self.pages.append(SummaryPageRecord.from_model(page))
+        elif page.__class__ is SummaryPageRecord:
+            self.pages.append(page)
+        else:
+            raise AttributeError("Can only append SummaryPage or SummaryPageRecord objects.")
+
+    @property
+    def symbols(self) -> List[str]:
+        """List of symbols in the SummaryRecordGroup."""
+        return [page.symbol for page in self]
+
+    def sort(self) -> None:
+        """Sort SummaryPageRecord objects by symbol."""
+        self.pages = sorted(self.pages)
+
+    @property
+    def dataframe(self) -> Optional["DataFrame"]:
+        """Return a dataframe of multiple SummaryPageRecord objects."""
+        if self.pages:
+            columns = summary_page_columns()
+            columns.extend(self.pages)
+            return columns.to_dataframe()
+
+        return None
+
+    def __iter__(self) -> Iterable:
+        """Iterate over SummaryPageRecord objects."""
+        return iter(self.pages)
+
+    def __len__(self) -> int:
+        """Length of SummaryPageRecord objects."""
+        return len(self.pages)
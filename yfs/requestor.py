@@ -1,9 +1,81 @@
 """Send get requests."""
 
-from typing import Dict
+import threading
+from time import monotonic, sleep
+from typing import Dict, Optional
 
 import requests
 from requests import Response, Session
+from requests.adapters import HTTPAdapter
+
+from .metrics import Stage, timer
+
+
+class RateLimiter:
+    """Token bucket limiting requests per second across every thread sharing it.
+
+    Attributes:
+        rate (float): Requests per second.
+        burst (int): Requests which can be sent at once after being idle.
+    """
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        """Create a limiter with a full bucket."""
+        if rate <= 0:
+            raise ValueError("rate must be greater than 0.")
+
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._updated = monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take a token, waiting until one is available.
+
+        The token is reserved before waiting, so the lock is not held while sleeping
+        and waiting threads are served in the order they arrived.
+
+        Returns:
+            float: Seconds waited.
+        """
+        with self._lock:
+            now = monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait:
+            sleep(wait)
+
+        return wait
+
+
+class PooledSession(Session):
+    """Session with a connection pool sized for a thread pool and an optional rate limit.
+
+    Pass it as the session kwarg of any page getter. Connections are kept alive and
+    reused by every thread sharing the session.
+
+    Attributes:
+        rate_limiter (RateLimiter): Limiter every request waits on. None for no limit.
+    """
+
+    def __init__(self, pool_size: int = 10, rate_limiter: Optional[RateLimiter] = None) -> None:
+        """Create a session keeping up to pool_size connections per host."""
+        super().__init__()
+        self.rate_limiter = rate_limiter
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def request(self, *args, **kwargs) -> Response:  # noqa: ANN002, ANN003
+        """Wait for the rate limiter, then send the request."""
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+
+        return super().request(*args, **kwargs)
 
 
 def requestor(
@@ -18,7 +90,12 @@ def requestor(
         timeout (int): How long to wait for the server to send a response.
     """
     # TODO: try and pass a session with retries plus whaor. pylint: disable=W0511
-    if session:
-        return session.get(url, proxies=proxies, timeout=timeout)
+    with timer(Stage.FETCH) as fetch_timer:
+        if session:
+            response = session.get(url, proxies=proxies, timeout=timeout)
+        else:
+            response = requests.get(url, proxies=proxies, timeout=timeout)
+
+        fetch_timer.label(status=response.status_code)
 
-    return requests.get(url, proxies=proxies, timeout=timeout)
+    return response
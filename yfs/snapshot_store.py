@@ -0,0 +1,288 @@
+"""Store summary and statistics page snapshots in a local SQLite database.
+
+A SnapshotStore appends every page of a SummaryPageGroup or StatisticsPageGroup with
+the time it was fetched. Each page type has its own table with a column for every
+column of the group dataframe, indexed by (symbol, fetched_at). The latest page of
+every symbol as of a point in time, or every page of a symbol in a time range, is
+then read back as a typed dataframe without scraping again.
+
+The database uses write ahead logging, so other processes can read while pages are
+ingested, and every group is ingested in one transaction.
+
+```python
+store = SnapshotStore("~/.yfs/snapshots.db")
+store.ingest(get_multiple_summary_pages(watchlist))
+
+latest = store.latest(PageType.SUMMARY, as_of=pendulum.yesterday())
+history = store.history(PageType.SUMMARY, "AAPL", start=pendulum.now().subtract(days=30))
+```
+"""
+
+from datetime import date, datetime, timezone
+from pathlib import Path
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING, Union
+
+from .bundle import PageType
+from .columns import Column, ColumnBuffer
+from .statistics import statistics_page_columns, StatisticsPageGroup
+from .summary import summary_page_columns, SummaryPageGroup
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+TABLES: Dict[PageType, Tuple[str, Callable[[], ColumnBuffer]]] = {
+    PageType.SUMMARY: ("summary_snapshots", summary_page_columns),
+    PageType.STATISTICS: ("statistics_snapshots", statistics_page_columns),
+}
+"""* Table name and column buffer factory of every page type which can be stored."""
+
+GROUP_PAGE_TYPES = {
+    SummaryPageGroup: PageType.SUMMARY,
+    StatisticsPageGroup: PageType.STATISTICS,
+}
+"""* Page type of every page group which can be ingested."""
+
+SQL_TYPES = {"float64": "REAL", "Int64": "INTEGER", "boolean": "INTEGER"}
+"""* SQLite column type of every column dtype. Other dtypes are stored as TEXT."""
+
+PageGroup = Union[SummaryPageGroup, StatisticsPageGroup]
+Timestamp = Optional[Union[datetime, float]]
+
+
+def _unix_time(value: Timestamp) -> Optional[float]:
+    """Convert a datetime to a unix timestamp. Numbers and None are returned as is."""
+    if isinstance(value, datetime):
+        return value.timestamp()
+
+    return value
+
+
+def _sql_value(value: object) -> object:
+    """Convert a column value to a value SQLite can store. Dates are stored as ISO text."""
+    if isinstance(value, date):
+        return value.isoformat()
+
+    return value
+
+
+class SnapshotStore:
+    """Time series of page snapshots in a SQLite database.
+
+    Only the columns of the group dataframes are stored. The valuation measures
+    history of a statistics page is not. The instance is thread safe.
+
+    Attributes:
+        path (str): Database file. ":memory:" for an in memory database.
+    """
+
+    def __init__(self, path: Union[str, Path] = ":memory:") -> None:
+        """Open or create a database and create the tables which are missing."""
+        self.path = path if path == ":memory:" else str(Path(path).expanduser())
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            self.path, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+
+        for page_type in TABLES:
+            self._create_table(page_type)
+
+    def _create_table(self, page_type: PageType) -> None:
+        """Create the table of a page type, adding the columns new fields need."""
+        table, factory = TABLES[page_type]
+        columns = factory().columns.values()
+        definitions = ", ".join(
+            f"{column.name} {SQL_TYPES.get(column.dtype, 'TEXT')}" for column in columns
+        )
+
+        self._connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} (fetched_at REAL NOT NULL, {definitions})"
+        )
+        self._connection.execute(
+            f"CREATE INDEX IF NOT EXISTS {table}_symbol_fetched_at "
+            f"ON {table} (symbol, fetched_at)"
+        )
+
+        existing = {row[1] for row in self._connection.execute(f"PRAGMA table_info({table})")}
+
+        for column in columns:
+            if column.name not in existing:
+                sql_type = SQL_TYPES.get(column.dtype, "TEXT")
+                self._connection.execute(
+                    f"ALTER TABLE {table} ADD COLUMN {column.name} {sql_type}"
+                )
+
+    def ingest(self, group: PageGroup, fetched_at: Timestamp = None) -> int:
+        """Append every page of a group in one transaction.
+
+        Args:
+            group (PageGroup): A SummaryPageGroup or StatisticsPageGroup.
+            fetched_at (datetime): When the pages were fetched. Also a unix timestamp.
+                Defaults to now.
+
+        Returns:
+            int: Number of pages stored.
+        """
+        page_type = GROUP_PAGE_TYPES.get(group.__class__)
+
+        if page_type is None:
+            raise AttributeError(
+                "Can only ingest SummaryPageGroup or StatisticsPageGroup objects."
+            )
+
+        table, factory = TABLES[page_type]
+        buffer = factory()
+        buffer.extend(group.pages)
+        fetched_at = time.time() if fetched_at is None else _unix_time(fetched_at)
+
+        symbols = buffer.columns["symbol"]
+        symbols.values = [symbol.upper() for symbol in symbols.values]
+
+        names = ["fetched_at", *buffer.columns]
+        values = [
+            [_sql_value(value) for value in column.values] for column in buffer.columns.values()
+        ]
+        rows = [(fetched_at, *row) for row in zip(*values)]
+
+        sql = f"INSERT INTO {table} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})"
+
+        with self._lock:
+            self._connection.execute("BEGIN")
+
+            try:
+                self._connection.executemany(sql, rows)
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+
+            self._connection.execute("COMMIT")
+
+        return len(rows)
+
+    def latest(
+        self,
+        page_type: PageType,
+        symbols: Optional[Iterable[str]] = None,
+        as_of: Timestamp = None,
+    ) -> "DataFrame":
+        """Return the latest snapshot of every symbol.
+
+        Args:
+            page_type (PageType): summary or statistics.
+            symbols (Iterable[str]): Only these symbols. Case is ignored.
+            as_of (datetime): Only snapshots fetched at or before as_of. Also a unix
+                timestamp. Defaults to every snapshot.
+
+        Returns:
+            DataFrame: A row per symbol indexed by symbol, with a fetched_at column.
+        """
+        table, _ = TABLES[PageType(page_type)]
+        conditions, parameters = self._conditions(symbols, end=as_of, end_inclusive=True)
+
+        sql = (
+            f"SELECT {table}.* FROM {table} JOIN ("
+            f"SELECT symbol, MAX(fetched_at) AS fetched_at FROM {table}{conditions} "
+            "GROUP BY symbol) AS latest USING (symbol, fetched_at)"
+        )
+        return self._dataframe(page_type, sql, parameters, index="symbol")
+
+    def history(
+        self,
+        page_type: PageType,
+        symbol: str,
+        start: Timestamp = None,
+        end: Timestamp = None,
+    ) -> "DataFrame":
+        """Return every snapshot of a symbol fetched in a time range.
+
+        Args:
+            page_type (PageType): summary or statistics.
+            symbol (str): Ticker symbol. Case is ignored.
+            start (datetime): Only snapshots fetched at or after start. Also a unix timestamp.
+            end (datetime): Only snapshots fetched before end. Also a unix timestamp.
+
+        Returns:
+            DataFrame: A row per snapshot indexed by fetched_at.
+        """
+        table, _ = TABLES[PageType(page_type)]
+        conditions, parameters = self._conditions([symbol], start=start, end=end)
+
+        sql = f"SELECT * FROM {table}{conditions} ORDER BY fetched_at"
+        return self._dataframe(page_type, sql, parameters, index="fetched_at")
+
+    @staticmethod
+    def _conditions(
+        symbols: Optional[Iterable[str]],
+        start: Timestamp = None,
+        end: Timestamp = None,
+        end_inclusive: bool = False,
+    ) -> Tuple[str, List]:
+        """Build the WHERE clause and parameters of a query."""
+        conditions, parameters = [], []
+
+        if symbols is not None:
+            symbols = [symbol.upper() for symbol in symbols]
+            conditions.append(f"symbol IN ({', '.join('?' * len(symbols))})")
+            parameters.extend(symbols)
+
+        if start is not None:
+            conditions.append("fetched_at >= ?")
+            parameters.append(_unix_time(start))
+
+        if end is not None:
+            conditions.append("fetched_at <= ?" if end_inclusive else "fetched_at < ?")
+            parameters.append(_unix_time(end))
+
+        if not conditions:
+            return "", parameters
+
+        return " WHERE " + " AND ".join(conditions), parameters
+
+    def _dataframe(
+        self, page_type: PageType, sql: str, parameters: List, index: str
+    ) -> "DataFrame":
+        """Run a query and build a dataframe with the dtypes of the group dataframes."""
+        _, factory = TABLES[PageType(page_type)]
+
+        with self._lock:
+            cursor = self._connection.execute(sql, parameters)
+            names = [description[0] for description in cursor.description]
+            rows = cursor.fetchall()
+
+        fetched_at = Column("fetched_at", "datetime64[ns, UTC]", None)
+        buffer = ColumnBuffer([fetched_at, *factory().columns.values()], index=index)
+        values = zip(*rows) if rows else [[] for _ in names]
+
+        for name, column_values in zip(names, values):
+            if name in buffer.columns:
+                buffer.columns[name].values = list(column_values)
+
+        fetched_at.values = [
+            datetime.fromtimestamp(value, tz=timezone.utc) for value in fetched_at.values
+        ]
+        return buffer.to_dataframe()
+
+    def __len__(self) -> int:
+        """Return the number of stored snapshots of every page type."""
+        with self._lock:
+            return sum(
+                self._connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table, _ in TABLES.values()
+            )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self) -> "SnapshotStore":
+        """Use the store as a context manager which closes it on exit."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close the store."""
+        self.close()
@@ -1,22 +1,37 @@
 """Contains the classes and functions for scraping a yahoo finance statistics page."""
 
-from collections import ChainMap
 from enum import Enum
-from typing import Iterable, List, Optional
+from functools import partial
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING, Union
 
-import numpy as np
-import pandas
-from pandas import DataFrame
 from pendulum.date import Date
 from pydantic import BaseModel as Base
 from pydantic import Field
-from requests_html import HTML
 
-from .cleaner import cleaner, CommonCleaners, field_cleaner, table_cleaner
+from .cleaner import cleaner, CommonCleaners, field_cleaner
+from .columns import ColumnBuffer
+from .document import parse_html, select_first
 from .lookup import fuzzy_search
-from .multidownloader import _download_pages_with_threads, _download_pages_without_threads
+from .metrics import Stage, timer
+from .multidownloader import (
+    _download_pages_with_threads,
+    _download_pages_without_threads,
+    DownloadReport,
+    SymbolOutcome,
+)
+from .page_cache import PageCache, parse_cached
+from .profiling import profiled
 from .quote import parse_quote_header_info, Quote
 from .requestor import requestor
+from .urls import statistics_page_url
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+    from pandas import DataFrame
+    from requests_html import HTML
+
+    from .negative_cache import NegativeCache
 
 
 class PeriodType(str, Enum):
@@ -91,6 +106,11 @@ class Valuation(Base):
         use_enum_values = True
 
 
+def valuation_columns() -> ColumnBuffer:
+    """Create an empty column buffer for Valuation objects."""
+    return ColumnBuffer.from_models([(None, Valuation)], index="date")
+
+
 class ValuationMeasuresTable(Base):
     """Representing the entire Valuation Measures Table on a yahoo finance Statistics Page.
 
@@ -109,8 +129,10 @@ class ValuationMeasuresTable(Base):
     valuations: List[Valuation]
 
     @property
-    def dataframe(self) -> DataFrame:
+    def dataframe(self) -> "DataFrame":
         """Return the Valuation Measures Table as a dataframe."""
+        from pandas import DataFrame  # pylint: disable=import-outside-toplevel
+
         data = self.dict()
         dataframe = DataFrame.from_dict(data["valuations"])
         dataframe.set_index("date", inplace=True)
@@ -358,77 +380,159 @@ class TradingInformation(Base):
     )(CommonCleaners.clean_date)
 
 
+class StatisticsSection(str, Enum):
+    """Enum for the table sections of a statistics page."""
+
+    VALUATION = "valuation"
+    FINANCIAL_HIGHLIGHTS = "financial_highlights"
+    TRADING_INFORMATION = "trading_information"
+
+
+STATISTICS_SECTION_SELECTORS = {
+    StatisticsSection.VALUATION: r"table.W\(100\%\).Bdcl\(c\).M\(0\).Whs\(n\).D\(itb\)",
+    StatisticsSection.FINANCIAL_HIGHLIGHTS: r".Mb\(10px\).Pend\(20px\).smartphone_Pend\(0px\)",
+    StatisticsSection.TRADING_INFORMATION: r".Fl\(end\).W\(50\%\).smartphone_W\(100\%\)",
+}
+"""* CSS selectors of the element containing the rows of every section."""
+
+StatisticsRows = Dict[StatisticsSection, Optional[List[List[str]]]]
+
+
+@profiled
+def classify_statistics_rows(html: "HTML") -> StatisticsRows:
+    """Walk every table row of a statistics page once and sort the rows into sections.
+
+    The rows are read from the document tree which was already built, so no element is
+    parsed again. Valuation rows are split into cells, the rows of the two column
+    sections into their text lines.
+
+    Args:
+        html (HTML): "HTML" object of a statistics page.
+
+    Returns:
+        Dict[StatisticsSection, List[List[str]]]: Rows per section. A section is None
+            when its element is not found on the page.
+    """
+    from pyquery.text import extract_text  # pylint: disable=import-outside-toplevel
+
+    with timer(Stage.CLEAN, page="statistics"):
+        containers = {}
+
+        for section, selector in STATISTICS_SECTION_SELECTORS.items():
+            found = select_first(html, selector)
+
+            if found is not None:
+                containers.setdefault(found, section)
+
+        rows: StatisticsRows = {section: None for section in StatisticsSection}
+
+        for section in containers.values():
+            rows[section] = []
+
+        for row in html.lxml.iter("tr"):
+            for ancestor in row.iterancestors():
+                section = containers.get(ancestor)
+
+                if section is StatisticsSection.VALUATION:
+                    rows[section].append(
+                        [extract_text(cell) for cell in row.iterchildren("td", "th")]
+                    )
+                    break
+
+                if section is not None:
+                    rows[section].append(extract_text(row).split("\n"))
+                    break
+
+    return rows
+
+
+@profiled
 def parse_valuation_table(
-    html: HTML, period_type: PeriodType = PeriodType.QUARTERLY
+    html: "HTML",
+    period_type: PeriodType = PeriodType.QUARTERLY,
+    rows: Optional[StatisticsRows] = None,
 ) -> Optional[ValuationMeasuresTable]:
     """Parse and clean fields and rows of a valuation measures table HTML element.
 
     Args:
         html: Html element containing valuation table data.
         period_type (PeriodType): The period to be parsed. Only quarterly is currently supported.
+        rows (StatisticsRows): Rows already classified by classify_statistics_rows.
 
     Returns:
         ValuationMeasuresTable: If data is found.
         None: No data available.
     """
+    if rows is None:
+        rows = classify_statistics_rows(html)
+
     # IDEA: Parse the period type based on if it is a link or not.
     def clean_date(date_: str) -> str:
         """Clean field of a valuation table with date."""
         return date_.replace("Current", "").replace("As of Date:", "").strip()
 
-    table_element = html.find(r"table.W\(100\%\).Bdcl\(c\).M\(0\).Whs\(n\).D\(itb\)", first=True)
-    if table_element:
+    table = rows[StatisticsSection.VALUATION]
 
-        table = pandas.read_html(table_element.html, index_col=0)
-        table = table[0].transpose()
-        table = table.replace(np.nan, "N/A", regex=True)
-
-        valuations = []
+    if not table:
+        return None
 
-        data = {}
+    with timer(Stage.CLEAN, page="statistics"):
+        (_, *dates), *body = table
+        columns = []
 
-        data["period_type"] = period_type
-        for date_, row in table.iterrows():
-            data["date"] = clean_date(date_)
+        for column, date_ in enumerate(dates, start=1):
+            data = {"period_type": period_type, "date": clean_date(date_)}
 
-            for field, value in row.items():
-                field = field_cleaner(field)
-                data[field] = value
+            for field, *values in body:
+                value = values[column - 1] if column <= len(values) else ""
+                data[field_cleaner(field)] = value or "N/A"
 
-            valuations.append(Valuation(**data))
+            columns.append(data)
 
+    with timer(Stage.MODEL, page="statistics"):
+        valuations = [Valuation(**data) for data in columns]
         return ValuationMeasuresTable(valuations=valuations)
 
-    return None
-
 
-def parse_financial_highlights_table(html: HTML) -> Optional[FinancialHighlights]:
+@profiled
+def parse_financial_highlights_table(
+    html: "HTML", rows: Optional[StatisticsRows] = None
+) -> Optional[FinancialHighlights]:
     """Parse and clean fields and rows of a financial highlights section of an HTML element."""
-    table = html.find(r".Mb\(10px\).Pend\(20px\).smartphone_Pend\(0px\)", first=True)
+    if rows is None:
+        rows = classify_statistics_rows(html)
 
-    if table:
-        table_data = table_cleaner(table)
+    table = rows[StatisticsSection.FINANCIAL_HIGHLIGHTS]
 
-        return FinancialHighlights(**table_data)
+    if table is None:
+        return None
 
-    return None
+    with timer(Stage.CLEAN, page="statistics"):
+        table_data = {field_cleaner(field): value for field, value in _two_columns(table)}
+
+    with timer(Stage.MODEL, page="statistics"):
+        return FinancialHighlights(**table_data)
 
 
-def parse_trading_information_table(html: HTML) -> Optional[TradingInformation]:
+@profiled
+def parse_trading_information_table(
+    html: "HTML", rows: Optional[StatisticsRows] = None
+) -> Optional[TradingInformation]:
     """Parse and clean fields and rows of a trading information section of an HTML element."""
-    table_element = html.find(r".Fl\(end\).W\(50\%\).smartphone_W\(100\%\)", first=True)
+    if rows is None:
+        rows = classify_statistics_rows(html)
 
-    if table_element:
+    table = rows[StatisticsSection.TRADING_INFORMATION]
 
-        rows = [row.text.split("\n") for row in table_element.find("tr")]
-        rows = list(filter(lambda row: len(row) == 2, rows))
+    if table is None:
+        return None
 
-        table_data = table_cleaner(html)
+    with timer(Stage.CLEAN, page="statistics"):
+        table_data = {}
 
-        if not table_data:
-            table_data = {}
+        for field, value in _two_columns(table):
+            table_data[field_cleaner(field)] = value
 
-        for field, value in rows:
             if CommonCleaners.value_is_missing(value):
                 continue
 
@@ -443,12 +547,18 @@ def parse_trading_information_table(html: HTML) -> Optional[TradingInformation]:
                 table_data[field_name + "date"] = date_
                 table_data[field_name.strip("_")] = value
 
-        if table_data:
+    if table_data:
+        with timer(Stage.MODEL, page="statistics"):
             return TradingInformation(**table_data)
 
     return None
 
 
+def _two_columns(rows: List[List[str]]) -> List[List[str]]:
+    """Return the rows with exactly a field and a value."""
+    return [row for row in rows if len(row) == 2]
+
+
 class StatisticsPage(Base):
     """Represents all data you can find on a yahoo finance statistics page.
 
@@ -482,6 +592,20 @@ class StatisticsPage(Base):
         return None
 
 
+def statistics_page_columns() -> ColumnBuffer:
+    """Create an empty column buffer for StatisticsPage objects."""
+    return ColumnBuffer.from_models(
+        [
+            (None, StatisticsPage),
+            ("quote", Quote),
+            ("financial_highlights", FinancialHighlights),
+            ("trading_information", TradingInformation),
+        ],
+        index="symbol",
+        exclude=["quote", "valuation_measures", "financial_highlights", "trading_information"],
+    )
+
+
 class StatisticsPageGroup(Base):
     """Multiple Statistics Pages Group together.
 
@@ -520,22 +644,15 @@ class StatisticsPageGroup(Base):
         self.pages = sorted(self.pages)
 
     @property
-    def dataframe(self: "StatisticsPageGroup") -> DataFrame:
-        """Return a dataframe of multiple statistics pages."""
-        data = []
-        for page in self.pages:
-            chain_map = ChainMap(
-                page.quote.dict(),
-                page.financial_highlights.dict(),
-                page.trading_information.dict(),
-            )
-            chain_map["symbol"] = page.symbol
-            data.append(chain_map)
+    def dataframe(self: "StatisticsPageGroup") -> "DataFrame":
+        """Return a dataframe of multiple statistics pages.
 
-        dataframe = DataFrame.from_dict(data)
-        dataframe.set_index("symbol", inplace=True)
-        dataframe.sort_index(inplace=True)
-        return dataframe
+        The columns are read from the current pages every time, so pages which were
+        replaced or changed after they were added are never stale.
+        """
+        columns = statistics_page_columns()
+        columns.extend(self.pages)
+        return columns.to_dataframe()
 
     def __iter__(self: "StatisticsPage") -> Iterable:
         """Iterate over StatisticsPage objects."""
@@ -546,10 +663,49 @@ class StatisticsPageGroup(Base):
         return len(self.pages)
 
 
+@profiled
+def parse_statistics_page(
+    symbol: str, html: "HTML", quote: Optional[Quote] = None
+) -> Optional[StatisticsPage]:
+    """Parse a StatisticsPage from the HTML of a yahoo finance statistics page.
+
+    Args:
+        symbol (str): Ticker symbol.
+        html (HTML): "HTML" object of a statistics page.
+        quote (Quote): Quote header data already parsed from another page of the
+            same symbol. If None the quote header is parsed from the html.
+
+    Returns:
+        StatisticsPage: When data is found.
+        None: Any section of the statistics page is missing.
+    """
+    if quote is None:
+        quote = parse_quote_header_info(html)
+
+    rows = classify_statistics_rows(html)
+    valulation_measures = parse_valuation_table(html, rows=rows)
+    financial_highlights = parse_financial_highlights_table(html, rows=rows)
+    trading_information = parse_trading_information_table(html, rows=rows)
+
+    if quote and valulation_measures and financial_highlights and trading_information:
+
+        with timer(Stage.MODEL, page="statistics"):
+            return StatisticsPage(
+                symbol=symbol,
+                quote=quote,
+                valuation_measures=valulation_measures,
+                financial_highlights=financial_highlights,
+                trading_information=trading_information,
+            )
+
+    return None
+
+
 def get_statistics_page(
     symbol: str,
     use_fuzzy_search: bool = True,
     page_not_found_ok: bool = False,
+    page_cache: Optional[PageCache] = None,
     **kwargs,  # noqa: ANN003
 ) -> Optional[StatisticsPage]:
     """Get statistics page data.
@@ -558,6 +714,8 @@ def get_statistics_page(
         symbol (str): Ticker symbol.
         use_fuzzy_search (bool): If True validates symbol prior to requesting options page data.
         page_not_found_ok (bool): If True Returns None when page is not found.
+        page_cache (PageCache): If set, an unchanged page returns the page parsed last
+            time instead of being parsed again.
         **kwargs: Pass (session, proxies, and timeout) to the requestor function.
 
     Returns:
@@ -573,28 +731,24 @@ def get_statistics_page(
         if fuzzy_response:
             symbol = fuzzy_response.symbol
 
-    url = f"https://finance.yahoo.com/quote/{symbol}/key-statistics?p={symbol}"
+    url = statistics_page_url(symbol)
 
-    response = requestor(url)
+    response = requestor(url, **kwargs)
 
     if response.ok:
 
-        html = HTML(html=response.text)
-
-        quote = parse_quote_header_info(html)
-        valulation_measures = parse_valuation_table(html)
-        financial_highlights = parse_financial_highlights_table(html)
-        trading_information = parse_trading_information_table(html)
+        statistics_page = parse_cached(
+            page_cache,
+            url,
+            response.content,
+            lambda: parse_statistics_page(
+                symbol, parse_html(response.text, url, page="statistics")
+            ),
+        )
 
-        if quote and valulation_measures and financial_highlights and trading_information:
+        if statistics_page:
+            return statistics_page
 
-            return StatisticsPage(
-                symbol=symbol,
-                quote=quote,
-                valuation_measures=valulation_measures,
-                financial_highlights=financial_highlights,
-                trading_information=trading_information,
-            )
     if page_not_found_ok:
         return None
 
@@ -608,8 +762,15 @@ def get_multiple_statistics_pages(  # pylint: disable=too-many-arguments
     with_threads: bool = False,
     thread_count: int = 5,
     progress_bar: bool = True,
+    retries: int = 0,
+    with_report: bool = False,
+    on_outcome: Optional[Callable[[SymbolOutcome], None]] = None,
+    executor: Optional["Executor"] = None,
+    use_negative_cache: bool = False,
+    negative_cache: Optional["NegativeCache"] = None,
+    page_cache: Optional[PageCache] = None,
     **kwargs,  # noqa: ANN003
-) -> Optional[StatisticsPageGroup]:
+) -> Union[Optional[StatisticsPageGroup], Tuple[Optional[StatisticsPageGroup], DownloadReport]]:
     """Get multiple statistics pages.
 
     Args:
@@ -622,18 +783,35 @@ def get_multiple_statistics_pages(  # pylint: disable=too-many-arguments
         **kwargs: Pass (session, proxies, and timeout) to the requestor function.
         progress_bar (bool): If True shows the progress bar else the progress bar
             is not shown.
+        retries (int): Number of times a throttled or failed symbol is retried.
+        with_report (bool): If True a DownloadReport with the outcome of every symbol
+            is returned as well. Errors are recorded in the report instead of raised.
+        on_outcome (Callable): Called with the SymbolOutcome of every symbol as soon
+            as it is known. Errors are recorded instead of raised.
+        executor (Executor): Thread pool reused when with_threads is True instead of
+            creating one for this call. It is not shut down.
+        use_negative_cache (bool): If True symbols whose page was not found (404) within
+            the negative cache ttl are skipped without a request. Off by default.
+        negative_cache (NegativeCache): Cache to use instead of
+            yfs.negative_cache.default_negative_cache.
+        page_cache (PageCache): If set, unchanged pages return the pages parsed last
+            time instead of being parsed again.
 
     Returns:
         StatisticsPageGroup: When data is found.
         None: No data is found and page_not_found_ok is True.
+        Tuple: (pages, DownloadReport) when with_report is True.
 
     Raises:
         AttributeError: When a page is not found and the page_not_found_ok arg is false.
     """
-    symbols = list(set(symbols))
+    symbols = list(dict.fromkeys(symbols))
     group_object = StatisticsPageGroup
     callable_ = get_statistics_page
 
+    if page_cache is not None:
+        callable_ = partial(get_statistics_page, page_cache=page_cache)
+
     if with_threads:
         return _download_pages_with_threads(
             group_object,
@@ -643,6 +821,12 @@ def get_multiple_statistics_pages(  # pylint: disable=too-many-arguments
             page_not_found_ok=page_not_found_ok,
             thread_count=thread_count,
             progress_bar=progress_bar,
+            retries=retries,
+            with_report=with_report,
+            on_outcome=on_outcome,
+            executor=executor,
+            use_negative_cache=use_negative_cache,
+            negative_cache=negative_cache,
             **kwargs,
         )
     return _download_pages_without_threads(
@@ -652,5 +836,10 @@ def get_multiple_statistics_pages(  # pylint: disable=too-many-arguments
         use_fuzzy_search=use_fuzzy_search,
         page_not_found_ok=page_not_found_ok,
         progress_bar=progress_bar,
+        retries=retries,
+        with_report=with_report,
+        on_outcome=on_outcome,
+        use_negative_cache=use_negative_cache,
+        negative_cache=negative_cache,
         **kwargs,
     )
@@ -1,19 +1,37 @@
 """Contains the classes and functions for scraping a yahoo finance summary page."""
 
 from collections import ChainMap
-from typing import Dict, Iterable, List, Optional
+from functools import partial
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING, Union
 
-from pandas import DataFrame
 from pendulum.date import Date
 from pydantic import BaseModel as Base
 from pydantic import Field
-from requests_html import HTML
 
 from .cleaner import cleaner, CommonCleaners, table_cleaner
+from .columns import ColumnBuffer
+from .document import parse_html, select_first
 from .lookup import fuzzy_search
-from .multidownloader import _download_pages_with_threads, _download_pages_without_threads
+from .metrics import Stage, timer
+from .multidownloader import (
+    _download_pages_with_threads,
+    _download_pages_without_threads,
+    DownloadReport,
+    SymbolOutcome,
+)
+from .page_cache import PageCache, parse_cached
+from .profiling import profiled
 from .quote import parse_quote_header_info, Quote
 from .requestor import requestor
+from .urls import summary_page_url
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+    from pandas import DataFrame
+    from requests_html import HTML
+
+    from .negative_cache import NegativeCache
 
 
 class SummaryPage(Base):
@@ -156,6 +174,11 @@ class SummaryPage(Base):
         return None
 
 
+def summary_page_columns() -> ColumnBuffer:
+    """Create an empty column buffer for SummaryPage objects."""
+    return ColumnBuffer.from_models([(None, SummaryPage)], index="symbol", exclude=["quote"])
+
+
 class SummaryPageGroup(Base):
     """Group of SummaryPage objects from multiple symbols.
 
@@ -194,17 +217,16 @@ class SummaryPageGroup(Base):
         self.pages = sorted(self.pages)
 
     @property
-    def dataframe(self: "SummaryPageGroup") -> Optional[DataFrame]:
-        """Return a dataframe of multiple SummaryPage objects."""
-        pages = self.dict().get("pages")
-
-        if pages:
-            dataframe = DataFrame.from_dict(pages)
-            dataframe.set_index("symbol", inplace=True)
-            dataframe.drop("quote", axis=1, inplace=True)
-            dataframe.sort_index(inplace=True)
+    def dataframe(self: "SummaryPageGroup") -> Optional["DataFrame"]:
+        """Return a dataframe of multiple SummaryPage objects.
 
-            return dataframe  # TODO: none or nan
+        The columns are read from the current pages every time, so pages which were
+        replaced or changed after they were added are never stale.
+        """
+        if self.pages:
+            columns = summary_page_columns()
+            columns.extend(self.pages)
+            return columns.to_dataframe()
 
         return None
 
@@ -217,12 +239,47 @@ class SummaryPageGroup(Base):
         return len(self.pages)
 
 
-def parse_summary_table(html: HTML) -> Optional[Dict]:
+@profiled
+def parse_summary_table(html: "HTML") -> Optional[Dict]:
     """Parse data from summary table HTML element."""
-    quote_summary = html.find("div#quote-summary", first=True)
+    with timer(Stage.CLEAN, page="summary"):
+        quote_summary = select_first(html, "div#quote-summary")
+
+        if quote_summary is not None:
+            return table_cleaner(quote_summary)
+
+    return None
+
+
+@profiled
+def parse_summary_page(
+    symbol: str, html: "HTML", quote: Optional[Quote] = None
+) -> Optional[SummaryPage]:
+    """Parse a SummaryPage from the HTML of a yahoo finance summary page.
+
+    Args:
+        symbol (str): Ticker symbol.
+        html (HTML): "HTML" object of a summary page.
+        quote (Quote): Quote header data already parsed from another page of the
+            same symbol. If None the quote header is parsed from the html.
 
-    if quote_summary:
-        return table_cleaner(quote_summary)
+    Returns:
+        SummaryPage: When data is found.
+        None: No quote header or summary table data is found.
+    """
+    if quote is None:
+        quote = parse_quote_header_info(html)
+
+    summary_page_data = parse_summary_table(html)
+
+    if quote and summary_page_data:
+
+        data = ChainMap(quote.dict(), summary_page_data)
+        data["symbol"] = symbol
+        data["quote"] = quote
+
+        with timer(Stage.MODEL, page="summary"):
+            return SummaryPage(**data)
 
     return None
 
@@ -231,6 +288,7 @@ def get_summary_page(
     symbol: str,
     use_fuzzy_search: bool = True,
     page_not_found_ok: bool = False,
+    page_cache: Optional[PageCache] = None,
     **kwargs,  # noqa: ANN003
 ) -> Optional[SummaryPage]:
     """Get summary page data.
@@ -240,6 +298,8 @@ def get_summary_page(
         use_fuzzy_search (bool): If True does a symbol lookup validation prior
             to requesting summary page data.
         page_not_found_ok (bool): If True Returns None when page is not found.
+        page_cache (PageCache): If set, an unchanged page returns the page parsed last
+            time instead of being parsed again.
         **kwargs: Pass (session, proxies, and timeout) to the requestor function.
 
     Returns:
@@ -255,24 +315,21 @@ def get_summary_page(
         if fuzzy_response:
             symbol = fuzzy_response.symbol
 
-    url = f"https://finance.yahoo.com/quote/{symbol}?p={symbol}"
+    url = summary_page_url(symbol)
 
     response = requestor(url, **kwargs)
 
     if response.ok:
 
-        html = HTML(html=response.text, url=url)
-
-        quote_data = parse_quote_header_info(html)
-        summary_page_data = parse_summary_table(html)
-
-        if quote_data and summary_page_data:
-
-            data = ChainMap(quote_data.dict(), summary_page_data)
-            data["symbol"] = symbol
-            data["quote"] = quote_data
+        summary_page = parse_cached(
+            page_cache,
+            url,
+            response.content,
+            lambda: parse_summary_page(symbol, parse_html(response.text, url, page="summary")),
+        )
 
-            return SummaryPage(**data)
+        if summary_page:
+            return summary_page
 
     if page_not_found_ok:
         return None
@@ -287,8 +344,16 @@ def get_multiple_summary_pages(  # pylint: disable=too-many-arguments
     with_threads: bool = False,
     thread_count: int = 5,
     progress_bar: bool = True,
+    compact: bool = False,
+    retries: int = 0,
+    with_report: bool = False,
+    on_outcome: Optional[Callable[[SymbolOutcome], None]] = None,
+    executor: Optional["Executor"] = None,
+    use_negative_cache: bool = False,
+    negative_cache: Optional["NegativeCache"] = None,
+    page_cache: Optional[PageCache] = None,
     **kwargs,  # noqa: ANN003
-) -> Optional[SummaryPageGroup]:
+) -> Union[Optional[SummaryPageGroup], Tuple[Optional[SummaryPageGroup], DownloadReport]]:
     """Get multiple summary pages.
 
     Args:
@@ -301,18 +366,43 @@ def get_multiple_summary_pages(  # pylint: disable=too-many-arguments
         **kwargs: Pass (session, proxies, and timeout) to the requestor function.
         progress_bar (bool): If True shows the progress bar else the progress bar
             is not shown.
+        compact (bool): If True pages are stored as slotted records in a
+            yfs.records.SummaryRecordGroup to reduce memory usage.
+        retries (int): Number of times a throttled or failed symbol is retried.
+        with_report (bool): If True a DownloadReport with the outcome of every symbol
+            is returned as well. Errors are recorded in the report instead of raised.
+        on_outcome (Callable): Called with the SymbolOutcome of every symbol as soon
+            as it is known. Errors are recorded instead of raised.
+        executor (Executor): Thread pool reused when with_threads is True instead of
+            creating one for this call. It is not shut down.
+        use_negative_cache (bool): If True symbols whose page was not found (404) within
+            the negative cache ttl are skipped without a request. Off by default.
+        negative_cache (NegativeCache): Cache to use instead of
+            yfs.negative_cache.default_negative_cache.
+        page_cache (PageCache): If set, unchanged pages return the pages parsed last
+            time instead of being parsed again.
 
     Returns:
         SummaryPageGroup: When data is found.
+        SummaryRecordGroup: When data is found and compact is True.
         None: No data is found and page_not_found_ok is True.
+        Tuple: (pages, DownloadReport) when with_report is True.
 
     Raises:
         AttributeError: When a page is not found and the page_not_found_ok arg is false.
     """
-    symbols = list(set(symbols))
+    symbols = list(dict.fromkeys(symbols))
     group_object = SummaryPageGroup
+
+    if compact:
+        from .records import SummaryRecordGroup  # pylint: disable=import-outside-toplevel
+
+        group_object = SummaryRecordGroup
     callable_ = get_summary_page
 
+    if page_cache is not None:
+        callable_ = partial(get_summary_page, page_cache=page_cache)
+
     if with_threads:
         return _download_pages_with_threads(
             group_object,
@@ -322,6 +412,12 @@ def get_multiple_summary_pages(  # pylint: disable=too-many-arguments
             page_not_found_ok=page_not_found_ok,
             thread_count=thread_count,
             progress_bar=progress_bar,
+            retries=retries,
+            with_report=with_report,
+            on_outcome=on_outcome,
+            executor=executor,
+            use_negative_cache=use_negative_cache,
+            negative_cache=negative_cache,
             **kwargs,
         )
     return _download_pages_without_threads(
@@ -331,5 +427,10 @@ def get_multiple_summary_pages(  # pylint: disable=too-many-arguments
         use_fuzzy_search=use_fuzzy_search,
         page_not_found_ok=page_not_found_ok,
         progress_bar=progress_bar,
+        retries=retries,
+        with_report=with_report,
+        on_outcome=on_outcome,
+        use_negative_cache=use_negative_cache,
+        negative_cache=negative_cache,
         **kwargs,
     )
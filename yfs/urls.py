@@ -0,0 +1,92 @@
+"""Yahoo finance url builders.
+
+Page urls are built from BASE_URL which defaults to https://finance.yahoo.com and can be
+changed with the YFS_BASE_URL environmental variable, for example to point yfs at a
+local mock server. JSON api urls are built from QUERY_URL the same way. Both are read
+every time a url is built so they can also be changed at runtime.
+"""
+
+from typing import Iterable, Optional
+from urllib.parse import quote
+
+from decouple import config
+
+BASE_URL = config("YFS_BASE_URL", default="https://finance.yahoo.com").rstrip("/")
+"""* Scheme and host of every yahoo finance page request."""
+
+QUERY_URL = config("YFS_QUERY_URL", default="https://query1.finance.yahoo.com").rstrip("/")
+"""* Scheme and host of every yahoo finance JSON api request."""
+
+
+def summary_page_url(symbol: str) -> str:
+    """Build the yahoo finance summary page url for a symbol."""
+    return f"{BASE_URL}/quote/{symbol}?p={symbol}"
+
+
+def statistics_page_url(symbol: str) -> str:
+    """Build the yahoo finance statistics page url for a symbol."""
+    return f"{BASE_URL}/quote/{symbol}/key-statistics?p={symbol}"
+
+
+def options_page_url(symbol: str, timestamp: str = None) -> str:
+    """Build the yahoo finance options page url for a symbol.
+
+    Args:
+        symbol (str): Ticker symbol.
+        timestamp (str): Expiration timestamp. If None the url of the nearest
+            expiration is returned.
+    """
+    if timestamp is None:
+        return f"{BASE_URL}/quote/{symbol}/options?p={symbol}"
+
+    return f"{BASE_URL}/quote/{symbol}/options?date={timestamp}&p={symbol}"
+
+
+def lookup_url(quote_lookup: str) -> str:
+    """Build the yahoo finance quote lookup (searchassist) url for a search term."""
+    return f"{BASE_URL}/_finance_doubledown/api/resource/searchassist;searchTerm={quote_lookup}"
+
+
+def quote_api_url(symbols: Iterable[str], fields: Optional[Iterable[str]] = None) -> str:
+    """Build the yahoo finance quote api url for several symbols.
+
+    Args:
+        symbols (Iterable[str]): Ticker symbols.
+        fields (Iterable[str]): Only return these quote fields. All fields when None.
+    """
+    url = f"{QUERY_URL}/v7/finance/quote?symbols={quote(','.join(symbols), safe=',')}"
+
+    if fields is None:
+        return url
+
+    return f"{url}&fields={','.join(fields)}"
+
+
+def chart_url(symbol: str, period1: int, period2: int, interval: str = "1d") -> str:
+    """Build the yahoo finance chart api url of a symbol's price history.
+
+    Args:
+        symbol (str): Ticker symbol.
+        period1 (int): Unix timestamp of the first bar. Inclusive.
+        period2 (int): Unix timestamp after the last bar. Exclusive.
+        interval (str): Bar size. Example: 1d.
+    """
+    return (
+        f"{QUERY_URL}/v8/finance/chart/{quote(symbol, safe='')}"
+        f"?period1={period1}&period2={period2}&interval={interval}"
+        "&includeAdjustedClose=true&events=div,splits"
+    )
+
+
+def quote_summary_url(symbol: str, modules: Iterable[str]) -> str:
+    """Build the yahoo finance quote summary api url of a symbol.
+
+    Args:
+        symbol (str): Ticker symbol.
+        modules (Iterable[str]): Quote summary modules returned in one response.
+            Example: price, summaryDetail.
+    """
+    return (
+        f"{QUERY_URL}/v10/finance/quoteSummary/{quote(symbol, safe='')}"
+        f"?modules={','.join(modules)}"
+    )